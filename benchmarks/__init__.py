@@ -0,0 +1,6 @@
+# benchmarks/__init__.py
+"""
+Performance benchmarks: a seeded synthetic reaction network generator
+(synthetic.py), timed / memory-measured scenarios (scenarios.py) and a
+runner producing JSON reports comparable against a baseline (run.py).
+"""
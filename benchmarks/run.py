@@ -0,0 +1,162 @@
+# benchmarks/run.py
+"""
+Run the benchmark suite and write a JSON report.
+
+    python -m benchmarks.run --out bench.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json --threshold 0.25
+    python -m benchmarks.run --only find_paths --species 500 --reactions 5000
+    python -m benchmarks.run --species 20000 --reactions 100000 --elements C H O N S
+
+Each scenario is timed `--repeat` times (min and median wall time are
+reported) and then run once more under tracemalloc for its peak Python
+allocation. With --baseline, scenarios slower or hungrier than the baseline
+by more than the threshold are listed and the exit status is 1.
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from benchmarks.scenarios import SCENARIOS, Context
+from benchmarks.synthetic import NetworkConfig, generate_network
+
+REPORT_FORMAT = "chem_standard.bench"
+
+
+def measure(run, repeat: int) -> Dict[str, Any]:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "seconds_min": min(times),
+        "seconds_median": statistics.median(times),
+        "repeat": repeat,
+        "peak_bytes": peak,
+    }
+
+
+def run_suite(
+    cfg: NetworkConfig,
+    names: Optional[Iterable[str]] = None,
+    repeat: int = 3,
+    path_queries: int = 20,
+    workdir: Optional[Path] = None,
+    max_paths: int = 100,
+) -> Dict[str, Any]:
+    names = list(SCENARIOS) if names is None else list(names)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"unknown scenarios: {unknown}")
+
+    network = generate_network(cfg)
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        ctx = Context(network, network.write_jsonl(Path(tmp) / "reactions.jsonl"),
+                      path_queries=path_queries, max_paths=max_paths)
+        results = {name: measure(SCENARIOS[name](ctx), repeat) for name in names}
+
+    return {
+        "format": REPORT_FORMAT,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+        },
+        "config": dict(cfg.to_dict(), path_queries=path_queries, max_paths=max_paths),
+        "scenarios": results,
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.25,
+            memory_threshold: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Regressions of report against baseline: scenarios whose seconds_min or
+    peak_bytes grew by more than threshold (relative). Scenarios missing on
+    either side are ignored. A config mismatch is an error.
+    """
+    if report.get("config") != baseline.get("config"):
+        raise ValueError("report and baseline were produced with different network configs")
+    memory_threshold = threshold if memory_threshold is None else memory_threshold
+    regressions = []
+    for name, cur in report["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            continue
+        for metric, limit in (("seconds_min", threshold), ("peak_bytes", memory_threshold)):
+            if base[metric] > 0 and cur[metric] > base[metric] * (1.0 + limit):
+                regressions.append({
+                    "scenario": name,
+                    "metric": metric,
+                    "baseline": base[metric],
+                    "current": cur[metric],
+                    "ratio": cur[metric] / base[metric],
+                })
+    return regressions
+
+
+def _parse_args(argv):
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--species", type=int, default=NetworkConfig.n_species)
+    p.add_argument("--reactions", type=int, default=NetworkConfig.n_reactions)
+    p.add_argument("--degree", choices=("uniform", "powerlaw"), default=NetworkConfig.degree)
+    p.add_argument("--atoms-per-molecule", type=int, nargs=2, metavar=("MIN", "MAX"),
+                   default=NetworkConfig.atoms_per_molecule)
+    p.add_argument("--elements", nargs="+", default=NetworkConfig.elements)
+    p.add_argument("--seed", type=int, default=NetworkConfig.seed)
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--queries", type=int, default=20, help="start/target pairs per find_paths scenario")
+    p.add_argument("--max-paths", type=int, default=100, help="results per find_paths query before it stops")
+    p.add_argument("--only", action="append", default=[], help="run scenarios whose name contains this (repeatable)")
+    p.add_argument("--out", type=Path, help="write the JSON report here (default: stdout)")
+    p.add_argument("--baseline", type=Path, help="compare against this report")
+    p.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown (0.25 = +25%%)")
+    p.add_argument("--memory-threshold", type=float, default=None)
+    return p.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    cfg = NetworkConfig(
+        n_species=args.species, n_reactions=args.reactions, degree=args.degree, seed=args.seed,
+        atoms_per_molecule=tuple(args.atoms_per_molecule), elements=tuple(args.elements),
+    )
+    names = [n for n in SCENARIOS if not args.only or any(o in n for o in args.only)]
+    report = run_suite(cfg, names, repeat=args.repeat, path_queries=args.queries, max_paths=args.max_paths)
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        args.out.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    for name, r in report["scenarios"].items():
+        print(f"{name:40s} {r['seconds_min'] * 1e3:10.2f} ms  {r['peak_bytes'] / 2 ** 20:8.2f} MiB", file=sys.stderr)
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.threshold, args.memory_threshold)
+        for reg in regressions:
+            print(f"REGRESSION {reg['scenario']} {reg['metric']}: x{reg['ratio']:.2f}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+# benchmarks/scenarios.py
+"""
+Benchmark scenarios.
+
+A scenario is (name, setup) where setup(ctx) does the untimed preparation
+and returns a zero-argument callable: the timed body. ctx is a Context with
+the synthetic network, its jsonl file and lazily built shared objects.
+
+Path scenarios stop each query after max_paths results (ReactionPathFinder
+max_paths). Forward BFS at depth 4 on the power-law hubs still expands up
+to ~10^6 edges per query, so that scenario runs the first pair only;
+the defaults keep the whole suite in the seconds range.
+"""
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.synthetic import SyntheticNetwork
+
+Setup = Callable[["Context"], Callable[[], Any]]
+
+
+@dataclass
+class Context:
+    network: SyntheticNetwork
+    jsonl_path: Path
+    path_queries: int = 20
+    max_paths: int = 100
+    _cache: Dict[str, Any] = field(default_factory=dict)
+
+    def _get(self, key, build):
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    def dataset(self):
+        from src.dataset.reaction_dataset import ReactionDataset
+
+        def build():
+            ds = ReactionDataset()
+            ds.load_jsonl(self.jsonl_path)
+            return ds
+        return self._get("dataset", build)
+
+    def reaction_graph(self):
+        from src.graph.reaction_graph import ReactionGraph
+        return self._get("reaction_graph", lambda: ReactionGraph.from_dataset(self.dataset()))
+
+    def species_graph(self):
+        from src.graph.species_graph import SpeciesGraph
+        return self._get("species_graph", lambda: SpeciesGraph.from_reaction_graph(self.reaction_graph()))
+
+    def query_pairs(self) -> List[Tuple[str, str]]:
+        def build():
+            rng = random.Random(self.network.config.seed + 1)
+            names = sorted(self.species_graph().species())
+            return [tuple(rng.sample(names, 2)) for _ in range(self.path_queries)]
+        return self._get("query_pairs", build)
+
+
+def _load_jsonl(ctx: Context):
+    from src.dataset.reaction_dataset import ReactionDataset
+
+    def run():
+        ReactionDataset().load_jsonl(ctx.jsonl_path)
+    return run
+
+
+def _index_jsonl(workers: int) -> Setup:
+    """Sharded keying (src.dataset.sharded_ingest); compare across worker counts."""
+    def setup(ctx: Context):
+        from src.dataset.sharded_ingest import index_jsonl
+        return lambda: index_jsonl(ctx.jsonl_path, workers=workers)
+    return setup
+
+
+def _deduplicate(ctx: Context):
+    from src.reaction import Reaction
+    reactions = ctx.dataset().reactions()
+    # fresh objects: identities are cached per Reaction
+    return lambda: Reaction.deduplicate([Reaction.from_dict(r.as_dict()) for r in reactions])
+
+
+def _deduplicate_cached(ctx: Context):
+    from src.reaction import Reaction
+    reactions = ctx.dataset().reactions()
+    return lambda: Reaction.deduplicate(reactions)
+
+
+def _reaction_graph(ctx: Context):
+    from src.graph.reaction_graph import ReactionGraph
+    ds = ctx.dataset()
+    return lambda: ReactionGraph.from_dataset(ds)
+
+
+def _species_graph(ctx: Context):
+    from src.graph.species_graph import SpeciesGraph
+    rg = ctx.reaction_graph()
+    return lambda: SpeciesGraph.from_reaction_graph(rg)
+
+
+def _find_paths(depth: int, mode: str = "bfs", queries: Optional[int] = None) -> Setup:
+    """queries: use only the first `queries` start/target pairs."""
+    def setup(ctx: Context):
+        from src.path.reaction_path_finder import ReactionPathFinder
+        finder = ReactionPathFinder(ctx.species_graph(), max_paths=ctx.max_paths)
+        pairs = ctx.query_pairs()[:queries]
+
+        def run():
+            for start, target in pairs:
+                finder.find_paths(start, target, max_depth=depth, mode=mode)
+        return run
+    return setup
+
+
+def _api_hash(version: int) -> Setup:
+    def setup(ctx: Context):
+        from src.io.api_adapter import reaction_to_canonical_hash
+        reactions = ctx.network.reactions
+
+        def run():
+            for r in reactions:
+                reaction_to_canonical_hash(r, version=version)
+        return run
+    return setup
+
+
+SCENARIOS: Dict[str, Setup] = {
+    "load_jsonl": _load_jsonl,
+    "index_jsonl_workers1": _index_jsonl(1),
+    "index_jsonl_workers2": _index_jsonl(2),
+    "index_jsonl_workers4": _index_jsonl(4),
+    "deduplicate": _deduplicate,
+    "deduplicate_cached": _deduplicate_cached,
+    "reaction_graph_from_dataset": _reaction_graph,
+    "species_graph_from_reaction_graph": _species_graph,
+    "find_paths_depth2": _find_paths(2),
+    "find_paths_depth3": _find_paths(3),
+    "find_paths_depth4": _find_paths(4, queries=1),
+    "find_paths_depth4_bidirectional": _find_paths(4, "bidirectional"),
+    "api_hash_v1": _api_hash(1),
+    "api_hash_v2": _api_hash(2),
+}
@@ -0,0 +1,122 @@
+# benchmarks/synthetic.py
+"""
+Seeded generator of synthetic reaction networks.
+
+Species are molecules with distinct formulas (SpeciesGraph keys on the
+formula) and random 3D coordinates. Reactions draw their reactants and
+products from the species pool with a configurable degree distribution:
+
+- "uniform": every species is equally likely
+- "powerlaw": species i has weight (i + 1) ** -alpha, giving a few hub
+  species and a long tail, like real reaction networks
+
+The same config (including seed) always yields the same network.
+"""
+import random
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from src.atom import Atom
+from src.molecule import Molecule
+from src.reaction import Reaction
+
+_ATOMIC_NUMBERS = {"H": 1, "C": 6, "N": 7, "O": 8, "S": 16}
+
+
+@dataclass
+class NetworkConfig:
+    n_species: int = 200
+    n_reactions: int = 1000
+    atoms_per_molecule: Tuple[int, int] = (2, 12)
+    reactants_per_reaction: Tuple[int, int] = (1, 2)
+    products_per_reaction: Tuple[int, int] = (1, 2)
+    degree: str = "powerlaw"
+    alpha: float = 1.0
+    # fraction of reactions emitted a second time (exercises deduplication)
+    duplicate_fraction: float = 0.1
+    elements: Tuple[str, ...] = ("C", "H", "O", "N")
+    seed: int = 0
+
+    def to_dict(self) -> Dict:
+        # tuples as lists, so the dict equals its own JSON round trip
+        return {k: list(v) if isinstance(v, tuple) else v for k, v in asdict(self).items()}
+
+
+@dataclass
+class SyntheticNetwork:
+    config: NetworkConfig
+    species: List[Molecule] = field(default_factory=list)
+    reactions: List[Reaction] = field(default_factory=list)
+
+    def write_jsonl(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            path.unlink()
+        for r in self.reactions:
+            r.log(sink=str(path))
+        return path
+
+    def formulas(self) -> List[str]:
+        return [m.formula for m in self.species]
+
+
+def _molecule(rng: random.Random, cfg: NetworkConfig, seen: set) -> Molecule:
+    """
+    Random composition, made distinct by construction: while its formula is
+    taken, one more random atom is added. Once the small compositions are
+    used up, molecules therefore grow past atoms_per_molecule[1], so any
+    n_species is reachable.
+    """
+    lo, hi = cfg.atoms_per_molecule
+    symbols = [rng.choice(cfg.elements) for _ in range(rng.randint(lo, hi))]
+    composition = Counter(symbols)
+    while frozenset(composition.items()) in seen:
+        s = rng.choice(cfg.elements)
+        symbols.append(s)
+        composition[s] += 1
+    seen.add(frozenset(composition.items()))
+    atoms = [
+        Atom(
+            atomic_number=_ATOMIC_NUMBERS.get(s, 0),
+            symbol=s,
+            position=(rng.uniform(-5, 5), rng.uniform(-5, 5), rng.uniform(-5, 5)),
+        )
+        for s in symbols
+    ]
+    return Molecule(atoms=atoms)
+
+
+def generate_network(cfg: NetworkConfig) -> SyntheticNetwork:
+    if cfg.degree not in ("uniform", "powerlaw"):
+        raise ValueError(f"unknown degree distribution: {cfg.degree!r}")
+    if not cfg.elements:
+        raise ValueError("elements must not be empty")
+    rng = random.Random(cfg.seed)
+
+    seen: set = set()
+    species = [_molecule(rng, cfg, seen) for _ in range(cfg.n_species)]
+    if cfg.degree == "powerlaw":
+        weights = [(i + 1) ** -cfg.alpha for i in range(cfg.n_species)]
+    else:
+        weights = None
+
+    def pick(bounds):
+        k = rng.randint(*bounds)
+        return [species[i] for i in rng.choices(range(cfg.n_species), weights=weights, k=k)]
+
+    reactions: List[Reaction] = []
+    for i in range(cfg.n_reactions):
+        if reactions and rng.random() < cfg.duplicate_fraction:
+            src = rng.choice(reactions)
+            reactions.append(Reaction(list(src.reactants), list(src.products), conditions=dict(src.conditions)))
+            continue
+        reactions.append(Reaction(
+            reactants=pick(cfg.reactants_per_reaction),
+            products=pick(cfg.products_per_reaction),
+            conditions={"temperature_K": round(rng.uniform(250, 900), 1)},
+            metadata={"source": "synthetic", "index": i},
+        ))
+    return SyntheticNetwork(cfg, species, reactions)
@@ -1,20 +1,39 @@
 # examples/api_reaction.py
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import Any
 from pathlib import Path
 import json
-import threading
 
 # 使用我们新的宽松 schema
 from src.io.api_schema import ReactionInput  # this is AtomInput / MoleculeInput / ReactionInput
-from src.io.api_adapter import reactioninput_to_reaction, reaction_to_canonical_hash, is_duplicate, register_hash, write_reaction, REACTION_LOG
+from src.io.api_adapter import reactioninput_to_reaction, reaction_to_canonical_hash, is_duplicate, REACTION_LOG
+from src.io.batch_ingest import BackgroundReactionWriter, ingest_batch, parse_batch, summarize, DUPLICATE
 
-app = FastAPI(title="chem-standard Reaction API", version="0.3")
-
-_write_lock = threading.Lock()
 SCHEMA_VERSION = "reaction.v1"
 
+# 所有写入（单条与批量）都交给同一个后台写线程，按批合并落盘
+_writer: BackgroundReactionWriter = None
+_validate_pool: ThreadPoolExecutor = None
+
+
+@asynccontextmanager
+async def lifespan(app):
+    global _writer, _validate_pool
+    _writer = BackgroundReactionWriter()
+    _validate_pool = ThreadPoolExecutor(thread_name_prefix="reaction-validate")
+    try:
+        yield
+    finally:
+        _validate_pool.shutdown()
+        _writer.close()
+
+
+app = FastAPI(title="chem-standard Reaction API", version="0.4", lifespan=lifespan)
+
 @app.post("/upload_reaction")
 def upload_reaction(payload: ReactionInput):
     """
@@ -33,18 +52,8 @@ def upload_reaction(payload: ReactionInput):
         raise HTTPException(status_code=400, detail=f"validation error: {e}")
 
     if not balanced:
-        # 计算元素差值简要说明
-        def aggregate(formulae):
-            total = {}
-            for f in formulae:
-                for k, v in f.items():
-                    total[k] = total.get(k, 0) + v
-            return total
-        react_tot = aggregate(r.reactant_formulae())
-        prod_tot = aggregate(r.product_formulae())
-        diff = {}
-        for k in set(list(react_tot.keys()) + list(prod_tot.keys())):
-            diff[k] = prod_tot.get(k, 0) - react_tot.get(k, 0)
+        # 元素差值简要说明（产物 - 反应物）
+        diff = r.element_difference()
         raise HTTPException(status_code=400, detail={"balanced": False, "difference": diff})
 
     # 去重
@@ -53,17 +62,39 @@ def upload_reaction(payload: ReactionInput):
         # 找到重复：不再写入，但返回已存在（这里我们简单返回 duplicate true）
         return {"status": "ok", "duplicate": True, "hash": h, "logged_to": str(REACTION_LOG.resolve())}
 
-    # 写入
+    # 写入（后台写线程落盘后返回；并发请求的重复由写线程再次判定）
     try:
-        with _write_lock:
-            write_reaction(r)
-            register_hash(h)
+        status = _writer.submit(r, h).result()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-    return {"status": "ok", "reaction_id": r.reaction_id, "logged_to": str(REACTION_LOG.resolve())}
+    return {"status": "ok", "duplicate": status == DUPLICATE, "hash": h, "logged_to": str(REACTION_LOG.resolve())}
+
+
+@app.post("/upload_reactions")
+async def upload_reactions(request: Request):
+    """
+    批量上传：请求体为 ReactionInput 的 JSON 数组，或 NDJSON（Content-Type:
+    application/x-ndjson，每行一个 ReactionInput）。
+    在线程池中校验，批内与已有索引去重，其余交给后台写线程合并落盘。
+    返回每一条的状态（created / duplicate / invalid / unbalanced / error），顺序与输入一致。
+    """
+    body = await request.body()
+    try:
+        items = parse_batch(body, request.headers.get("content-type"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    results = await run_in_threadpool(ingest_batch, items, _writer, _validate_pool)
+    return {
+        "status": "ok",
+        "counts": summarize(results),
+        "items": results,
+        "logged_to": str(REACTION_LOG.resolve()),
+    }
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("examples.api_reaction:app", host="127.0.0.1", port=8000, reload=True)
+    # hash 索引只允许一个写进程（见 api_adapter.open_store）：只能单 worker 运行
+    uvicorn.run("examples.api_reaction:app", host="127.0.0.1", port=8000, reload=True, workers=1)
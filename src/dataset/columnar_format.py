@@ -0,0 +1,291 @@
+# src/dataset/columnar_format.py
+"""
+Binary columnar on-disk format for reaction datasets.
+
+A dataset is a directory of flat .npy arrays plus a small JSON header:
+
+    atomic_numbers.npy    int16   (A,)     all atoms, molecule after molecule
+    symbol_ids.npy        int32   (A,)     index into table["symbols"]
+    positions.npy         float64 (A, 3)
+    masses.npy            float64 (A,)     NaN = not set
+    covalent_radii.npy    float64 (A,)     NaN = not set
+    mol_atom_offsets.npy  int64   (M+1,)   atoms of molecule j: [off[j], off[j+1])
+    rxn_mol_offsets.npy   int64   (R+1,)   molecules of reaction i (reactants first)
+    rxn_n_reactants.npy   int32   (R,)
+    atom_prop_atoms.npy   int64   (P,)     sorted atoms that have properties
+    table.json            format, version, symbols
+
+Strings and variable-size rows are UTF-8 blobs (uint8 .npy) with an
+offsets array, row i being blob[off[i]:off[i+1]]:
+
+    rxn_keys          canonical key of every reaction
+    mol_formulas      formula of every molecule
+    mol_rows          JSON line per molecule: metadata
+    rxn_rows          JSON line per reaction: conditions, metadata,
+                      created_at, extra
+    atom_prop_rows    JSON line per entry of atom_prop_atoms: properties
+
+Everything is opened with np.load(mmap_mode="r"): opening is O(1) in the
+dataset size, a JSON row is only parsed when its molecule / reaction is
+built, and position data is only paged in when coordinates are read.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from src.molecule import Molecule
+from src.reaction import Reaction
+
+FORMAT_NAME = "chem_standard.columnar"
+FORMAT_VERSION = 2
+
+_BLOBS = ("rxn_keys", "mol_formulas", "mol_rows", "rxn_rows", "atom_prop_rows")
+
+_ARRAYS = (
+    "atomic_numbers",
+    "symbol_ids",
+    "positions",
+    "masses",
+    "covalent_radii",
+    "mol_atom_offsets",
+    "rxn_mol_offsets",
+    "rxn_n_reactants",
+    "atom_prop_atoms",
+) + _BLOBS + tuple(f"{name}_offsets" for name in _BLOBS)
+
+# top-level jsonl fields that Reaction itself round-trips
+_REACTION_FIELDS = {"reactants", "products", "conditions", "metadata", "created_at"}
+
+
+def _atom_properties(m: Molecule):
+    if m.is_columnar:
+        return m._properties or ()
+    return [a.properties for a in m.atoms]
+
+
+def _pack(rows: List[str]):
+    """(uint8 blob, int64 offsets) of UTF-8 encoded rows."""
+    encoded = [row.encode("utf-8") for row in rows]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _json_row(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+def write_columnar(reactions: Iterable[Reaction], path: Path, extras: Optional[Iterable[Dict[str, Any]]] = None) -> Path:
+    """
+    Write reactions to a columnar dataset directory.
+
+    extras: optional per-reaction dicts of additional top-level jsonl fields
+    (e.g. reaction_id) that should survive a jsonl round trip.
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    symbols: Dict[str, int] = {}
+    numbers, symbol_ids, masses, radii = [], [], [], []
+    positions = []
+    prop_atoms, prop_rows = [], []
+    mol_offsets = [0]
+    rxn_offsets = [0]
+    n_reactants = []
+    mol_formulas, mol_rows = [], []
+    rxn_keys, rxn_rows = [], []
+
+    extras_iter = iter(extras) if extras is not None else None
+    for r in reactions:
+        mols = list(r.reactants) + list(r.products)
+        for m in mols:
+            cols = m.as_arrays()
+            for s in cols["symbols"].tolist():
+                symbol_ids.append(symbols.setdefault(s, len(symbols)))
+            numbers.append(cols["atomic_numbers"])
+            masses.append(cols["masses"])
+            if len(m):
+                positions.append(np.asarray(cols["positions"], dtype=np.float64))
+            radii.append(cols["covalent_radii"])
+            base = mol_offsets[-1]
+            for i, props in enumerate(_atom_properties(m)):
+                if props:
+                    prop_atoms.append(base + i)
+                    prop_rows.append(_json_row(props))
+            mol_offsets.append(base + len(m))
+            mol_formulas.append(m.formula)
+            mol_rows.append(_json_row(m.metadata))
+        rxn_offsets.append(rxn_offsets[-1] + len(mols))
+        n_reactants.append(len(r.reactants))
+        rxn_keys.append(r.canonical_key())
+        rxn_rows.append(_json_row({
+            "conditions": r.conditions,
+            "metadata": r.metadata,
+            "created_at": r.created_at,
+            "extra": next(extras_iter, None) if extras_iter is not None else None,
+        }))
+
+    arrays = {
+        "atomic_numbers": np.concatenate(numbers).astype(np.int16) if numbers else np.empty(0, np.int16),
+        "symbol_ids": np.asarray(symbol_ids, dtype=np.int32),
+        "positions": np.vstack(positions) if positions else np.empty((0, 3)),
+        "masses": np.concatenate(masses).astype(np.float64) if masses else np.empty(0),
+        "covalent_radii": np.concatenate(radii).astype(np.float64) if radii else np.empty(0),
+        "mol_atom_offsets": np.asarray(mol_offsets, dtype=np.int64),
+        "rxn_mol_offsets": np.asarray(rxn_offsets, dtype=np.int64),
+        "rxn_n_reactants": np.asarray(n_reactants, dtype=np.int32),
+        "atom_prop_atoms": np.asarray(prop_atoms, dtype=np.int64),
+    }
+    blobs = {"rxn_keys": rxn_keys, "mol_formulas": mol_formulas, "mol_rows": mol_rows,
+             "rxn_rows": rxn_rows, "atom_prop_rows": prop_rows}
+    for name, rows in blobs.items():
+        arrays[name], arrays[f"{name}_offsets"] = _pack(rows)
+    for name in _ARRAYS:
+        np.save(path / f"{name}.npy", arrays[name])
+
+    table = {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "symbols": list(symbols),
+    }
+    tmp = path / "table.json.tmp"
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(table, f, ensure_ascii=False)
+    os.replace(tmp, path / "table.json")
+    return path
+
+
+class ColumnarReactions:
+    """
+    Read-only, memory-mapped view over a columnar dataset directory.
+
+    Reactions are built on demand; their molecules are columnar Molecules
+    whose positions are views into the mapped positions array. Version 1
+    datasets (one JSON side table) must be re-created with write_columnar.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with (self.path / "table.json").open("r", encoding="utf-8") as f:
+            table = json.load(f)
+        if table.get("format") != FORMAT_NAME or table.get("version") != FORMAT_VERSION:
+            raise ValueError(f"unsupported columnar dataset: {table.get('format')} v{table.get('version')}")
+        self.table = table
+        self.arrays = {name: np.load(self.path / f"{name}.npy", mmap_mode="r") for name in _ARRAYS}
+        self._symbols = np.asarray(table["symbols"], dtype=str)
+
+    def _row(self, blob: str, i: int) -> str:
+        offsets = self.arrays[f"{blob}_offsets"]
+        return self.arrays[blob][int(offsets[i]):int(offsets[i + 1])].tobytes().decode("utf-8")
+
+    def _rxn_row(self, i: int) -> Dict[str, Any]:
+        return json.loads(self._row("rxn_rows", i))
+
+    def __len__(self) -> int:
+        return len(self.arrays["rxn_n_reactants"])
+
+    def __iter__(self) -> Iterator[Reaction]:
+        for i in range(len(self)):
+            yield self.reaction(i)
+
+    def __getitem__(self, i: int) -> Reaction:
+        return self.reaction(i)
+
+    def canonical_key(self, i: int) -> str:
+        return self._row("rxn_keys", i)
+
+    def canonical_keys(self) -> List[str]:
+        raw = self.arrays["rxn_keys"].tobytes()
+        bounds = self.arrays["rxn_keys_offsets"].tolist()
+        return [raw[bounds[i]:bounds[i + 1]].decode("utf-8") for i in range(len(bounds) - 1)]
+
+    def _atom_properties(self, start: int, end: int) -> Optional[List[Dict[str, Any]]]:
+        atoms = self.arrays["atom_prop_atoms"]
+        lo, hi = np.searchsorted(atoms, [start, end])
+        if lo == hi:
+            return None
+        props: List[Dict[str, Any]] = [{} for _ in range(end - start)]
+        for k in range(int(lo), int(hi)):
+            props[int(atoms[k]) - start] = json.loads(self._row("atom_prop_rows", k))
+        return props
+
+    def molecule(self, j: int) -> Molecule:
+        a = self.arrays
+        start, end = int(a["mol_atom_offsets"][j]), int(a["mol_atom_offsets"][j + 1])
+        radii = a["covalent_radii"][start:end]
+        mol = Molecule.from_arrays(
+            a["atomic_numbers"][start:end],
+            self._symbols[a["symbol_ids"][start:end]] if end > start else [],
+            a["positions"][start:end],
+            masses=a["masses"][start:end],
+            covalent_radii=None if np.isnan(radii).all() else radii,
+            properties=self._atom_properties(start, end),
+            metadata=json.loads(self._row("mol_rows", j)),
+        )
+        # formula was stored at write time; skip recomputing it
+        mol._formula = (end - start, self._row("mol_formulas", j))
+        return mol
+
+    def reaction(self, i: int) -> Reaction:
+        a = self.arrays
+        start, end = int(a["rxn_mol_offsets"][i]), int(a["rxn_mol_offsets"][i + 1])
+        split = start + int(a["rxn_n_reactants"][i])
+        row = self._rxn_row(i)
+        r = Reaction(
+            reactants=[self.molecule(j) for j in range(start, split)],
+            products=[self.molecule(j) for j in range(split, end)],
+            conditions=row["conditions"],
+            metadata=row["metadata"],
+        )
+        r.created_at = row["created_at"]
+        return r
+
+    def reactions(self, indices: Iterable[int]) -> Iterator[Reaction]:
+        for i in indices:
+            yield self.reaction(i)
+
+    def extra(self, i: int) -> Optional[Dict[str, Any]]:
+        return self._rxn_row(i)["extra"]
+
+
+def open_columnar(path: Path) -> ColumnarReactions:
+    return ColumnarReactions(path)
+
+
+def jsonl_to_columnar(jsonl_path: Path, out_path: Path) -> Path:
+    """
+    Convert a reactions jsonl file (e.g. data/reactions.jsonl) to columnar form.
+    created_at and unknown top-level fields are preserved.
+    """
+    reactions, extras = [], []
+    with Path(jsonl_path).open("r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            d = json.loads(line)
+            r = Reaction.from_dict(d)
+            if "created_at" in d:
+                r.created_at = d["created_at"]
+            extra = {k: v for k, v in d.items() if k not in _REACTION_FIELDS}
+            reactions.append(r)
+            extras.append(extra or None)
+    return write_columnar(reactions, out_path, extras=extras)
+
+
+def columnar_to_jsonl(path: Path, jsonl_path: Path) -> Path:
+    """
+    Write a columnar dataset back out as jsonl (one Reaction.as_dict() per line).
+    """
+    cr = ColumnarReactions(path)
+    jsonl_path = Path(jsonl_path)
+    with jsonl_path.open("w", encoding="utf-8") as f:
+        for i, r in enumerate(cr):
+            d = r.as_dict()
+            extra = cr.extra(i)
+            if extra:
+                d.update(extra)
+            f.write(json.dumps(d, ensure_ascii=False) + "\n")
+    return jsonl_path
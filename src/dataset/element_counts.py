@@ -0,0 +1,260 @@
+# src/dataset/element_counts.py
+"""
+Dataset-wide element counts in a few NumPy calls.
+
+ElementCounts holds a sparse molecules × elements count matrix for a whole
+set of reactions (every reactant and product molecule, reaction after
+reaction, reactants first — the layout of the columnar format), built from
+flat per-atom element codes and segment offsets:
+
+    key    = molecule index * n_elements + element code   (one per atom)
+    counts = unique(key) -> CSR rows / columns / counts
+
+From it, in bulk:
+
+- hill_formulas(): Hill-ordered formula per molecule (C, H, then
+  alphabetical; alphabetical throughout when there is no carbon)
+- element_difference(): products − reactants per reaction (sparse, same sign
+  and semantics as Reaction.element_difference), balanced() as a bool mask
+
+Elements are identified by symbol, like Molecule.element_counts and the
+balance check; columns are in Hill order (see `elements`).
+
+    ec = ElementCounts.from_reactions(dataset.iter_reactions())
+    ec = ElementCounts.from_columnar(ColumnarReactions(path))   # no Molecule objects
+"""
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+_symbol = attrgetter("symbol")
+
+
+def hill_order(symbols: Iterable[str]) -> List[str]:
+    """C, H first (when present), then the rest alphabetically."""
+    symbols = set(symbols)
+    head = [s for s in ("C", "H") if s in symbols]
+    return head + sorted(symbols - {"C", "H"})
+
+
+class CountMatrix:
+    """
+    Minimal CSR integer matrix: row i has columns indices[indptr[i]:indptr[i+1]]
+    (ascending) with counts data[...]. Only nonzero entries are stored.
+    """
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, n_cols: int):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.shape = (len(indptr) - 1, int(n_cols))
+
+    @classmethod
+    def from_keys(cls, keys: np.ndarray, values: Optional[np.ndarray], n_rows: int, n_cols: int) -> "CountMatrix":
+        """
+        Sum values (default 1) per key = row * n_cols + col; zero sums are dropped.
+        """
+        uniq, inverse = np.unique(keys, return_inverse=True)
+        if values is None:
+            sums = np.bincount(inverse, minlength=len(uniq))
+        else:
+            sums = np.bincount(inverse, weights=values, minlength=len(uniq)).round()
+        nz = sums != 0
+        uniq, sums = uniq[nz], sums[nz].astype(np.int64)
+        rows, cols = np.divmod(uniq, n_cols)
+        indptr = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+        return cls(indptr, cols.astype(np.int32), sums, n_cols)
+
+    @property
+    def nnz(self) -> int:
+        return len(self.data)
+
+    def row(self, i: int):
+        s, e = self.indptr[i], self.indptr[i + 1]
+        return self.indices[s:e], self.data[s:e]
+
+    def row_nnz(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def toarray(self) -> np.ndarray:
+        out = np.zeros(self.shape, dtype=np.int64)
+        rows = np.repeat(np.arange(self.shape[0]), self.row_nnz())
+        out[rows, self.indices] = self.data
+        return out
+
+    def to_scipy(self):
+        """scipy.sparse.csr_matrix view (scipy is optional)."""
+        from scipy.sparse import csr_matrix
+
+        return csr_matrix((self.data, self.indices, self.indptr), shape=self.shape)
+
+
+class ElementCounts:
+    """
+    - elements: column labels, Hill order
+    - molecules: CountMatrix, one row per molecule
+    - rxn_mol_offsets: molecules of reaction i are rows [off[i], off[i+1])
+    - n_reactants: the first n_reactants[i] of them are reactants
+    """
+
+    def __init__(
+        self,
+        elements: Sequence[str],
+        molecules: CountMatrix,
+        rxn_mol_offsets: np.ndarray,
+        n_reactants: np.ndarray,
+    ):
+        self.elements = list(elements)
+        self.molecules = molecules
+        self.rxn_mol_offsets = np.asarray(rxn_mol_offsets, dtype=np.int64)
+        self.n_reactants = np.asarray(n_reactants, dtype=np.int64)
+        self._diff: Optional[CountMatrix] = None
+
+    # ---------- construction ----------
+
+    @classmethod
+    def from_codes(
+        cls,
+        symbols: Sequence[str],
+        codes: np.ndarray,
+        mol_atom_offsets: np.ndarray,
+        rxn_mol_offsets: np.ndarray,
+        n_reactants: np.ndarray,
+    ) -> "ElementCounts":
+        """
+        Core constructor over flat arrays: codes[a] indexes `symbols` for atom a,
+        atoms of molecule j are [mol_atom_offsets[j], mol_atom_offsets[j+1]).
+        """
+        elements = hill_order(symbols)
+        column = {el: i for i, el in enumerate(elements)}
+        remap = np.array([column[s] for s in symbols], dtype=np.int64)
+        codes = np.asarray(codes)
+        mol_atom_offsets = np.asarray(mol_atom_offsets, dtype=np.int64)
+        n_mols = len(mol_atom_offsets) - 1
+
+        n_cols = max(len(elements), 1)
+        mol_of_atom = np.repeat(np.arange(n_mols, dtype=np.int64), np.diff(mol_atom_offsets))
+        keys = mol_of_atom * n_cols + remap[codes]
+        return cls(elements, CountMatrix.from_keys(keys, None, n_mols, n_cols), rxn_mol_offsets, n_reactants)
+
+    @classmethod
+    def from_reactions(cls, reactions: Iterable) -> "ElementCounts":
+        """
+        Gather per-atom symbols of all molecules once, then code them in bulk.
+        Symbols are collected with one C-level extend per molecule (columnar
+        molecules from their symbol arrays), coded with set() and
+        np.fromiter(map(...)); no Python statement runs per atom.
+        """
+        symbols: List[str] = []
+        mol_lengths: List[int] = []
+        rxn_sizes: List[int] = []
+        n_reactants: List[int] = []
+        for r in reactions:
+            mols = list(r.reactants) + list(r.products)
+            for m in mols:
+                n = len(symbols)
+                symbols.extend(m._symbols.tolist() if m.is_columnar else map(_symbol, m.atoms))
+                mol_lengths.append(len(symbols) - n)
+            rxn_sizes.append(len(mols))
+            n_reactants.append(len(r.reactants))
+
+        vocab = sorted(set(symbols))
+        code_of = {s: i for i, s in enumerate(vocab)}
+        codes = np.fromiter(map(code_of.__getitem__, symbols), dtype=np.int64, count=len(symbols))
+        return cls.from_codes(
+            vocab,
+            codes,
+            np.concatenate(([0], np.cumsum(mol_lengths, dtype=np.int64))),
+            np.concatenate(([0], np.cumsum(rxn_sizes, dtype=np.int64))),
+            np.asarray(n_reactants, dtype=np.int64),
+        )
+
+    @classmethod
+    def from_columnar(cls, cr) -> "ElementCounts":
+        """From a ColumnarReactions view: its arrays are used directly."""
+        a = cr.arrays
+        return cls.from_codes(
+            cr.table["symbols"],
+            a["symbol_ids"],
+            a["mol_atom_offsets"],
+            a["rxn_mol_offsets"],
+            a["rxn_n_reactants"],
+        )
+
+    # ---------- molecules ----------
+
+    @property
+    def n_molecules(self) -> int:
+        return self.molecules.shape[0]
+
+    @property
+    def n_reactions(self) -> int:
+        return len(self.n_reactants)
+
+    def counts(self, j: int) -> Dict[str, int]:
+        """Element counts of molecule j, alphabetical (like Molecule.element_counts)."""
+        cols, data = self.molecules.row(j)
+        els = self.elements
+        return dict(sorted((els[c], n) for c, n in zip(cols.tolist(), data.tolist())))
+
+    def hill_formulas(self) -> List[str]:
+        """Hill formula of every molecule; identical compositions are formatted once."""
+        m = self.molecules
+        labels = self.elements
+        has_carbon = bool(labels) and labels[0] == "C"
+        h_col = labels.index("H") if "H" in labels else -1
+        # position of H among the alphabetically sorted labels (for carbon-free rows)
+        alpha_rank = {c: i for i, c in enumerate(sorted(range(len(labels)), key=labels.__getitem__))}
+
+        indptr = m.indptr.tolist()
+        indices, data = m.indices, m.data
+        cache: Dict[bytes, str] = {}
+        out = []
+        for j in range(m.shape[0]):
+            s, e = indptr[j], indptr[j + 1]
+            key = indices[s:e].tobytes() + b"|" + data[s:e].tobytes()
+            formula = cache.get(key)
+            if formula is None:
+                pairs = list(zip(indices[s:e].tolist(), data[s:e].tolist()))
+                if not (has_carbon and pairs and pairs[0][0] == 0) and h_col >= 0:
+                    # no carbon: H is ordered alphabetically with the rest
+                    pairs.sort(key=lambda p: alpha_rank[p[0]])
+                formula = cache[key] = "".join(labels[c] + (str(n) if n > 1 else "") for c, n in pairs)
+            out.append(formula)
+        return out
+
+    # ---------- reactions ----------
+
+    def _molecule_reactions(self):
+        sizes = np.diff(self.rxn_mol_offsets)
+        mol_rxn = np.repeat(np.arange(self.n_reactions, dtype=np.int64), sizes)
+        # +1 for products, -1 for reactants
+        first_product = self.rxn_mol_offsets[:-1] + self.n_reactants
+        sign = np.where(np.arange(self.n_molecules) >= np.repeat(first_product, sizes), 1, -1)
+        return mol_rxn, sign
+
+    def element_difference(self) -> CountMatrix:
+        """
+        Reactions × elements matrix of products − reactants (nonzero entries
+        only), i.e. Reaction.element_difference for every reaction at once.
+        """
+        if self._diff is None:
+            m = self.molecules
+            mol_rxn, sign = self._molecule_reactions()
+            rows = np.repeat(np.arange(self.n_molecules, dtype=np.int64), m.row_nnz())
+            n_cols = m.shape[1]
+            keys = mol_rxn[rows] * n_cols + m.indices
+            self._diff = CountMatrix.from_keys(keys, sign[rows] * m.data, self.n_reactions, n_cols)
+        return self._diff
+
+    def balanced(self) -> np.ndarray:
+        """Bool mask: reaction i conserves every element."""
+        return self.element_difference().row_nnz() == 0
+
+    def difference(self, i: int) -> Dict[str, int]:
+        """element_difference() row i as a dict, like Reaction.element_difference."""
+        cols, data = self.element_difference().row(i)
+        els = self.elements
+        return dict(sorted((els[c], n) for c, n in zip(cols.tolist(), data.tolist())))
@@ -1,47 +1,150 @@
 from pathlib import Path
 import json
 from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Union
 from src.reaction import Reaction
 
 
+def iter_jsonl(path: Path, batch_size: Optional[int] = None) -> Iterator[Union[Reaction, List[Reaction]]]:
+    """
+    Lazily parse reactions from a jsonl file.
+
+    - batch_size=None: yield one Reaction per non-empty line
+    - batch_size=N: yield lists of up to N reactions (last batch may be shorter)
+
+    Only the current line / batch is held in memory.
+    """
+    if batch_size is not None and batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+
+    batch: List[Reaction] = []
+    with Path(path).open("r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            r = Reaction.from_dict(json.loads(line))
+            if batch_size is None:
+                yield r
+                continue
+            batch.append(r)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
 class ReactionDataset:
     def __init__(self):
         self._reactions = []
         self._by_canonical = defaultdict(list)
+        # set by load_columnar() / parallel load_jsonl(): a ColumnarReactions
+        # or JsonlReactions view; reactions are then built on demand from it
+        self._view = None
+        self._view_first: Optional[Dict[str, int]] = None
+
+    iter_jsonl = staticmethod(iter_jsonl)
+
+    def _clear(self):
+        self._reactions.clear()
+        self._by_canonical.clear()
+        self._view = None
+        self._view_first = None
 
-    def load_jsonl(self, path: Path):
+    def load_jsonl(self, path: Path, workers: Optional[int] = None):
         """
         Load reactions from a jsonl file.
         Each line must be a Reaction-compatible dict.
+
+        workers > 1 keys newline-aligned byte ranges in that many processes
+        (see src.dataset.sharded_ingest) and backs the dataset with the
+        resulting line offsets: reactions are then parsed when iterated,
+        like a columnar dataset. Order is the same as a serial load.
         """
-        self._reactions.clear()
-        self._by_canonical.clear()
+        self._clear()
+
+        if workers is not None and workers > 1:
+            from src.dataset.sharded_ingest import index_jsonl
+            self._view = index_jsonl(path, workers=workers)
+            return
 
-        with path.open("r", encoding="utf-8") as f:
-            for line in f:
-                if not line.strip():
-                    continue
-                d = json.loads(line)
-                r = Reaction.from_dict(d)
-                self._reactions.append(r)
-                self._by_canonical[r.canonical_key()].append(r)
+        for r in iter_jsonl(path):
+            self._reactions.append(r)
+            self._by_canonical[r.canonical_key()].append(r)
+
+    def load_columnar(self, path: Path):
+        """
+        Back the dataset with a columnar dataset directory (see
+        src.dataset.columnar_format). Arrays are memory-mapped and nothing is
+        parsed up front: reactions are built when iterated, and canonical keys
+        come from the side table instead of being recomputed.
+        """
+        from src.dataset.columnar_format import ColumnarReactions
+
+        self._clear()
+        self._view = ColumnarReactions(path)
+
+    def _view_groups(self) -> Dict[str, int]:
+        """canonical_key -> index of its first reaction in the backing view."""
+        if self._view_first is None:
+            first: Dict[str, int] = {}
+            for i, key in enumerate(self._view.canonical_keys()):
+                first.setdefault(key, i)
+            self._view_first = first
+        return self._view_first
+
+    def save_columnar(self, path: Path) -> Path:
+        """
+        Write all reactions to a columnar dataset directory.
+        """
+        from src.dataset.columnar_format import write_columnar
+
+        return write_columnar(self.iter_reactions(), path)
 
     def reactions(self):
         """Return all reactions (raw list)."""
+        if self._view is not None:
+            return list(self._view)
         return list(self._reactions)
 
+    def iter_reactions(self) -> Iterator[Reaction]:
+        """Iterate over all reactions without copying the underlying list."""
+        if self._view is not None:
+            return iter(self._view)
+        return iter(self._reactions)
+
     def canonical_reactions(self):
         """
         Return one representative Reaction per canonical_key.
         Selection rule: first occurrence.
         """
+        if self._view is not None:
+            groups = self._view_groups()
+            return dict(zip(groups, self._view.reactions(groups.values())))
         return {
             k: v[0]
             for k, v in self._by_canonical.items()
         }
 
+    def element_counts(self):
+        """
+        Bulk element-count matrix / Hill formulas / balance of all reactions
+        (see src.dataset.element_counts.ElementCounts).
+        """
+        from src.dataset.columnar_format import ColumnarReactions
+        from src.dataset.element_counts import ElementCounts
+
+        if isinstance(self._view, ColumnarReactions):
+            return ElementCounts.from_columnar(self._view)
+        return ElementCounts.from_reactions(self.iter_reactions())
+
     def stats(self):
         """Return dataset-level statistics."""
+        if self._view is not None:
+            return {
+                "total_reactions": len(self._view),
+                "unique_reactions": len(self._view_groups()),
+            }
         return {
             "total_reactions": len(self._reactions),
             "unique_reactions": len(self._by_canonical),
@@ -0,0 +1,387 @@
+# src/dataset/reaction_store.py
+"""
+Persistent reaction dataset in a local SQLite database (WAL mode).
+
+    reactions            id (insertion order), canonical_key, api_hash,
+                         created_at, payload (Reaction.as_dict() as JSON)
+    reaction_species     (formula, reaction_id, role)  role: 0 reactant, 1 product
+    reaction_conditions  (field, num | text, reaction_id) for the indexed
+                         condition fields (scalar values only)
+    meta                 schema version, hash version, indexed condition fields
+
+Every lookup column is indexed, so opening a store is O(1) and queries by
+canonical key, API hash, species formula or condition value touch only the
+matching rows. Inserts are batched: one BEGIN IMMEDIATE transaction and one
+executemany per table per batch. WAL lets any number of reader processes
+(ReactionStore(path, readonly=True)) share the file with one writer.
+
+StoreDataset adapts a store to the ReactionDataset / ReactionGraph query
+API (reactions, canonical_reactions, stats, reactions_by_species, ...).
+"""
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from src.reaction import Reaction
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reactions (
+    id            INTEGER PRIMARY KEY,
+    canonical_key TEXT NOT NULL,
+    api_hash      TEXT,
+    created_at    TEXT,
+    payload       TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reactions_canonical ON reactions (canonical_key, id);
+CREATE INDEX IF NOT EXISTS reactions_hash ON reactions (api_hash);
+CREATE TABLE IF NOT EXISTS reaction_species (
+    formula     TEXT NOT NULL,
+    reaction_id INTEGER NOT NULL,
+    role        INTEGER NOT NULL,
+    PRIMARY KEY (formula, reaction_id, role)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS reaction_species_by_reaction ON reaction_species (reaction_id);
+CREATE TABLE IF NOT EXISTS reaction_conditions (
+    field       TEXT NOT NULL,
+    num         REAL,
+    text        TEXT,
+    reaction_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reaction_conditions_num ON reaction_conditions (field, num);
+CREATE INDEX IF NOT EXISTS reaction_conditions_text ON reaction_conditions (field, text);
+"""
+
+REACTANT = 0
+PRODUCT = 1
+
+
+def _reaction_from_payload(payload: str) -> Reaction:
+    d = json.loads(payload)
+    r = Reaction.from_dict(d)
+    if d.get("created_at"):
+        r.created_at = d["created_at"]
+    return r
+
+
+class ReactionStore:
+    """
+    - path: SQLite file (created with its schema if missing)
+    - condition_fields: condition keys to index; None = every scalar
+      condition. Fixed when the store is created, reopening with a
+      different list raises ValueError.
+    - with_hashes: also store reaction_to_canonical_hash (API dedup hash)
+    - readonly: open read-only (for reader processes)
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        condition_fields: Optional[Sequence[str]] = None,
+        with_hashes: bool = True,
+        readonly: bool = False,
+        timeout: float = 30.0,
+    ):
+        self.path = Path(path)
+        self.readonly = readonly
+        if readonly:
+            uri = f"file:{self.path.resolve()}?mode=ro"
+            self._conn = sqlite3.connect(uri, uri=True, timeout=timeout, isolation_level=None, check_same_thread=False)
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), timeout=timeout, isolation_level=None, check_same_thread=False)
+        # one connection shared by the threads of this process
+        self._lock = threading.RLock()
+
+        conn = self._conn
+        if not readonly:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+        if readonly:
+            meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+        else:
+            from src.io.api_adapter import HASH_VERSION
+
+            defaults = {
+                "schema_version": str(SCHEMA_VERSION),
+                "hash_version": str(HASH_VERSION) if with_hashes else "",
+                "condition_fields": json.dumps(None if condition_fields is None else list(condition_fields)),
+            }
+            # processes creating the same new store race here: the first one
+            # to get the write lock sets meta, the others read what it wrote
+            with self._transaction():
+                conn.executemany("INSERT OR IGNORE INTO meta (key, value) VALUES (?, ?)", defaults.items())
+                meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+
+        if int(meta.get("schema_version", -1)) != SCHEMA_VERSION:
+            raise ValueError(f"{self.path}: unsupported reaction store schema {meta.get('schema_version')}")
+        stored_fields = json.loads(meta["condition_fields"])
+        if condition_fields is not None and stored_fields != list(condition_fields):
+            raise ValueError(f"{self.path}: store indexes conditions {stored_fields}, not {list(condition_fields)}")
+        self.condition_fields: Optional[List[str]] = stored_fields
+        self.hash_version: Optional[int] = int(meta["hash_version"]) if meta["hash_version"] else None
+
+    # ---------- transactions ----------
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            # take the write lock up front: concurrent writers queue here
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _query(self, sql: str, params: Sequence[Any] = ()) -> List[Tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # ---------- writing ----------
+
+    def _condition_rows(self, rid: int, conditions: Dict[str, Any]):
+        fields = self.condition_fields
+        for field, value in conditions.items():
+            if fields is not None and field not in fields:
+                continue
+            if isinstance(value, (bool, int, float)):
+                yield (field, float(value), None, rid)
+            elif isinstance(value, str):
+                yield (field, None, value, rid)
+
+    def add_reactions(self, reactions: Iterable[Reaction], batch_size: int = 1000) -> int:
+        """
+        Insert reactions (duplicates included, like ReactionDataset) in
+        transactions of batch_size. Returns the number inserted.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        hash_fn = None
+        if self.hash_version is not None:
+            from src.io.api_adapter import reaction_to_canonical_hash as hash_fn
+
+        total = 0
+        batch: List[Reaction] = []
+        for r in reactions:
+            batch.append(r)
+            if len(batch) >= batch_size:
+                total += self._insert_batch(batch, hash_fn)
+                batch = []
+        if batch:
+            total += self._insert_batch(batch, hash_fn)
+        return total
+
+    def add_reaction(self, r: Reaction) -> int:
+        return self.add_reactions([r])
+
+    def _insert_batch(self, batch: List[Reaction], hash_fn) -> int:
+        # payloads / keys are computed outside the write lock
+        prepared = []
+        for r in batch:
+            prepared.append((
+                r.canonical_key(),
+                hash_fn(r, version=self.hash_version) if hash_fn is not None else None,
+                r.created_at,
+                json.dumps(r.as_dict(), ensure_ascii=False),
+                [(m.formula, REACTANT) for m in r.reactants] + [(m.formula, PRODUCT) for m in r.products],
+                r.conditions,
+            ))
+
+        with self._transaction() as conn:
+            first = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM reactions").fetchone()[0]
+            rows, species, conditions = [], set(), []
+            for i, (key, h, created_at, payload, formulas, conds) in enumerate(prepared):
+                rid = first + i
+                rows.append((rid, key, h, created_at, payload))
+                species.update((formula, rid, role) for formula, role in formulas)
+                conditions.extend(self._condition_rows(rid, conds))
+            conn.executemany(
+                "INSERT INTO reactions (id, canonical_key, api_hash, created_at, payload) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            conn.executemany("INSERT INTO reaction_species (formula, reaction_id, role) VALUES (?, ?, ?)", species)
+            conn.executemany(
+                "INSERT INTO reaction_conditions (field, num, text, reaction_id) VALUES (?, ?, ?, ?)", conditions
+            )
+        return len(prepared)
+
+    def import_jsonl(self, path: Path, batch_size: int = 1000) -> int:
+        """
+        Append every reaction of a jsonl file (streamed, batch_size per
+        transaction), keeping the recorded created_at.
+        """
+        def records():
+            with Path(path).open("r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield _reaction_from_payload(line)
+
+        return self.add_reactions(records(), batch_size=batch_size)
+
+    # ---------- reading ----------
+
+    def _reactions(self, sql: str, params: Sequence[Any] = ()) -> List[Reaction]:
+        return [_reaction_from_payload(row[0]) for row in self._query(sql, params)]
+
+    def __len__(self) -> int:
+        return self._query("SELECT COUNT(*) FROM reactions")[0][0]
+
+    def __contains__(self, key: str) -> bool:
+        """Canonical key or API hash."""
+        return bool(self._query(
+            "SELECT EXISTS (SELECT 1 FROM reactions WHERE canonical_key = ?)"
+            " OR EXISTS (SELECT 1 FROM reactions WHERE api_hash = ?)",
+            (key, key),
+        )[0][0])
+
+    def count_unique(self) -> int:
+        return self._query("SELECT COUNT(DISTINCT canonical_key) FROM reactions")[0][0]
+
+    def iter_reactions(self, batch_size: int = 1000) -> Iterator[Reaction]:
+        """All reactions in insertion order, fetched batch_size rows at a time."""
+        last = 0
+        while True:
+            rows = self._query("SELECT id, payload FROM reactions WHERE id > ? ORDER BY id LIMIT ?", (last, batch_size))
+            if not rows:
+                return
+            for rid, payload in rows:
+                yield _reaction_from_payload(payload)
+            last = rows[-1][0]
+
+    def get(self, canonical_key: str) -> List[Reaction]:
+        return self._reactions("SELECT payload FROM reactions WHERE canonical_key = ? ORDER BY id", (canonical_key,))
+
+    def get_by_hash(self, api_hash: str) -> List[Reaction]:
+        return self._reactions("SELECT payload FROM reactions WHERE api_hash = ? ORDER BY id", (api_hash,))
+
+    def canonical_keys(self) -> List[str]:
+        """Distinct canonical keys in first-occurrence order."""
+        return [row[0] for row in self._query(
+            "SELECT canonical_key FROM reactions GROUP BY canonical_key ORDER BY MIN(id)"
+        )]
+
+    def representatives(self) -> Dict[str, Reaction]:
+        """canonical_key -> first occurrence."""
+        rows = self._query(
+            "SELECT canonical_key, payload FROM reactions WHERE id IN"
+            " (SELECT MIN(id) FROM reactions GROUP BY canonical_key) ORDER BY id"
+        )
+        return {key: _reaction_from_payload(payload) for key, payload in rows}
+
+    def counts(self) -> Dict[str, int]:
+        """canonical_key -> number of stored reactions, first-occurrence order."""
+        return dict(self._query(
+            "SELECT canonical_key, COUNT(*) FROM reactions GROUP BY canonical_key ORDER BY MIN(id)"
+        ))
+
+    def reactions_by_species(self, formula: str, role: Optional[int] = None, unique: bool = True) -> List[Reaction]:
+        """
+        Reactions involving a species formula (role REACTANT / PRODUCT to
+        restrict). unique=True keeps the first occurrence per canonical key.
+        """
+        where = "s.formula = ?" + ("" if role is None else " AND s.role = ?")
+        params: Tuple = (formula,) if role is None else (formula, role)
+        ids = f"SELECT DISTINCT s.reaction_id FROM reaction_species s WHERE {where}"
+        if unique:
+            ids = f"SELECT MIN(r.id) FROM reactions r WHERE r.id IN ({ids}) GROUP BY r.canonical_key"
+        return self._reactions(f"SELECT payload FROM reactions WHERE id IN ({ids}) ORDER BY id", params)
+
+    def species(self) -> List[str]:
+        return [row[0] for row in self._query("SELECT DISTINCT formula FROM reaction_species ORDER BY formula")]
+
+    def reactions_by_condition(
+        self,
+        field: str,
+        value: Any = None,
+        min_value: Optional[float] = None,
+        max_value: Optional[float] = None,
+    ) -> List[Reaction]:
+        """
+        Reactions whose indexed condition `field` equals value, or lies in
+        [min_value, max_value] (numeric; either bound may be None).
+        """
+        if self.condition_fields is not None and field not in self.condition_fields:
+            raise KeyError(f"condition {field!r} is not indexed in this store")
+        if value is not None:
+            if isinstance(value, str):
+                cond, params = "text = ?", [value]
+            else:
+                cond, params = "num = ?", [float(value)]
+        else:
+            parts, params = ["num IS NOT NULL"], []
+            if min_value is not None:
+                parts.append("num >= ?")
+                params.append(float(min_value))
+            if max_value is not None:
+                parts.append("num <= ?")
+                params.append(float(max_value))
+            cond = " AND ".join(parts)
+        return self._reactions(
+            "SELECT payload FROM reactions WHERE id IN"
+            f" (SELECT reaction_id FROM reaction_conditions WHERE field = ? AND {cond}) ORDER BY id",
+            [field] + params,
+        )
+
+    def stats(self) -> Dict[str, int]:
+        return {"total_reactions": len(self), "unique_reactions": self.count_unique()}
+
+    # ---------- lifecycle ----------
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "ReactionStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class StoreDataset:
+    """
+    ReactionDataset-compatible view of a ReactionStore: reactions(),
+    iter_reactions(), canonical_reactions(), stats(), load_jsonl(), plus the
+    ReactionGraph lookups reactions_by_species() / species().
+    Nothing is cached in memory; every call reads the store.
+    """
+
+    def __init__(self, store: ReactionStore):
+        self.store = store
+
+    @classmethod
+    def open(cls, path: Union[str, Path], **kwargs) -> "StoreDataset":
+        return cls(ReactionStore(path, **kwargs))
+
+    def load_jsonl(self, path: Path, batch_size: int = 1000):
+        """Append a jsonl file to the store (ReactionDataset.load_jsonl replaces; a store accumulates)."""
+        self.store.import_jsonl(path, batch_size=batch_size)
+
+    def reactions(self) -> List[Reaction]:
+        return list(self.store.iter_reactions())
+
+    def iter_reactions(self) -> Iterator[Reaction]:
+        return self.store.iter_reactions()
+
+    def canonical_reactions(self) -> Dict[str, Reaction]:
+        return self.store.representatives()
+
+    def reactions_by_species(self, formula: str) -> List[Reaction]:
+        return self.store.reactions_by_species(formula)
+
+    def species(self):
+        return set(self.store.species())
+
+    def stats(self) -> Dict[str, int]:
+        return self.store.stats()
@@ -0,0 +1,145 @@
+# src/dataset/sharded_ingest.py
+"""
+Multi-process jsonl ingest.
+
+The file is split into newline-aligned byte ranges; each worker process parses
+its range (json.loads -> Reaction.from_dict -> canonical_key) and sends back
+only compact results: the byte offset of every line (int64 array) and its
+canonical key. Reaction objects are never pickled across processes; the
+parent builds them on demand from the offsets (JsonlReactions), so the
+serial unpickling step that would cap the speedup does not exist. Ranges are
+consumed in file order, so callers see reactions in exactly the same order
+as a single-process scan.
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from src.reaction import Reaction
+
+
+def shard_ranges(path: Path, n_shards: int) -> List[Tuple[int, int]]:
+    """
+    Split a file into at most n_shards [start, end) byte ranges whose boundaries
+    fall right after a newline.
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    n_shards = max(1, min(int(n_shards), size))
+
+    bounds = [0]
+    with open(path, "rb") as f:
+        for i in range(1, n_shards):
+            pos = size * i // n_shards
+            if pos <= bounds[-1]:
+                continue
+            f.seek(pos - 1)
+            # finish the line containing byte pos-1 (no-op if it is a newline)
+            f.readline()
+            pos = f.tell()
+            if pos >= size:
+                break
+            if pos > bounds[-1]:
+                bounds.append(pos)
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _iter_lines(path: str, start: int, end: int) -> Iterator[Tuple[int, bytes]]:
+    """(byte offset, line) of the non-empty lines in [start, end)."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        pos = start
+        while pos < end:
+            line = f.readline()
+            if not line:
+                break
+            if line.strip():
+                yield pos, line
+            pos += len(line)
+
+
+def key_range(path: str, start: int, end: int) -> Tuple[np.ndarray, List[str]]:
+    """
+    Line offsets and canonical keys of the lines in [start, end); the
+    Reactions are parsed to compute the keys and then dropped.
+    """
+    offsets, keys = [], []
+    for pos, line in _iter_lines(path, start, end):
+        offsets.append(pos)
+        keys.append(Reaction.from_dict(json.loads(line)).canonical_key())
+    return np.asarray(offsets, dtype=np.int64), keys
+
+
+def _key_range_task(args):
+    return key_range(*args)
+
+
+class JsonlReactions:
+    """
+    Reactions of a jsonl file addressed by line offsets, with their canonical
+    keys. Reactions are parsed from the file when accessed; nothing but the
+    offsets array and the keys is held in memory.
+    """
+
+    def __init__(self, path: Path, offsets: np.ndarray, keys: List[str]):
+        self.path = Path(path)
+        self.offsets = offsets
+        self.keys = keys
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __iter__(self) -> Iterator[Reaction]:
+        return self.reactions(range(len(self)))
+
+    def __getitem__(self, i: int) -> Reaction:
+        return self.reaction(i)
+
+    def canonical_key(self, i: int) -> str:
+        return self.keys[i]
+
+    def canonical_keys(self) -> List[str]:
+        return list(self.keys)
+
+    def reaction(self, i: int) -> Reaction:
+        return next(self.reactions([i]))
+
+    def reactions(self, indices: Iterable[int]) -> Iterator[Reaction]:
+        """Parse the given lines (one open file for all of them)."""
+        offsets = self.offsets
+        with self.path.open("rb") as f:
+            for i in indices:
+                f.seek(int(offsets[i]))
+                yield Reaction.from_dict(json.loads(f.readline()))
+
+
+def index_jsonl(
+    path: Path,
+    workers: Optional[int] = None,
+    shards_per_worker: int = 4,
+) -> JsonlReactions:
+    """
+    Key every line of a jsonl file, parsing byte ranges in parallel worker
+    processes (workers=None: os.cpu_count(); workers=1: in-process).
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        offsets, keys = key_range(str(path), 0, os.path.getsize(path))
+        return JsonlReactions(path, offsets, keys)
+
+    ranges = shard_ranges(path, workers * max(1, shards_per_worker))
+    tasks = [(str(path), start, end) for start, end in ranges]
+    parts_offsets, keys = [], []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map() returns shard results in submission (= file) order
+        for offsets, part_keys in pool.map(_key_range_task, tasks):
+            parts_offsets.append(offsets)
+            keys.extend(part_keys)
+    offsets = np.concatenate(parts_offsets) if parts_offsets else np.empty(0, dtype=np.int64)
+    return JsonlReactions(path, offsets, keys)
@@ -0,0 +1,166 @@
+# src/graph/condition_index.py
+"""
+Secondary indexes on Reaction.conditions values, maintained by ReactionGraph
+(see ReactionGraph.add_condition_index / query).
+
+- NumericConditionIndex: values in a sorted float64 array with a parallel
+  array of slots; a closed range [low, high] is two np.searchsorted calls
+  and one slice. Adds / removes only mark the arrays stale; they are
+  re-sorted on the next query.
+- CategoricalConditionIndex: value -> set of reaction ids (hash map).
+
+Entries are keyed by id(reaction), not by Reaction equality: reactions with
+the same stoichiometry compare equal but may carry different conditions
+(300 K vs 500 K), and each is indexed on its own. Lookups return sets of
+those ids; the owner keeps the reactions alive and maps ids back.
+
+Reactions whose condition is missing, or of the wrong type for the index
+(non-numbers / NaN in a numeric index, unhashable values in a categorical
+one), are simply not indexed under that key.
+"""
+import math
+from numbers import Real
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+NUMERIC = "numeric"
+CATEGORICAL = "categorical"
+
+_MISSING = object()
+
+
+def as_number(value: Any) -> Optional[float]:
+    if isinstance(value, bool) or not isinstance(value, Real):
+        return None
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+def infer_kind(values: Iterable[Any]) -> str:
+    """NUMERIC if every given value is a real number, else CATEGORICAL."""
+    values = [v for v in values if v is not None]
+    if not values:
+        raise ValueError("cannot infer the index kind without values; pass kind explicitly")
+    return NUMERIC if all(as_number(v) is not None for v in values) else CATEGORICAL
+
+
+class NumericConditionIndex:
+    kind = NUMERIC
+
+    def __init__(self, key: str):
+        self.key = key
+        self._slots: List[Optional[int]] = []  # slot -> id(reaction) (None once removed)
+        self._slot_values: List[float] = []
+        self._slot_of: Dict[int, int] = {}
+        self._values = np.empty(0, dtype=np.float64)
+        self._order = np.empty(0, dtype=np.int64)
+        self._stale = False
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def add(self, reaction) -> bool:
+        value = as_number(reaction.conditions.get(self.key))
+        if value is None or id(reaction) in self._slot_of:
+            return False
+        self._slot_of[id(reaction)] = len(self._slots)
+        self._slots.append(id(reaction))
+        self._slot_values.append(value)
+        self._stale = True
+        return True
+
+    def discard(self, reaction):
+        slot = self._slot_of.pop(id(reaction), None)
+        if slot is not None:
+            self._slots[slot] = None
+            self._stale = True
+
+    def _refresh(self):
+        if not self._stale:
+            return
+        if len(self._slot_of) < len(self._slots):
+            # compact removed slots
+            live = [i for i, rid in enumerate(self._slots) if rid is not None]
+            self._slots = [self._slots[i] for i in live]
+            self._slot_values = [self._slot_values[i] for i in live]
+            self._slot_of = {rid: i for i, rid in enumerate(self._slots)}
+        values = np.asarray(self._slot_values, dtype=np.float64)
+        self._order = np.argsort(values, kind="stable")
+        self._values = values[self._order]
+        self._stale = False
+
+    def range(self, low: Optional[float] = None, high: Optional[float] = None) -> Set[int]:
+        """Ids of the reactions with low <= value <= high (None = unbounded)."""
+        self._refresh()
+        values = self._values
+        start = 0 if low is None else int(np.searchsorted(values, low, side="left"))
+        stop = len(values) if high is None else int(np.searchsorted(values, high, side="right"))
+        slots = self._slots
+        return {slots[i] for i in self._order[start:stop].tolist()}
+
+    def equal(self, value: Any) -> Set[int]:
+        value = as_number(value)
+        return set() if value is None else self.range(value, value)
+
+    def bounds(self) -> Tuple[Optional[float], Optional[float]]:
+        self._refresh()
+        if not len(self._values):
+            return None, None
+        return float(self._values[0]), float(self._values[-1])
+
+
+class CategoricalConditionIndex:
+    kind = CATEGORICAL
+
+    def __init__(self, key: str):
+        self.key = key
+        self._by_value: Dict[Any, Set[int]] = {}
+        self._value_of: Dict[int, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._value_of)
+
+    def add(self, reaction) -> bool:
+        value = reaction.conditions.get(self.key, _MISSING)
+        if value is _MISSING or value is None or id(reaction) in self._value_of:
+            return False
+        try:
+            bucket = self._by_value.setdefault(value, set())
+        except TypeError:
+            return False
+        bucket.add(id(reaction))
+        self._value_of[id(reaction)] = value
+        return True
+
+    def discard(self, reaction):
+        value = self._value_of.pop(id(reaction), _MISSING)
+        if value is _MISSING:
+            return
+        bucket = self._by_value[value]
+        bucket.discard(id(reaction))
+        if not bucket:
+            del self._by_value[value]
+
+    def equal(self, value: Any) -> Set[int]:
+        try:
+            return set(self._by_value.get(value, ()))
+        except TypeError:
+            return set()
+
+    def any_of(self, values: Iterable[Any]) -> Set[int]:
+        out: Set[int] = set()
+        for v in values:
+            out |= self.equal(v)
+        return out
+
+    def values(self) -> List[Any]:
+        return list(self._by_value)
+
+
+def make_index(key: str, kind: str):
+    if kind == NUMERIC:
+        return NumericConditionIndex(key)
+    if kind == CATEGORICAL:
+        return CategoricalConditionIndex(key)
+    raise ValueError(f"unknown condition index kind: {kind!r}")
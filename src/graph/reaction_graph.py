@@ -1,8 +1,23 @@
 from collections import defaultdict
-from typing import Iterable, Set, List
+from itertools import count
+from typing import Any, Dict, Iterable, Mapping, Optional, Set, List, Tuple, Union
 
 from src.reaction import Reaction
 from src.dataset.reaction_dataset import ReactionDataset
+from src.graph.condition_index import NUMERIC, as_number, infer_kind, make_index
+
+
+def _condition_matches(value: Any, spec: Any) -> bool:
+    """Scan-side equivalent of an index lookup (see ReactionGraph.query)."""
+    if isinstance(spec, tuple):
+        low, high = spec
+        v = as_number(value)
+        return v is not None and (low is None or v >= low) and (high is None or v <= high)
+    if isinstance(spec, (list, set, frozenset)):
+        return any(_condition_matches(value, s) for s in spec)
+    if as_number(spec) is not None:
+        return as_number(value) == as_number(spec)
+    return value is not None and value == spec
 
 
 class ReactionGraph:
@@ -11,11 +26,38 @@ class ReactionGraph:
 
     - Nodes: Reaction (unique by identity / hash)
     - Index: species formula -> reactions involving that species
+
+    Derived views (e.g. a live SpeciesGraph) can subscribe(); every reaction
+    that is actually added or removed is forwarded to their
+    add_reaction(r) / remove_reaction(r).
+
+    Selected condition keys can be indexed (add_condition_index): numeric
+    keys (temperature, pressure) in sorted arrays for range lookups,
+    categorical keys (solvent) in hash maps. query() intersects species and
+    condition lookups, e.g.
+
+        g.query(species="CO2", conditions={"temperature_K": (300, 400), "solvent": "water"})
+
+    Reaction equality ignores conditions, so the same reaction measured at
+    300 K and at 500 K is one node. While a condition index exists the
+    graph also keeps every added instance (variants, distinct by identity)
+    and query() answers over those, so each condition set stays findable.
+    Without condition indexes only the nodes are kept.
     """
 
     def __init__(self):
-        self._reactions: Set[Reaction] = set()
+        # node -> insertion number (dicts keep insertion order)
+        self._reactions: Dict[Reaction, int] = {}
         self._by_species = defaultdict(set)
+        self._listeners: List[Any] = []
+        self._seq = count()
+        # only while condition indexes exist (see _track_variants):
+        # node -> every instance added for it (the node first),
+        # id(instance) -> (insertion number, instance)
+        self._variants: Optional[Dict[Reaction, List[Reaction]]] = None
+        self._instances: Optional[Dict[int, Tuple[int, Reaction]]] = None
+        # condition key -> NumericConditionIndex / CategoricalConditionIndex
+        self._condition_indexes: Dict[str, Any] = {}
 
     # ---------- construction ----------
 
@@ -23,36 +65,230 @@ class ReactionGraph:
         """
         Add a Reaction node to the graph.
 
-        Duplicate reactions (same identity) are ignored automatically
-        via Reaction.__hash__ / __eq__.
+        Duplicate reactions (same identity) are not added as nodes again
+        (Reaction.__hash__ / __eq__); while condition indexes exist they are
+        kept as variants of the node for condition queries.
         """
         if r in self._reactions:
+            if self._variants is not None and id(r) not in self._instances:
+                self._add_variant(r, self._variants[r], next(self._seq))
             return
 
-        self._reactions.add(r)
+        seq = self._reactions[r] = next(self._seq)
+        if self._variants is not None:
+            self._add_variant(r, self._variants.setdefault(r, []), seq)
 
         # index by species (reactants + products)
         for m in list(r.reactants) + list(r.products):
             self._by_species[m.formula].add(r)
 
+        for listener in self._listeners:
+            listener.add_reaction(r)
+
+    def _add_variant(self, r: Reaction, variants: List[Reaction], seq: int):
+        variants.append(r)
+        self._instances[id(r)] = (seq, r)
+        for index in self._condition_indexes.values():
+            index.add(r)
+
+    def _track_variants(self, reactions: Optional[Iterable[Reaction]] = None):
+        """
+        Start recording variants: every node is its own first variant, and
+        instances from `reactions` that equal a node are added after it.
+        """
+        if self._variants is None:
+            self._variants = {r: [r] for r in self._reactions}
+            self._instances = {id(r): (seq, r) for r, seq in self._reactions.items()}
+        for r in reactions or ():
+            variants = self._variants.get(r)
+            if variants is not None and id(r) not in self._instances:
+                self._add_variant(r, variants, next(self._seq))
+
     def add_reactions(self, reactions: Iterable[Reaction]):
         for r in reactions:
             self.add_reaction(r)
 
+    def remove_reaction(self, r: Reaction) -> bool:
+        """
+        Remove a Reaction node, with all its variants. Returns False if it
+        was not in the graph.
+        """
+        if r not in self._reactions:
+            return False
+
+        del self._reactions[r]
+        for m in list(r.reactants) + list(r.products):
+            bucket = self._by_species.get(m.formula)
+            if bucket is not None:
+                bucket.discard(r)
+                if not bucket:
+                    del self._by_species[m.formula]
+        if self._variants is not None:
+            for v in self._variants.pop(r):
+                del self._instances[id(v)]
+                for index in self._condition_indexes.values():
+                    index.discard(v)
+
+        for listener in self._listeners:
+            listener.remove_reaction(r)
+        return True
+
+    # ---------- subscriptions ----------
+
+    def subscribe(self, listener: Any):
+        """
+        Register a listener with add_reaction(r) / remove_reaction(r) methods.
+        """
+        if not any(l is listener for l in self._listeners):
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Any):
+        self._listeners = [l for l in self._listeners if l is not listener]
+
     @classmethod
-    def from_dataset(cls, ds: ReactionDataset) -> "ReactionGraph":
+    def from_dataset(
+        cls,
+        ds: ReactionDataset,
+        condition_indexes: Union[Iterable[str], Mapping[str, Optional[str]], None] = None,
+    ) -> "ReactionGraph":
         """
         Build a ReactionGraph from a ReactionDataset.
+
+        condition_indexes: condition keys to index, or {key: kind} with kind
+        "numeric" / "categorical" / None (inferred from the data).
         """
         g = cls()
-        g.add_reactions(ds.reactions())
+        if condition_indexes is not None:
+            # keep the dataset's duplicate instances for the indexes below
+            g._track_variants()
+        g.add_reactions(ds.iter_reactions())
+        if condition_indexes is not None:
+            if not isinstance(condition_indexes, Mapping):
+                condition_indexes = dict.fromkeys(condition_indexes)
+            for key, kind in condition_indexes.items():
+                g.add_condition_index(key, kind)
         return g
 
+    # ---------- condition indexes ----------
+
+    def add_condition_index(
+        self,
+        key: str,
+        kind: Optional[str] = None,
+        reactions: Optional[Iterable[Reaction]] = None,
+    ):
+        """
+        Index conditions[key] of all current and future reactions.
+        kind: "numeric" (range queries), "categorical" (equality), or None to
+        infer it from the values present (numeric if all are real numbers).
+
+        Variants are only recorded while condition indexes exist, so
+        duplicates added before the first index are gone; pass the source
+        (e.g. ds.iter_reactions()) as `reactions` to backfill them.
+        """
+        self._track_variants(reactions)
+        instances = [r for _, r in self._instances.values()]
+        if kind is None:
+            kind = infer_kind(r.conditions.get(key) for r in instances)
+        index = make_index(key, kind)
+        for r in instances:
+            index.add(r)
+        self._condition_indexes[key] = index
+        return index
+
+    def drop_condition_index(self, key: str):
+        self._condition_indexes.pop(key, None)
+        if not self._condition_indexes:
+            self._variants = self._instances = None
+
+    def condition_indexes(self) -> Dict[str, str]:
+        """Indexed condition key -> kind."""
+        return {key: index.kind for key, index in self._condition_indexes.items()}
+
+    def _condition_lookup(self, key: str, spec: Any) -> Set[int]:
+        index = self._condition_indexes[key]
+        if isinstance(spec, tuple):
+            if index.kind != NUMERIC:
+                raise ValueError(f"range query on categorical condition index {key!r}")
+            low, high = spec
+            return index.range(low, high)
+        if isinstance(spec, (list, set, frozenset)):
+            out: Set[int] = set()
+            for value in spec:
+                out |= self._condition_lookup(key, value)
+            return out
+        return index.equal(spec)
+
+    def query(
+        self,
+        species: Union[str, Iterable[str], None] = None,
+        conditions: Optional[Mapping[str, Any]] = None,
+    ) -> List[Reaction]:
+        """
+        Reaction instances matching every given criterion:
+
+        - species: formula (or several formulas, all required) the reaction involves
+        - conditions: key -> value (equality), (low, high) closed numeric range
+          (None = unbounded) or a list / set of accepted values
+
+        While condition indexes exist every added instance is a candidate, so
+        equal reactions with different conditions are matched (and returned)
+        separately; see the class docstring. Indexed conditions and species
+        are looked up and intersected, smallest first; conditions without an
+        index are then checked on the remaining candidates only. Results are
+        in insertion order.
+        """
+        conditions = dict(conditions or {})
+        if isinstance(species, str):
+            species = [species]
+        if self._variants is None:
+            # no condition index: nodes only, conditions are all scanned
+            result = None
+            for f in species or ():
+                bucket = self._by_species.get(f, set())
+                result = set(bucket) if result is None else result & bucket
+            order = self._reactions
+            found = sorted(order if result is None else result, key=order.__getitem__)
+            return self._scan(found, conditions)
+
+        sets: List[Set[int]] = [
+            {id(v) for r in self._by_species.get(f, ()) for v in self._variants[r]}
+            for f in (species or ())
+        ]
+        scanned = {}
+        for key, spec in conditions.items():
+            if key in self._condition_indexes:
+                sets.append(self._condition_lookup(key, spec))
+            else:
+                scanned[key] = spec
+
+        if sets:
+            sets.sort(key=len)
+            result = set(sets[0])
+            for other in sets[1:]:
+                if not result:
+                    break
+                result &= other
+        else:
+            result = set(self._instances)
+
+        found = [r for _, r in sorted(self._instances[i] for i in result)]
+        return self._scan(found, scanned)
+
+    @staticmethod
+    def _scan(reactions: List[Reaction], conditions: Mapping[str, Any]) -> List[Reaction]:
+        if not conditions:
+            return reactions
+        return [
+            r for r in reactions
+            if all(_condition_matches(r.conditions.get(k), spec) for k, spec in conditions.items())
+        ]
+
     # ---------- public query API ----------
 
     def reactions(self) -> List[Reaction]:
         """
-        Return all reactions in the graph.
+        Return all reactions in the graph (one per node).
 
         This is the ONLY supported way to iterate over reactions.
         """
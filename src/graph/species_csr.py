@@ -0,0 +1,184 @@
+# src/graph/species_csr.py
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class StringTable:
+    """
+    Read-only sequence of unique strings stored as flat arrays: UTF-8 bytes
+    (blob), offsets (string i is blob[offsets[i]:offsets[i+1]]) and the
+    permutation sorting the strings by bytes (order). Works directly on
+    arrays in shared memory: strings are decoded when accessed (and cached),
+    get() is a binary search, so no per-string objects are built up front.
+
+    Doubles as the name -> id mapping: table[i] and table.get(name).
+    """
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray, order: np.ndarray):
+        self.blob = blob
+        self.offsets = offsets
+        self.order = order
+        self._cache: Dict[int, str] = {}
+
+    @classmethod
+    def encode(cls, strings: Sequence[str]) -> "StringTable":
+        encoded = [s.encode("utf-8") for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        order = np.array(sorted(range(len(encoded)), key=encoded.__getitem__), dtype=np.int64)
+        return cls(np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets, order)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {"blob": self.blob, "offsets": self.offsets, "order": self.order}
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def _bytes(self, i: int) -> bytes:
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes()
+
+    def __getitem__(self, i: int) -> str:
+        s = self._cache.get(i)
+        if s is None:
+            if not 0 <= i < len(self):
+                raise IndexError(i)
+            s = self._cache[i] = self._bytes(i).decode("utf-8")
+        return s
+
+    def __iter__(self) -> Iterator[str]:
+        return (self[i] for i in range(len(self)))
+
+    def get(self, name: str, default: Optional[int] = None) -> Optional[int]:
+        """Index of `name`, or default."""
+        key = name.encode("utf-8")
+        order = self.order
+        lo, hi = 0, len(order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._bytes(int(order[mid])) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(order) and self._bytes(int(order[lo])) == key:
+            return int(order[lo])
+        return default
+
+
+class SpeciesCSR:
+    """
+    Frozen integer view of a SpeciesGraph.
+
+    Species and reactions are interned to dense ids (0..n-1). Adjacency is
+    stored in CSR form:
+
+    - out_offsets[i]:out_offsets[i+1] indexes out_targets / out_reactions
+      for the edges leaving species i
+    - in_offsets[i]:in_offsets[i+1] indexes in_sources / in_reactions
+      for the edges entering species i
+
+    Within a node, edges keep their insertion order.
+    """
+
+    def __init__(
+        self,
+        species_names: Sequence[str],
+        reaction_keys: Sequence[str],
+        out_offsets: np.ndarray,
+        out_targets: np.ndarray,
+        out_reactions: np.ndarray,
+        in_offsets: np.ndarray,
+        in_sources: np.ndarray,
+        in_reactions: np.ndarray,
+    ):
+        # StringTables (e.g. attached from shared memory) are kept as they are
+        self.species_names = species_names if isinstance(species_names, StringTable) else list(species_names)
+        self.reaction_keys = reaction_keys if isinstance(reaction_keys, StringTable) else list(reaction_keys)
+        self.out_offsets = out_offsets
+        self.out_targets = out_targets
+        self.out_reactions = out_reactions
+        self.in_offsets = in_offsets
+        self.in_sources = in_sources
+        self.in_reactions = in_reactions
+
+    @staticmethod
+    def _pack(n: int, adjacency: Dict[int, List[Tuple[int, int]]]):
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        for i in range(n):
+            offsets[i + 1] = offsets[i] + len(adjacency.get(i, ()))
+        nbrs = np.empty(offsets[-1], dtype=np.int32)
+        rids = np.empty(offsets[-1], dtype=np.int32)
+        for i, edges in adjacency.items():
+            if edges:
+                start = offsets[i]
+                nbrs[start:start + len(edges)] = [e[0] for e in edges]
+                rids[start:start + len(edges)] = [e[1] for e in edges]
+        return offsets, nbrs, rids
+
+    @classmethod
+    def from_adjacency(
+        cls,
+        species_names: Sequence[str],
+        reaction_keys: Sequence[str],
+        out_adj: Dict[int, List[Tuple[int, int]]],
+        in_adj: Dict[int, List[Tuple[int, int]]],
+    ) -> "SpeciesCSR":
+        """
+        Build from id -> [(neighbour id, reaction id), ...] adjacency dicts.
+        """
+        n = len(species_names)
+        out_offsets, out_targets, out_reactions = cls._pack(n, out_adj)
+        in_offsets, in_sources, in_reactions = cls._pack(n, in_adj)
+        return cls(species_names, reaction_keys, out_offsets, out_targets, out_reactions,
+                   in_offsets, in_sources, in_reactions)
+
+    def to_adjacency(self):
+        """
+        Inverse of from_adjacency: (out_adj, in_adj) as id -> list of (neighbour, reaction).
+        """
+        def unpack(offsets, nbrs, rids):
+            adj = {}
+            for i in range(self.n_species):
+                s, e = offsets[i], offsets[i + 1]
+                if e > s:
+                    adj[i] = list(zip(nbrs[s:e].tolist(), rids[s:e].tolist()))
+            return adj
+
+        return (
+            unpack(self.out_offsets, self.out_targets, self.out_reactions),
+            unpack(self.in_offsets, self.in_sources, self.in_reactions),
+        )
+
+    # ---------- int-level queries ----------
+
+    @property
+    def n_species(self) -> int:
+        return len(self.out_offsets) - 1
+
+    @property
+    def n_edges(self) -> int:
+        return int(self.out_offsets[-1])
+
+    def out_neighbors(self, sid: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(target ids, reaction ids) of the edges leaving species sid."""
+        s, e = self.out_offsets[sid], self.out_offsets[sid + 1]
+        return self.out_targets[s:e], self.out_reactions[s:e]
+
+    def in_neighbors(self, sid: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(source ids, reaction ids) of the edges entering species sid."""
+        s, e = self.in_offsets[sid], self.in_offsets[sid + 1]
+        return self.in_sources[s:e], self.in_reactions[s:e]
+
+    def out_degree(self) -> np.ndarray:
+        return np.diff(self.out_offsets)
+
+    def in_degree(self) -> np.ndarray:
+        return np.diff(self.in_offsets)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            a.nbytes
+            for a in (self.out_offsets, self.out_targets, self.out_reactions,
+                      self.in_offsets, self.in_sources, self.in_reactions)
+        )
@@ -1,6 +1,10 @@
 # src/graph/species_graph.py
 from collections import defaultdict
-from typing import Dict, List
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.graph.species_csr import SpeciesCSR, StringTable
 
 
 class SpeciesEdge:
@@ -27,44 +31,359 @@ class SpeciesGraph:
 
     Nodes: species formula (str)
     Edges: SpeciesEdge
+
+    Internally species formulas and reaction keys are interned to integer ids
+    and edges are stored as (neighbour id, reaction id) pairs. After bulk
+    loading, freeze() packs the adjacency into CSR arrays (SpeciesCSR) that
+    path search / analytics can use directly; the string-based API below is a
+    thin layer over either representation. Adding reactions to a frozen graph
+    transparently switches it back to the mutable form.
+
+    Edges are unique per (reactant, product, reaction): adding a reaction whose
+    key is already present is a no-op, and a species pair repeated inside one
+    reaction (e.g. 2 H2 -> ...) is stored once with a multiplicity, see
+    edge_count(). remove_reaction() drops a reaction's edges again, so the
+    graph can follow a ReactionGraph incrementally (from_reaction_graph(live=True)).
     """
 
     def __init__(self):
-        self._out_edges: Dict[str, List[SpeciesEdge]] = defaultdict(list)
-        self._in_edges: Dict[str, List[SpeciesEdge]] = defaultdict(list)
+        self._species_ids: Dict[str, int] = {}
+        self._species_names: List[str] = []
+        self._reaction_ids: Dict[str, int] = {}
+        self._reaction_keys: List[str] = []
+        # mutable adjacency: species id -> {(neighbour id, reaction id): multiplicity}
+        # (dicts keep insertion order, so edge order is stable)
+        self._out: Optional[Dict[int, Dict[Tuple[int, int], int]]] = defaultdict(dict)
+        self._in: Optional[Dict[int, Dict[Tuple[int, int], int]]] = defaultdict(dict)
+        self._csr: Optional[SpeciesCSR] = None
+        # reaction id -> Reaction projected with that key (for cost functions etc.)
+        self._reactions: Dict[int, Any] = {}
+        # reaction id -> {(source id, target id): multiplicity}; survives freeze().
+        # None for a graph made by from_csr(): edges / multiplicities are then
+        # read from the CSR arrays and _out_counts until the graph is thawed
+        self._reaction_edges: Optional[Dict[int, Dict[Tuple[int, int], int]]] = {}
+        self._out_counts: Optional[np.ndarray] = None
+        self._csr_reactions: Optional[np.ndarray] = None
+        # bumped on every structural change; lets callers cache derived data
+        self._version = 0
+
+    # ---------- interning ----------
+
+    def _intern_species(self, formula: str) -> int:
+        sid = self._species_ids.get(formula)
+        if sid is None:
+            sid = len(self._species_names)
+            self._species_ids[formula] = sid
+            self._species_names.append(formula)
+        return sid
+
+    def _intern_reaction(self, key: str) -> int:
+        rid = self._reaction_ids.get(key)
+        if rid is None:
+            rid = len(self._reaction_keys)
+            self._reaction_ids[key] = rid
+            self._reaction_keys.append(key)
+        return rid
+
+    def species_id(self, formula: str) -> Optional[int]:
+        return self._species_ids.get(formula)
+
+    def species_name(self, sid: int) -> str:
+        return self._species_names[sid]
+
+    def reaction_id(self, key: str) -> Optional[int]:
+        return self._reaction_ids.get(key)
+
+    def reaction_key(self, rid: int) -> str:
+        return self._reaction_keys[rid]
+
+    def get_reaction(self, key: str):
+        """
+        Return the Reaction object behind a reaction key, or None if unknown.
+        """
+        rid = self._reaction_ids.get(key)
+        return None if rid is None else self._reactions.get(rid)
+
+    @property
+    def n_species(self) -> int:
+        return len(self._species_names)
+
+    @property
+    def version(self) -> int:
+        """Monotonic counter, changes whenever edges are added or removed."""
+        return self._version
+
+    @property
+    def n_reactions(self) -> int:
+        if self._reaction_edges is None:
+            return int(self._reactions_with_edges().sum())
+        return len(self._reaction_edges)
+
+    def _reactions_with_edges(self) -> np.ndarray:
+        """from_csr graphs: bool mask over reaction ids that have edges."""
+        if self._csr_reactions is None:
+            mask = np.zeros(len(self._reaction_keys), dtype=bool)
+            mask[self._csr.out_reactions] = True
+            self._csr_reactions = mask
+        return self._csr_reactions
+
+    def _has_reaction(self, rid: int) -> bool:
+        if self._reaction_edges is None:
+            return bool(self._reactions_with_edges()[rid])
+        return rid in self._reaction_edges
+
+    def __contains__(self, reaction) -> bool:
+        key = reaction if isinstance(reaction, str) else reaction.canonical_key()
+        rid = self._reaction_ids.get(key)
+        return rid is not None and self._has_reaction(rid)
 
     # ---------- construction ----------
 
-    def add_reaction(self, reaction):
+    def add_reaction(self, reaction) -> bool:
         """
         Project a Reaction into species-level directed edges.
+
+        Idempotent: returns False (and changes nothing) if a reaction with the
+        same canonical key is already in the graph or the reaction has no
+        reactants / products.
         """
-        rid = reaction.canonical_key()
+        if not reaction.reactants or not reaction.products:
+            return False
+        self._own_ids()
+        rid = self._intern_reaction(reaction.canonical_key())
+        if self._has_reaction(rid):
+            return False
+        if self._csr is not None:
+            self._thaw()
 
+        pairs: Dict[Tuple[int, int], int] = {}
         for r in reaction.reactants:
+            src = self._intern_species(r.formula)
             for p in reaction.products:
-                edge = SpeciesEdge(
-                    reactant=r.formula,
-                    product=p.formula,
-                    reaction_key=rid,
-                )
-                self._out_edges[r.formula].append(edge)
-                self._in_edges[p.formula].append(edge)
+                dst = self._intern_species(p.formula)
+                pairs[(src, dst)] = pairs.get((src, dst), 0) + 1
+
+        for (src, dst), n in pairs.items():
+            self._out[src][(dst, rid)] = n
+            self._in[dst][(src, rid)] = n
+        self._reaction_edges[rid] = pairs
+        self._reactions[rid] = reaction
+        self._version += 1
+        return True
+
+    def remove_reaction(self, reaction) -> bool:
+        """
+        Drop all edges of a reaction (Reaction object or canonical key).
+        Returns False if it was not in the graph. Interned ids stay valid.
+        """
+        key = reaction if isinstance(reaction, str) else reaction.canonical_key()
+        rid = self._reaction_ids.get(key)
+        if rid is None or not self._has_reaction(rid):
+            return False
+        if self._csr is not None:
+            self._thaw()
+
+        for src, dst in self._reaction_edges.pop(rid):
+            out = self._out[src]
+            del out[(dst, rid)]
+            if not out:
+                del self._out[src]
+            inc = self._in[dst]
+            del inc[(src, rid)]
+            if not inc:
+                del self._in[dst]
+        self._reactions.pop(rid, None)
+        self._version += 1
+        return True
+
+    def edge_count(self, reactant: str, product: str, reaction_key: Optional[str] = None) -> int:
+        """
+        Multiplicity of the reactant -> product edge of one reaction, or summed
+        over all reactions connecting the pair if reaction_key is None.
+        """
+        src = self._species_ids.get(reactant)
+        dst = self._species_ids.get(product)
+        if src is None or dst is None:
+            return 0
+        if self._reaction_edges is None:
+            s, e = self._csr.out_offsets[src], self._csr.out_offsets[src + 1]
+            hit = self._csr.out_targets[s:e] == dst
+            if reaction_key is not None:
+                rid = self._reaction_ids.get(reaction_key)
+                if rid is None:
+                    return 0
+                hit &= self._csr.out_reactions[s:e] == rid
+            return int(self._out_counts[s:e][hit].sum())
+        if reaction_key is not None:
+            rid = self._reaction_ids.get(reaction_key)
+            edges = self._reaction_edges.get(rid) if rid is not None else None
+            return edges.get((src, dst), 0) if edges else 0
+        return sum(
+            self._reaction_edges[rid][(src, dst)]
+            for nbr, rid in self.out_neighbors(src)
+            if nbr == dst
+        )
 
     @classmethod
-    def from_reaction_graph(cls, reaction_graph):
+    def from_reaction_graph(cls, reaction_graph, live: bool = False):
+        """
+        Project every reaction of a ReactionGraph. With live=True the species
+        graph also subscribes to the reaction graph and follows later
+        add_reaction / remove_reaction calls incrementally.
+        """
         g = cls()
         for r in reaction_graph.reactions():
             g.add_reaction(r)
+        if live:
+            reaction_graph.subscribe(g)
         return g
 
+    # ---------- freeze / CSR ----------
+
+    def freeze(self) -> SpeciesCSR:
+        """
+        Pack adjacency into CSR arrays and drop the per-node edge lists.
+        """
+        if self._csr is None:
+            self._csr = SpeciesCSR.from_adjacency(
+                self._species_names,
+                self._reaction_keys,
+                {sid: list(edges) for sid, edges in self._out.items()},
+                {sid: list(edges) for sid, edges in self._in.items()},
+            )
+            self._out = None
+            self._in = None
+        return self._csr
+
+    def _own_ids(self):
+        """Swap shared StringTables for a private list + dict before interning."""
+        if isinstance(self._species_ids, StringTable):
+            self._species_names = list(self._species_names)
+            self._species_ids = {name: i for i, name in enumerate(self._species_names)}
+        if isinstance(self._reaction_ids, StringTable):
+            self._reaction_keys = list(self._reaction_keys)
+            self._reaction_ids = {key: i for i, key in enumerate(self._reaction_keys)}
+
+    def _thaw(self):
+        self._own_ids()
+        if self._reaction_edges is None:
+            self._reaction_edges = self._edges_from_csr()
+            self._out_counts = self._csr_reactions = None
+        out_adj, in_adj = self._csr.to_adjacency()
+        counts = self._reaction_edges
+        self._out = defaultdict(dict, {
+            src: {(dst, rid): counts[rid][(src, dst)] for dst, rid in edges}
+            for src, edges in out_adj.items()
+        })
+        self._in = defaultdict(dict, {
+            dst: {(src, rid): counts[rid][(src, dst)] for src, rid in edges}
+            for dst, edges in in_adj.items()
+        })
+        self._csr = None
+
+    @classmethod
+    def from_csr(cls, csr: SpeciesCSR, out_counts: Optional[np.ndarray] = None) -> "SpeciesGraph":
+        """
+        Frozen graph over an existing SpeciesCSR (e.g. arrays attached from
+        shared memory, see src/path/parallel_paths.py). Nothing is copied or
+        unpacked: edges and multiplicities are read from the arrays, and
+        StringTable names / keys are decoded on access. out_counts are the
+        edge multiplicities aligned with csr.out_targets (see
+        out_edge_counts); default 1. The per-reaction edge dicts are only
+        built if the graph is modified (thawed). Reaction objects are not
+        part of the CSR, so get_reaction() returns None.
+        """
+        g = cls()
+        names, keys = csr.species_names, csr.reaction_keys
+        if isinstance(names, StringTable):
+            g._species_names = g._species_ids = names
+        else:
+            g._species_names = list(names)
+            g._species_ids = {name: i for i, name in enumerate(g._species_names)}
+        if isinstance(keys, StringTable):
+            g._reaction_keys = g._reaction_ids = keys
+        else:
+            g._reaction_keys = list(keys)
+            g._reaction_ids = {key: i for i, key in enumerate(g._reaction_keys)}
+        g._out = None
+        g._in = None
+        g._csr = csr
+        g._reaction_edges = None
+        g._out_counts = np.ones(csr.n_edges, dtype=np.int32) if out_counts is None else out_counts
+        return g
+
+    def _edges_from_csr(self) -> Dict[int, Dict[Tuple[int, int], int]]:
+        csr = self._csr
+        offsets = csr.out_offsets.tolist()
+        targets = csr.out_targets.tolist()
+        rids = csr.out_reactions.tolist()
+        counts = self._out_counts.tolist()
+        edges: Dict[int, Dict[Tuple[int, int], int]] = {}
+        for src in range(csr.n_species):
+            for j in range(offsets[src], offsets[src + 1]):
+                edges.setdefault(rids[j], {})[(src, targets[j])] = counts[j]
+        return edges
+
+    def out_edge_counts(self) -> np.ndarray:
+        """
+        Multiplicity of every edge in CSR out-edge order (freezes the graph).
+        """
+        csr = self.freeze()
+        if self._reaction_edges is None:
+            return self._out_counts
+        counts = np.empty(csr.n_edges, dtype=np.int32)
+        edges = self._reaction_edges
+        offsets = csr.out_offsets.tolist()
+        targets = csr.out_targets.tolist()
+        rids = csr.out_reactions.tolist()
+        for src in range(csr.n_species):
+            for j in range(offsets[src], offsets[src + 1]):
+                counts[j] = edges[rids[j]][(src, targets[j])]
+        return counts
+
+    @property
+    def frozen(self) -> bool:
+        return self._csr is not None
+
+    def csr(self) -> SpeciesCSR:
+        """
+        Integer CSR view of the graph (freezes the graph if needed).
+        """
+        return self.freeze()
+
+    # ---------- int-level API ----------
+
+    def out_neighbors(self, sid: int) -> List[Tuple[int, int]]:
+        """[(target id, reaction id), ...] for edges leaving species id sid."""
+        if self._csr is not None:
+            targets, rids = self._csr.out_neighbors(sid)
+            return list(zip(targets.tolist(), rids.tolist()))
+        return list(self._out.get(sid, ()))
+
+    def in_neighbors(self, sid: int) -> List[Tuple[int, int]]:
+        """[(source id, reaction id), ...] for edges entering species id sid."""
+        if self._csr is not None:
+            sources, rids = self._csr.in_neighbors(sid)
+            return list(zip(sources.tolist(), rids.tolist()))
+        return list(self._in.get(sid, ()))
+
     # ---------- public API ----------
 
     def out_edges(self, species: str):
-        return list(self._out_edges.get(species, []))
+        sid = self._species_ids.get(species)
+        if sid is None:
+            return []
+        names = self._species_names
+        keys = self._reaction_keys
+        return [SpeciesEdge(species, names[d], keys[r]) for d, r in self.out_neighbors(sid)]
 
     def in_edges(self, species: str):
-        return list(self._in_edges.get(species, []))
+        sid = self._species_ids.get(species)
+        if sid is None:
+            return []
+        names = self._species_names
+        keys = self._reaction_keys
+        return [SpeciesEdge(names[s], species, keys[r]) for s, r in self.in_neighbors(sid)]
 
     def successors(self, species: str):
         return self.out_edges(species)
@@ -72,5 +391,10 @@ class SpeciesGraph:
     def predecessors(self, species: str):
         return self.in_edges(species)
 
-    def species(self):
-        return set(self._out_edges) | set(self._in_edges)
+    def species(self) -> Set[str]:
+        """Species with at least one edge."""
+        names = self._species_names
+        if self._csr is not None:
+            degree = self._csr.out_degree() + self._csr.in_degree()
+            return {names[i] for i in degree.nonzero()[0].tolist()}
+        return {names[i] for i in set(self._out) | set(self._in)}
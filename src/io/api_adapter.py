@@ -1,5 +1,15 @@
 # src/io/api_adapter.py
-from typing import Dict, List
+"""
+API 输入 -> core 对象的转换，以及 reaction 日志 / hash 索引的读写。
+
+导入本模块没有副作用：不创建 data/，也不打开 hash 索引。索引在首次使用时
+（is_duplicate / register_hash / get_index()）或显式调用 open_store() 时打开，
+进程退出时自动关闭（也可调用 close_store()）。
+"""
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+import atexit
+import struct
+import threading
 from pathlib import Path
 import json
 import hashlib
@@ -7,7 +17,11 @@ from datetime import datetime
 from src.atom import Atom
 from src.molecule import Molecule
 from src.reaction import Reaction
-from src.io.api_schema import AtomInput, MoleculeInput, ReactionInput
+from src.io.reaction_log_writer import ReactionLogWriter
+import numpy as np
+
+if TYPE_CHECKING:
+    from src.io.api_schema import AtomInput, MoleculeInput, ReactionInput
 
 # 最小元素表（根据需要扩展）
 PERIODIC_TABLE: Dict[str, int] = {
@@ -18,24 +32,133 @@ PERIODIC_TABLE: Dict[str, int] = {
 # 数据目录与索引文件（与 API 保持一致）
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent  # points to project root
 DATA_DIR = PROJECT_ROOT / "data"
-DATA_DIR.mkdir(parents=True, exist_ok=True)
 REACTION_LOG = DATA_DIR / "reactions.jsonl"
 INDEX_FILE = DATA_DIR / "reactions_index.txt"
 
-# 加载已有 hash 索引到内存（简单持久化）
-_existing_hashes = set()
-if INDEX_FILE.exists():
-    try:
-        with INDEX_FILE.open("r", encoding="utf-8") as f:
-            for ln in f:
-                h = ln.strip()
-                if h:
-                    _existing_hashes.add(h)
-    except Exception:
-        _existing_hashes = set()
+# canonical hash 版本（见 reaction_to_canonical_hash）。v1 的索引不能用于 v2：
+# 切换版本前先用 rebuild_index(version) 从 REACTION_LOG 重建对应的索引。
+HASH_VERSION = 1
+
+# 已有 hash 索引：磁盘上的二进制 hash 集合（mmap + 二分查找，内存不随数据量增长）。
+# 首次打开时从旧的文本索引 reactions_index.txt 导入一次（仅 v1）。
+HASH_STORE_DIR = DATA_DIR / "reactions_index.hashset"
+# 前置 Bloom filter：绝大多数新反应在这里就能判定"一定不存在"，不触及 hash 集合。
+# BLOOM_ERROR_RATE = None 关闭；过滤器随 close_store() 保存，状态不一致时从 hash 集合重建。
+# 与索引目录一样每个 hash 版本一个文件（见 bloom_file_for）；BLOOM_FILE 为 v1 的过滤器。
+BLOOM_FILE = DATA_DIR / "reactions_index.bloom"
+BLOOM_ERROR_RATE: Optional[float] = 0.01
+
+# 当前打开的 hash 索引（set-like：in / add / discard / remove / close）
+_store: Any = None
+_store_lock = threading.Lock()
+_DEFAULT: Any = object()
+
+
+def open_store(
+    path: Union[str, Path, None] = None,
+    legacy_index: Union[str, Path, None] = None,
+    bloom_file: Union[str, Path, None] = None,
+    bloom_error_rate: Optional[float] = _DEFAULT,
+    readonly: bool = False,
+):
+    """
+    打开 hash 索引并设为当前索引（已打开则直接返回）。
+    默认使用当前 HASH_VERSION 的 hash_store_dir / bloom_file_for，以及 INDEX_FILE /
+    BLOOM_ERROR_RATE；给定 path 而未给 bloom_file 时，过滤器放在 path 旁
+    （<path>.bloom）。bloom_error_rate=None 不使用 Bloom filter。
+
+    同一索引目录只能有一个写进程（目录上的 flock 保证，第二个写进程打开时抛出
+    HashStoreLocked）。因此 API 必须以单 worker 运行（uvicorn --workers 1）：
+    多个 worker 各自持有未合并的日志，互相看不到对方注册的 hash。
+    其他只需查询的进程用 readonly=True 打开：只读、不使用 Bloom filter
+    （过滤器看不到写进程之后的新增），每次查询前按需重新加载写进程的变更；
+    register_hash 在只读索引上抛出 ValueError。
+    """
+    global _store
+    with _store_lock:
+        if _store is not None:
+            return _store
+        from src.io.hash_store import HashStore, to_digest
 
+        if bloom_file is None:
+            bloom_file = bloom_file_for(HASH_VERSION) if path is None else Path(path).with_suffix(".bloom")
+        if path is None:
+            path = hash_store_dir(HASH_VERSION)
+        if legacy_index is None and HASH_VERSION == 1:
+            legacy_index = INDEX_FILE
+        if readonly:
+            _store = HashStore(path, readonly=True)
+            return _store
+        store = HashStore(path, legacy_index=legacy_index)
+        rate = BLOOM_ERROR_RATE if bloom_error_rate is _DEFAULT else bloom_error_rate
+        if rate is not None:
+            from src.io.bloom_filter import BloomFilteredSet, open_bloom
 
-def _atominput_to_atom(ai: AtomInput) -> Atom:
+            bloom = open_bloom(store, bloom_file, error_rate=rate)
+            store = BloomFilteredSet(store, bloom, key_bytes=to_digest, path=bloom_file)
+        _store = store
+        return store
+
+
+def hash_store_dir(version: int) -> Path:
+    """每个 hash 版本一个索引目录：v1 为 HASH_STORE_DIR，vN 为 reactions_index.vN.hashset。"""
+    if version == 1:
+        return HASH_STORE_DIR
+    return DATA_DIR / f"reactions_index.v{version}.hashset"
+
+
+def bloom_file_for(version: int) -> Path:
+    """hash_store_dir(version) 对应的 Bloom filter 文件：v1 为 BLOOM_FILE，vN 为 reactions_index.vN.bloom。"""
+    if version == 1:
+        return BLOOM_FILE
+    return DATA_DIR / f"reactions_index.v{version}.bloom"
+
+
+def rebuild_index(version: int, reaction_log: Union[str, Path, None] = None, path: Union[str, Path, None] = None) -> int:
+    """
+    以给定版本重新计算 reaction_log（默认 REACTION_LOG）中每条反应的 hash，
+    写入该版本的索引目录（默认 hash_store_dir(version)）。返回新增的 hash 数。
+    """
+    from src.dataset.reaction_dataset import iter_jsonl
+    from src.io.hash_store import HashStore
+
+    with HashStore(path if path is not None else hash_store_dir(version)) as store:
+        return store.update(
+            reaction_to_canonical_hash(r, version=version)
+            for r in iter_jsonl(reaction_log if reaction_log is not None else REACTION_LOG)
+        )
+
+
+def get_index():
+    """
+    当前 hash 索引；第一次调用时按默认配置 open_store()。
+    """
+    store = _store
+    return store if store is not None else open_store()
+
+
+def close_store():
+    """
+    关闭当前 hash 索引（等待后台合并、保存 Bloom filter）；之后可再次打开。
+    """
+    global _store
+    with _store_lock:
+        store, _store = _store, None
+    if store is not None and hasattr(store, "close"):
+        store.close()
+
+
+atexit.register(close_store)
+
+
+def __getattr__(name: str):
+    # 兼容旧代码：_existing_hashes 曾是导入时加载的 set
+    if name == "_existing_hashes":
+        return get_index()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _atominput_to_atom(ai: "AtomInput") -> Atom:
     # try element symbol or name -> atomic_number
     symbol = ai.element
     if isinstance(symbol, str):
@@ -58,19 +181,37 @@ def _atominput_to_atom(ai: AtomInput) -> Atom:
     return Atom(atomic_number=z, symbol=sym, position=pos)
 
 
-def moleculeinput_to_molecule(mi: MoleculeInput) -> Molecule:
+def moleculeinput_to_molecule(mi: "MoleculeInput") -> Molecule:
     atoms: List[Atom] = [_atominput_to_atom(a) for a in mi.atoms]
     return Molecule(atoms=atoms, metadata=mi.metadata or {})
 
 
-def reactioninput_to_reaction(ri: ReactionInput) -> Reaction:
+def reactioninput_to_reaction(ri: "ReactionInput") -> Reaction:
     reactants = [moleculeinput_to_molecule(m) for m in ri.reactants]
     products = [moleculeinput_to_molecule(m) for m in ri.products]
     # reaction object will populate reaction_id, created_at, schema_version by default
     return Reaction(reactants=reactants, products=products, conditions=ri.conditions or {}, metadata=ri.metadata or {})
 
 
-def reaction_to_canonical_hash(r: Reaction) -> str:
+def reaction_to_canonical_hash(r: Reaction, version: Optional[int] = None) -> str:
+    """
+    去重用的 canonical hash（64 位十六进制 SHA-256）。version 默认取 HASH_VERSION。
+
+    - v1：JSON 方案。每个原子按 (symbol, 坐标 round 8 位) 排序后连同分子 metadata、
+      conditions 整体 json.dumps(sort_keys) 再哈希；反应物 / 产物保持输入顺序。
+    - v2：向量化二进制方案，见 _canonical_hash_v2 与 docs/canonical_stability.md。
+
+    两个版本的 hash 互不相等，一个 hash 索引只能对应一个版本（见 hash_store_dir）。
+    """
+    version = HASH_VERSION if version is None else version
+    if version == 1:
+        return _canonical_hash_v1(r)
+    if version == 2:
+        return _canonical_hash_v2(r)
+    raise ValueError(f"unknown canonical hash version: {version!r}")
+
+
+def _canonical_hash_v1(r: Reaction) -> str:
     """
     产生一个 canonical json 哈希，用于去重。
     我们对 reactants/products 做排序（按元素符号及坐标），以减小顺序导致的差异。
@@ -92,18 +233,143 @@ def reaction_to_canonical_hash(r: Reaction) -> str:
     return h
 
 
+_V2_MAGIC = b"chem_standard.canonical_hash.v2\x00"
+
+
+def _canonical_json(obj) -> bytes:
+    return json.dumps(obj or {}, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _molecule_block_v2(mol: Molecule) -> bytes:
+    """
+    单个分子的 v2 二进制块（小端）：
+    u32 原子数 | u32 元素数 | 每个元素: u8 长度 + UTF-8 符号（按符号排序）|
+    u16[N] 元素 id | f64[N×3] 坐标（round 8 位，-0.0 归一为 0.0）|
+    u32 长度 + 分子 metadata 的 canonical JSON。
+    原子按 (元素 id, x, y, z) 用 np.lexsort 排序。
+    """
+    if mol.is_columnar:
+        cols = mol.as_arrays()
+        symbols, pos = cols["symbols"].tolist(), cols["positions"]
+    else:
+        atoms = mol.atoms
+        symbols = [a.symbol for a in atoms]
+        pos = [a.position for a in atoms]
+    pos = np.round(np.asarray(pos, dtype="<f8").reshape(-1, 3), 8) + 0.0
+    # a handful of distinct elements: a dict beats np.unique on str arrays
+    elements = sorted(set(symbols))
+    ids = {e: i for i, e in enumerate(elements)}
+    sym_ids = np.fromiter((ids[e] for e in symbols), dtype=np.int64, count=len(symbols))
+    order = np.lexsort((pos[:, 2], pos[:, 1], pos[:, 0], sym_ids))
+
+    names = [e.encode("utf-8") for e in elements]
+    meta = _canonical_json(mol.metadata)
+    return b"".join([
+        struct.pack("<II", len(sym_ids), len(names)),
+        b"".join(struct.pack("<B", len(n)) + n for n in names),
+        sym_ids[order].astype("<u2").tobytes(),
+        np.ascontiguousarray(pos[order]).tobytes(),
+        struct.pack("<I", len(meta)),
+        meta,
+    ])
+
+
+def _canonical_hash_v2(r: Reaction) -> str:
+    """
+    SHA-256 over: magic | 每侧（b"R" 反应物、b"P" 产物）: u32 分子数 +
+    按字节序排序的分子块（u64 长度 + _molecule_block_v2）| b"C" + u32 长度 +
+    conditions 的 canonical JSON。分子块排序使 v2 与分子顺序无关。
+    """
+    h = hashlib.sha256(_V2_MAGIC)
+    for tag, mols in ((b"R", r.reactants), (b"P", r.products)):
+        blocks = sorted(_molecule_block_v2(m) for m in mols)
+        h.update(tag + struct.pack("<I", len(blocks)))
+        for block in blocks:
+            h.update(struct.pack("<Q", len(block)))
+            h.update(block)
+    cond = _canonical_json(r.conditions)
+    h.update(b"C" + struct.pack("<I", len(cond)))
+    h.update(cond)
+    return h.hexdigest()
+
+
 def is_duplicate(hash_str: str) -> bool:
-    return hash_str in _existing_hashes
+    return hash_str in get_index()
+
+
+def register_hash(hash_str: str, writer: Optional[ReactionLogWriter] = None):
+    # 写入 hash 集合（追加到其日志，后台合并为有序段）
+    get_index().add(hash_str)
+    if writer is not None:
+        # 需要文本索引的下游工具：额外经 ReactionLogWriter 追加到 INDEX_FILE
+        writer.write_line(hash_str)
+
+
+def register_hashes(hashes: List[str], writer: Optional[ReactionLogWriter] = None):
+    # 批量版 register_hash：hash 集合日志一次写入、一次 flush
+    get_index().update(hashes)
+    if writer is not None:
+        for h in hashes:
+            writer.write_line(h)
+
 
+def _iter_lines_reversed(path: Path, block_size: int = 1 << 16):
+    # 从文件末尾向前逐行读取（bytes，不含换行符）
+    with path.open("rb") as f:
+        pos = f.seek(0, 2)
+        tail = b""
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            lines = (f.read(step) + tail).split(b"\n")
+            tail = lines.pop(0)
+            yield from reversed(lines)
+        yield tail
 
-def register_hash(hash_str: str):
-    # append to disk and memory set
-    _existing_hashes.add(hash_str)
-    with INDEX_FILE.open("a", encoding="utf-8") as f:
-        f.write(hash_str + "\n")
+
+def reconcile_log(reaction_log: Union[str, Path, None] = None) -> int:
+    """
+    启动时对账：把 reaction_log（默认 REACTION_LOG）末尾已落盘但未注册的反应
+    补注册到当前索引（flush 之后 register 失败或进程退出时会留下这样的尾部，
+    否则重试会把它们再写一遍）。反应按注册顺序追加，已注册部分是日志的前缀，
+    因此从末尾向前读到第一条已注册的反应为止。返回补注册的 hash 数。
+    """
+    path = Path(reaction_log) if reaction_log is not None else REACTION_LOG
+    if not path.exists():
+        return 0
+    index = get_index()
+    missing: List[str] = []
+    for line in _iter_lines_reversed(path):
+        if not line.strip():
+            continue
+        try:
+            r = Reaction.from_dict(json.loads(line))
+        except (ValueError, KeyError, TypeError):
+            # 写到一半的末行
+            continue
+        h = reaction_to_canonical_hash(r)
+        if h in index:
+            break
+        missing.append(h)
+    if missing:
+        register_hashes(missing[::-1])
+    return len(missing)
 
 
-def write_reaction(r: Reaction):
-    # 写入 jsonl（r 为 core.Reaction）
+def write_reaction(r: Reaction, writer: Optional[ReactionLogWriter] = None):
+    # 写入 jsonl（r 为 core.Reaction）；传入 writer（指向 REACTION_LOG）时走缓冲批量写
+    if writer is not None:
+        r.log(writer=writer)
+        return
+    REACTION_LOG.parent.mkdir(parents=True, exist_ok=True)
     with REACTION_LOG.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(r.to_dict(), ensure_ascii=False) + "\n")
+        f.write(json.dumps(r.as_dict(), ensure_ascii=False) + "\n")
+
+
+def open_log_writers(**kwargs) -> Tuple[ReactionLogWriter, ReactionLogWriter]:
+    """
+    Return (reaction writer, index writer) for REACTION_LOG / INDEX_FILE,
+    to be passed to write_reaction / register_hash. kwargs go to ReactionLogWriter.
+    """
+    return ReactionLogWriter(REACTION_LOG, **kwargs), ReactionLogWriter(INDEX_FILE, **kwargs)
@@ -1,11 +1,15 @@
 # src/io/ase_adapter.py
-from ase import Atoms as ASEAtoms
+# ase 在首次调用转换函数时才导入，导入本模块本身不依赖 ase
+from typing import TYPE_CHECKING
 from ..atom import Atom
 from ..molecule import Molecule
 import numpy as np
 
+if TYPE_CHECKING:
+    from ase import Atoms as ASEAtoms
 
-def molecule_from_ase(ase_atoms: ASEAtoms) -> Molecule:
+
+def molecule_from_ase(ase_atoms: "ASEAtoms") -> Molecule:
     """
     从 ASE Atoms 对象转换为自定义 Molecule。
     """
@@ -34,10 +38,12 @@ def molecule_from_ase(ase_atoms: ASEAtoms) -> Molecule:
     return Molecule(atoms=atoms, metadata=meta)
 
 
-def molecule_to_ase(mol: Molecule) -> ASEAtoms:
+def molecule_to_ase(mol: Molecule) -> "ASEAtoms":
     """
     从自定义 Molecule 转为 ASE Atoms 对象（不包含电荷/磁矩等复杂量）。
     """
+    from ase import Atoms as ASEAtoms
+
     symbols = [a.symbol for a in mol.atoms]
     positions = [a.position for a in mol.atoms]
     masses = [a.mass for a in mol.atoms]
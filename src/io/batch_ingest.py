@@ -0,0 +1,327 @@
+# src/io/batch_ingest.py
+"""
+Batch ingestion of API reactions.
+
+Used by POST /upload_reactions (examples/api_reaction.py), but independent of
+the web framework:
+
+- parse_batch(): JSON array or NDJSON body -> list of (payload, error)
+- validate_payload(): ReactionInput dict -> (Reaction, canonical hash);
+  raises BatchItemError with an item status ("invalid" / "unbalanced")
+- BackgroundReactionWriter: the single writer thread. Submitted reactions
+  are queued and group-committed to REACTION_LOG through ReactionLogWriter,
+  then registered in the hash store; the duplicate check is repeated in the
+  writer thread, so concurrent batches cannot write the same reaction twice.
+- ingest_batch(): validates in a thread pool, de-duplicates within the batch
+  and against the known hashes, hands the rest to the writer and returns one
+  status dict per input item, in input order.
+"""
+import json
+import queue
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from src.io import api_adapter
+from src.io.api_schema import ReactionInput
+from src.io.reaction_log_writer import ReactionLogWriter
+from src.reaction import Reaction
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/x-jsonlines")
+
+# per-item statuses
+CREATED = "created"
+DUPLICATE = "duplicate"
+INVALID = "invalid"
+UNBALANCED = "unbalanced"
+ERROR = "error"
+
+
+class BatchItemError(ValueError):
+    """Rejected batch item; status is one of INVALID / UNBALANCED."""
+
+    def __init__(self, status: str, detail: Any):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+# ---------- parsing / validation ----------
+
+def parse_batch(body: Union[bytes, str], content_type: Optional[str] = None) -> List[Tuple[Any, Optional[str]]]:
+    """
+    Split a request body into items.
+
+    - NDJSON content types: one JSON object per non-empty line; a malformed
+      line only fails that item
+    - otherwise: a JSON array (a single object is treated as a batch of one)
+
+    Returns [(payload, None)] for parsed items and [(None, message)] for
+    unparsable NDJSON lines. A malformed JSON array raises ValueError.
+    """
+    if isinstance(body, bytes):
+        body = body.decode("utf-8")
+    media_type = (content_type or "").split(";")[0].strip().lower()
+
+    if media_type in NDJSON_CONTENT_TYPES:
+        items: List[Tuple[Any, Optional[str]]] = []
+        for lineno, line in enumerate(body.splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                items.append((json.loads(line), None))
+            except json.JSONDecodeError as e:
+                items.append((None, f"line {lineno}: {e}"))
+        return items
+
+    try:
+        data = json.loads(body)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"body is neither a JSON array nor NDJSON: {e}") from e
+    if isinstance(data, dict):
+        data = [data]
+    if not isinstance(data, list):
+        raise ValueError("body must be a JSON array of reactions")
+    return [(item, None) for item in data]
+
+
+def validate_payload(payload: Any) -> Tuple[Reaction, str]:
+    """
+    Schema validation, conversion to Reaction and element balance check.
+    Returns (reaction, canonical hash).
+    """
+    try:
+        ri = ReactionInput.model_validate(payload)
+        r = api_adapter.reactioninput_to_reaction(ri)
+    except Exception as e:
+        raise BatchItemError(INVALID, f"input parsing error: {e}") from e
+
+    diff = r.element_difference()
+    if diff:
+        raise BatchItemError(UNBALANCED, {"balanced": False, "difference": diff})
+    return r, api_adapter.reaction_to_canonical_hash(r)
+
+
+# ---------- background writer ----------
+
+_STOP = object()
+
+
+class BackgroundReactionWriter:
+    """
+    Single consumer thread that owns the reaction log and hash registration.
+
+    submit(reaction, hash) returns a Future resolving to CREATED or DUPLICATE
+    once the record is on disk (after the group flush, not when queued).
+    Per batch of up to max_batch queued items the reaction log is flushed
+    before the hashes are registered, so the index never names a reaction
+    missing from the log. If the flush fails the unwritten records are
+    dropped and their futures get the exception: a retry is neither
+    reported DUPLICATE nor written twice. If registration fails after the
+    flush, the hashes are kept as pending: they count as duplicates and are
+    registered first by the next batch. On start the tail of the log is
+    reconciled against the store (api_adapter.reconcile_log), which covers a
+    process that died between flush and registration.
+    """
+
+    def __init__(
+        self,
+        reaction_log: Union[str, Path, None] = None,
+        max_batch: int = 1000,
+        **writer_kwargs,
+    ):
+        if max_batch < 1:
+            raise ValueError("max_batch must be positive")
+        writer_kwargs.setdefault("max_records", max_batch)
+        # flushing is driven by the batch loop below
+        writer_kwargs.setdefault("flush_interval", None)
+        self.max_batch = int(max_batch)
+        reaction_log = reaction_log or api_adapter.REACTION_LOG
+        api_adapter.reconcile_log(reaction_log)
+        self._reaction_writer = ReactionLogWriter(reaction_log, **writer_kwargs)
+        # flushed to the log, registration failed: retried with the next batch
+        self._unregistered: Dict[str, None] = {}
+        self._queue: "queue.Queue" = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="reaction-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, reaction: Reaction, hash_str: str) -> Future:
+        fut: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise ValueError("submit to closed BackgroundReactionWriter")
+            self._queue.put((reaction, hash_str, fut))
+        return fut
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stop = False
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._commit(batch)
+            if stop:
+                return
+
+    def _commit(self, batch):
+        writer = self._reaction_writer
+        results = []
+        written: List[Tuple[str, Future]] = []
+        seen: Dict[str, None] = {}
+        on_disk = writer.written
+        try:
+            for reaction, h, fut in batch:
+                if h in seen or h in self._unregistered or api_adapter.is_duplicate(h):
+                    results.append((fut, DUPLICATE))
+                    continue
+                api_adapter.write_reaction(reaction, writer=writer)
+                seen[h] = None
+                written.append((h, fut))
+                results.append((fut, CREATED))
+            writer.flush()
+        except Exception as e:
+            # records still buffered never reached the log: drop them, or the
+            # next flush would write them behind the caller's back (and again
+            # when the failed items are retried)
+            writer.discard()
+            self._fail(batch, written[:writer.written - on_disk], e)
+            return
+        try:
+            self._register(h for h, _ in written)
+        except Exception as e:
+            for _, _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for fut, status in results:
+            fut.set_result(status)
+
+    def _register(self, hashes):
+        """Register flushed hashes after the pending ones; on failure all stay pending."""
+        self._unregistered.update(dict.fromkeys(hashes))
+        if self._unregistered:
+            api_adapter.register_hashes(list(self._unregistered))
+            self._unregistered.clear()
+
+    def _fail(self, batch, flushed: List[Tuple[str, Future]], error: Exception):
+        """
+        A flush failed. Records flushed earlier in the batch (size-triggered
+        flushes) are on disk, so they are registered and reported CREATED;
+        every other item gets the error.
+        """
+        try:
+            self._register(h for h, _ in flushed)
+        except Exception:
+            pass
+        else:
+            for _, fut in flushed:
+                fut.set_result(CREATED)
+        for _, _, fut in batch:
+            if not fut.done():
+                fut.set_exception(error)
+
+    def close(self):
+        """Drain the queue, flush and close the reaction log. Idempotent."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
+        self._reaction_writer.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __enter__(self) -> "BackgroundReactionWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+# ---------- batch driver ----------
+
+def _validate_item(item: Tuple[Any, Optional[str]]):
+    payload, parse_error = item
+    if parse_error is not None:
+        return BatchItemError(INVALID, parse_error)
+    try:
+        return validate_payload(payload)
+    except BatchItemError as e:
+        return e
+
+
+def ingest_batch(
+    items: Sequence[Tuple[Any, Optional[str]]],
+    writer: BackgroundReactionWriter,
+    executor: Optional[Executor] = None,
+    max_workers: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Validate, de-duplicate and write a parsed batch (see parse_batch).
+
+    Each returned dict has "index" and "status"; accepted items carry "hash",
+    rejected ones "detail", in-batch duplicates "duplicate_of" (index of the
+    first occurrence). Blocks until all accepted items are on disk.
+    """
+    own_executor = executor is None and len(items) > 1
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        if executor is None:
+            validated = [_validate_item(item) for item in items]
+        else:
+            validated = list(executor.map(_validate_item, items))
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+    results: List[Dict[str, Any]] = []
+    pending: List[Tuple[Dict[str, Any], Future]] = []
+    first_seen: Dict[str, int] = {}
+    for i, v in enumerate(validated):
+        if isinstance(v, BatchItemError):
+            results.append({"index": i, "status": v.status, "detail": v.detail})
+            continue
+        reaction, h = v
+        entry: Dict[str, Any] = {"index": i, "hash": h}
+        results.append(entry)
+        if h in first_seen:
+            entry.update(status=DUPLICATE, duplicate_of=first_seen[h])
+            continue
+        first_seen[h] = i
+        if api_adapter.is_duplicate(h):
+            entry["status"] = DUPLICATE
+            continue
+        pending.append((entry, writer.submit(reaction, h)))
+
+    for entry, fut in pending:
+        try:
+            entry["status"] = fut.result()
+        except Exception as e:
+            entry.update(status=ERROR, detail=str(e))
+    return results
+
+
+def summarize(results: Sequence[Dict[str, Any]]) -> Dict[str, int]:
+    """status -> number of items."""
+    counts: Dict[str, int] = {}
+    for r in results:
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+    return counts
@@ -0,0 +1,256 @@
+# src/io/bloom_filter.py
+"""
+Bloom filter prefilter for large membership structures.
+
+Most incoming reactions are new, so most `is_duplicate` calls are negative.
+A Bloom filter answers "definitely not present" from a small bit array; only
+"maybe present" falls through to the exact structure (HashStore).
+
+- BloomFilter: numpy bit array, k probes by double hashing. 32-byte digests
+  are used as hash material directly, other keys (e.g. canonical keys) go
+  through blake2b first. Tunable via capacity / error_rate.
+- BloomFilteredSet: set-like wrapper placing a BloomFilter in front of any
+  set-like object (add / discard / remove / in).
+- open_bloom(): load a persisted filter if it matches the store's stamp and
+  is not over capacity, otherwise rebuild it from the store.
+"""
+import hashlib
+import math
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+FORMAT = "chem_standard.bloom"
+_MASK64 = (1 << 64) - 1
+_CHUNK = 1 << 16
+
+
+def _hash_pair(key: Union[str, bytes]) -> Tuple[int, int]:
+    if isinstance(key, str):
+        key = key.encode("utf-8")
+    if len(key) != 32:
+        key = hashlib.blake2b(key, digest_size=16).digest()
+    # h2 odd -> never 0
+    return int.from_bytes(key[:8], "little"), int.from_bytes(key[8:16], "little") | 1
+
+
+class BloomFilter:
+    """
+    - capacity: expected number of keys
+    - error_rate: target false-positive rate at capacity
+    - stamp: opaque string identifying the state the filter was built from
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01, stamp: Optional[str] = None):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        if not 0.0 < error_rate < 1.0:
+            raise ValueError("error_rate must be in (0, 1)")
+        n_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        n_bits = max(64, (n_bits + 63) // 64 * 64)
+        self.capacity = int(capacity)
+        self.error_rate = float(error_rate)
+        self.n_bits = n_bits
+        self.n_hashes = max(1, round(n_bits / capacity * math.log(2)))
+        self.count = 0
+        self.stamp = stamp
+        self._bits = np.zeros(n_bits // 8, dtype=np.uint8)
+
+    # ---------- single keys ----------
+
+    def _positions(self, key: Union[str, bytes]):
+        h1, h2 = _hash_pair(key)
+        m = self.n_bits
+        return [((h1 + i * h2) & _MASK64) % m for i in range(self.n_hashes)]
+
+    def __contains__(self, key: Union[str, bytes]) -> bool:
+        bits = self._bits
+        for p in self._positions(key):
+            if not bits[p >> 3] & (1 << (p & 7)):
+                return False
+        return True
+
+    def add(self, key: Union[str, bytes]) -> bool:
+        """Set the key's bits; returns False if all of them were already set."""
+        bits = self._bits
+        new = False
+        for p in self._positions(key):
+            byte, mask = p >> 3, 1 << (p & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    # ---------- bulk ----------
+
+    def add_digests(self, digests: np.ndarray):
+        """
+        Vectorized add of 32-byte digests (array of dtype S32, e.g. a
+        HashStore segment). Same bit positions as add() for each digest.
+        """
+        digests = np.asarray(digests)
+        k = np.arange(self.n_hashes, dtype=np.uint64)
+        m = np.uint64(self.n_bits)
+        for start in range(0, len(digests), _CHUNK):
+            words = np.frombuffer(digests[start:start + _CHUNK].tobytes(), dtype="<u8").reshape(-1, 4)
+            h1 = words[:, 0:1]
+            h2 = words[:, 1:2] | np.uint64(1)
+            # uint64 arithmetic wraps like the & _MASK64 in _positions
+            pos = ((h1 + k * h2) % m).ravel()
+            np.bitwise_or.at(self._bits, (pos >> np.uint64(3)).astype(np.intp),
+                             (np.uint8(1) << (pos & np.uint64(7)).astype(np.uint8)))
+            self.count += len(words)
+
+    def update(self, keys: Iterable[Union[str, bytes]]):
+        for key in keys:
+            self.add(key)
+
+    # ---------- diagnostics ----------
+
+    @property
+    def nbytes(self) -> int:
+        return self._bits.nbytes
+
+    def fill_ratio(self) -> float:
+        return float(np.unpackbits(self._bits).mean())
+
+    def estimated_error_rate(self) -> float:
+        """False-positive probability implied by the current fill ratio."""
+        return self.fill_ratio() ** self.n_hashes
+
+    # ---------- persistence ----------
+
+    def save(self, path: Union[str, Path]):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("wb") as f:
+            np.savez(
+                f,
+                bits=self._bits,
+                meta=np.array([self.capacity, self.n_bits, self.n_hashes, self.count], dtype=np.int64),
+                error_rate=np.array(self.error_rate),
+                format=np.array(FORMAT),
+                stamp=np.array("" if self.stamp is None else self.stamp),
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "BloomFilter":
+        with np.load(Path(path), allow_pickle=False) as data:
+            if str(data["format"]) != FORMAT:
+                raise ValueError(f"{path}: not a {FORMAT} file")
+            capacity, n_bits, n_hashes, count = (int(x) for x in data["meta"])
+            bf = cls.__new__(cls)
+            bf.capacity, bf.n_bits, bf.n_hashes, bf.count = capacity, n_bits, n_hashes, count
+            bf.error_rate = float(data["error_rate"])
+            bf.stamp = str(data["stamp"]) or None
+            bf._bits = data["bits"].copy()
+        return bf
+
+
+class BloomFilteredSet:
+    """
+    Set-like view of `inner` with a BloomFilter in front of membership tests.
+    key_bytes maps a key to the bytes fed to the filter (default: identity).
+    Removals only reach `inner`; the filter then reports a harmless "maybe".
+    With a path, close() saves the filter stamped with inner.stamp().
+    """
+
+    def __init__(
+        self,
+        inner: Any,
+        bloom: BloomFilter,
+        key_bytes: Optional[Callable[[Any], Union[str, bytes]]] = None,
+        path: Union[str, Path, None] = None,
+    ):
+        self.inner = inner
+        self.bloom = bloom
+        self.path = Path(path) if path is not None else None
+        self._key = key_bytes or (lambda k: k)
+        # bit updates are read-modify-write; concurrent adds must not lose bits
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.filtered = 0
+
+    def __contains__(self, key) -> bool:
+        self.lookups += 1
+        try:
+            probe = self._key(key)
+        except (ValueError, TypeError):
+            return key in self.inner
+        if probe not in self.bloom:
+            self.filtered += 1
+            return False
+        return key in self.inner
+
+    def add(self, key):
+        result = self.inner.add(key)
+        with self._lock:
+            self.bloom.add(self._key(key))
+        return result
+
+    def update(self, keys) -> int:
+        keys = list(keys)
+        result = self.inner.update(keys)
+        with self._lock:
+            for key in keys:
+                self.bloom.add(self._key(key))
+        return result
+
+    def discard(self, key):
+        return self.inner.discard(key)
+
+    def remove(self, key):
+        return self.inner.remove(key)
+
+    def stats(self) -> Dict[str, int]:
+        return {"lookups": self.lookups, "filtered": self.filtered, "bloom_bytes": self.bloom.nbytes}
+
+    def close(self):
+        """Close the wrapped set, then persist the filter (if a path was given)."""
+        self.inner.close()
+        if self.path is not None:
+            self.bloom.stamp = self.inner.stamp()
+            self.bloom.save(self.path)
+
+    def __getattr__(self, name):
+        if name == "inner":
+            raise AttributeError(name)
+        # everything else (merge, close, wait, ...) goes to the wrapped set
+        return getattr(self.inner, name)
+
+
+def open_bloom(
+    store: Any,
+    path: Union[str, Path],
+    error_rate: float = 0.01,
+    min_capacity: int = 1 << 16,
+) -> BloomFilter:
+    """
+    Bloom filter for a HashStore: load `path` if it was saved for the store's
+    current stamp and is not over capacity, otherwise rebuild it from the
+    store's digests (sized for twice the current count) and save it.
+    """
+    path = Path(path)
+    stamp = store.stamp()
+    if path.exists():
+        try:
+            bf = BloomFilter.load(path)
+        except (OSError, ValueError, KeyError):
+            bf = None
+        if bf is not None and bf.stamp == stamp and bf.count <= bf.capacity and bf.error_rate == error_rate:
+            return bf
+
+    arrays = list(store.digest_arrays())
+    n = sum(len(a) for a in arrays)
+    bf = BloomFilter(max(min_capacity, 2 * n), error_rate, stamp=stamp)
+    for arr in arrays:
+        bf.add_digests(arr)
+    bf.save(path)
+    return bf
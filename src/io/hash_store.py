@@ -0,0 +1,563 @@
+# src/io/hash_store.py
+"""
+Persistent set of 32-byte digests (SHA-256 canonical reaction hashes).
+
+Replaces the "read reactions_index.txt into a Python set" approach: memory
+no longer grows with the corpus and opening the store only maps files.
+
+Layout of a store directory (log-structured, newest layer wins):
+
+- MANIFEST.json         store id (random, set at creation), segment list and
+                        the live log files (oldest first)
+- seg-NNNNNN.add/.del   immutable sorted arrays of raw digests added /
+                        removed in that layer, memory-mapped as dtype S32
+                        and searched with np.searchsorted
+- log-NNNNNN.bin        append-only records b"+"/b"-" + digest for the
+                        newest changes, mirrored in a small in-memory dict
+
+When the log reaches merge_threshold records it is frozen and written out as
+a new segment by a background thread; with more than max_segments segments
+all of them are compacted into one. Removals are tombstones until the
+compaction that covers the oldest segment.
+
+A store directory has a single writer process, enforced with an exclusive
+flock on its LOCK file (a second writer gets HashStoreLocked); any number
+of threads in that process may share one HashStore. Other processes open
+the store with readonly=True: they never modify or delete files, and
+re-read the manifest / tail the logs when the writer has changed them, so
+digests added by the writer become visible to them.
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # not POSIX: the single-writer rule is not enforced
+    fcntl = None
+
+MANIFEST = "MANIFEST.json"
+LOCK = "LOCK"
+FORMAT = "chem_standard.hashset"
+VERSION = 1
+DIGEST_SIZE = 32
+_RECORD = DIGEST_SIZE + 1
+_ADD, _DEL = b"+", b"-"
+_EMPTY = np.empty(0, dtype=f"S{DIGEST_SIZE}")
+
+Key = Union[str, bytes]
+
+
+class HashStoreLocked(RuntimeError):
+    """Another process holds the store's writer lock."""
+
+
+def to_digest(key: Key) -> bytes:
+    """64-char hex string or 32 raw bytes -> 32 raw bytes."""
+    if isinstance(key, str):
+        digest = bytes.fromhex(key)
+    else:
+        digest = bytes(key)
+    if len(digest) != DIGEST_SIZE:
+        raise ValueError(f"expected a {DIGEST_SIZE}-byte digest, got {len(digest)} bytes")
+    return digest
+
+
+def _load_array(path: Path) -> np.ndarray:
+    if path.stat().st_size == 0:
+        return _EMPTY
+    return np.memmap(path, dtype=f"S{DIGEST_SIZE}", mode="r")
+
+
+def _write_array(path: Path, digests: np.ndarray):
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(np.ascontiguousarray(digests, dtype=f"S{DIGEST_SIZE}").tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _sorted_unique(digests: Iterable[bytes]) -> np.ndarray:
+    return np.unique(np.array(list(digests), dtype=f"S{DIGEST_SIZE}"))
+
+
+def _member(arr: np.ndarray, digest: bytes) -> bool:
+    i = int(np.searchsorted(arr, digest))
+    # compare raw bytes: S32 scalars drop trailing NUL bytes
+    return i < len(arr) and arr[i:i + 1].tobytes() == digest
+
+
+class _Segment:
+    __slots__ = ("name", "adds", "dels")
+
+    def __init__(self, name: str, adds: np.ndarray, dels: np.ndarray):
+        self.name = name
+        self.adds = adds
+        self.dels = dels
+
+    def lookup(self, digest: bytes) -> Optional[bool]:
+        """True / False if this layer decides membership, None otherwise."""
+        if len(self.adds) and _member(self.adds, digest):
+            return True
+        if len(self.dels) and _member(self.dels, digest):
+            return False
+        return None
+
+
+class HashStore:
+    """
+    Set-like persistent digest store: `key in store`, add(), discard(),
+    remove(), update(). Keys are 64-char hex strings or 32 raw bytes.
+
+    - path: store directory (created if missing)
+    - merge_threshold: log records before a background merge starts
+    - max_segments: segment count that triggers a full compaction
+    - fsync: fsync the log after every write
+    - legacy_index: text file with one hex digest per line, imported once
+      when the store is created (e.g. data/reactions_index.txt)
+    - readonly: attach to a store owned by another (writer) process
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        merge_threshold: int = 1 << 16,
+        max_segments: int = 8,
+        fsync: bool = False,
+        legacy_index: Union[str, Path, None] = None,
+        readonly: bool = False,
+    ):
+        if merge_threshold < 1 or max_segments < 1:
+            raise ValueError("merge_threshold and max_segments must be positive")
+        self.path = Path(path)
+        self.merge_threshold = int(merge_threshold)
+        self.max_segments = int(max_segments)
+        self.fsync = fsync
+        self.readonly = readonly
+
+        self._lock = threading.RLock()
+        self._segments: List[_Segment] = []
+        self._log: Dict[bytes, bool] = {}
+        self._frozen: Optional[Dict[bytes, bool]] = None
+        self._merge_thread: Optional[threading.Thread] = None
+        self._merge_error: Optional[BaseException] = None
+        self._next = 1
+        self.store_id = ""
+        # log files whose records are in _log (current one last) / in _frozen
+        self._logs: List[str] = []
+        self._frozen_logs: List[str] = []
+        self._fh = None
+        self._lock_fh = None
+        # readonly: bytes of each log replayed so far, manifest identity
+        self._log_pos: Dict[str, int] = {}
+        self._manifest_id = None
+        self._closed = False
+        if readonly:
+            if not (self.path / MANIFEST).exists():
+                raise FileNotFoundError(f"{self.path}: no {FORMAT} store to attach to")
+            self._attach()
+        else:
+            self._lock_writer()
+            try:
+                self._open(Path(legacy_index) if legacy_index is not None else None)
+            except BaseException:
+                self._unlock_writer()
+                raise
+
+    # ---------- open / manifest ----------
+
+    def _new_name(self, prefix: str) -> str:
+        name = f"{prefix}-{self._next:06d}"
+        self._next += 1
+        return name
+
+    def _write_manifest(self):
+        data = {
+            "format": FORMAT,
+            "version": VERSION,
+            "id": self.store_id,
+            "next": self._next,
+            "segments": [s.name for s in self._segments],
+            "logs": self._frozen_logs + self._logs,
+        }
+        tmp = self.path / (MANIFEST + ".tmp")
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp, self.path / MANIFEST)
+
+    def _lock_writer(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        fh = (self.path / LOCK).open("a")
+        if fcntl is not None:
+            try:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                fh.close()
+                raise HashStoreLocked(
+                    f"{self.path} is open for writing in another process; "
+                    "open it with readonly=True there"
+                ) from None
+        self._lock_fh = fh
+
+    def _unlock_writer(self):
+        if self._lock_fh is not None:
+            # closing the file releases the flock
+            self._lock_fh.close()
+            self._lock_fh = None
+
+    def _read_manifest(self) -> dict:
+        data = json.loads((self.path / MANIFEST).read_text(encoding="utf-8"))
+        if data.get("format") != FORMAT or data.get("version") != VERSION:
+            raise ValueError(f"{self.path / MANIFEST}: not a {FORMAT} v{VERSION} store")
+        return data
+
+    def _open(self, legacy_index: Optional[Path]):
+        manifest = self.path / MANIFEST
+        if manifest.exists():
+            data = self._read_manifest()
+            self._next = int(data["next"])
+            self._segments = [self._load_segment(name) for name in data["segments"]]
+            # logs left by an interrupted merge are replayed like the current one
+            self._logs = list(data["logs"])
+            self.store_id = data.get("id", "")
+            if not self.store_id:
+                # stores created before ids existed get one now
+                self.store_id = uuid.uuid4().hex
+                self._write_manifest()
+        else:
+            self.store_id = uuid.uuid4().hex
+            if legacy_index is not None and legacy_index.exists():
+                self._import_text(legacy_index)
+            self._logs = [self._new_name("log")]
+            self._write_manifest()
+        for name in self._logs:
+            self._replay_log(name)
+        self._cleanup()
+        self._fh = (self.path / f"{self._logs[-1]}.bin").open("ab")
+
+    def _load_segment(self, name: str) -> _Segment:
+        return _Segment(name, _load_array(self.path / f"{name}.add"), _load_array(self.path / f"{name}.del"))
+
+    def _save_segment(self, name: str, adds: np.ndarray, dels: np.ndarray) -> _Segment:
+        _write_array(self.path / f"{name}.add", adds)
+        _write_array(self.path / f"{name}.del", dels)
+        return self._load_segment(name)
+
+    def _import_text(self, index: Path):
+        with index.open("r", encoding="utf-8") as f:
+            adds = _sorted_unique(to_digest(ln.strip()) for ln in f if ln.strip())
+        if len(adds):
+            self._segments.append(self._save_segment(self._new_name("seg"), adds, _EMPTY))
+
+    def _replay_log(self, name: str, start: int = 0) -> int:
+        """Apply the log's records from byte `start` on; returns the bytes used."""
+        log_path = self.path / f"{name}.bin"
+        if not log_path.exists():
+            return start
+        with log_path.open("rb") as f:
+            f.seek(start)
+            data = f.read()
+        usable = len(data) - len(data) % _RECORD
+        for i in range(0, usable, _RECORD):
+            self._log[data[i + 1:i + _RECORD]] = data[i:i + 1] == _ADD
+        if usable != len(data) and not self.readonly:
+            # torn last record from a crash (a reader may just see one in flight)
+            with log_path.open("r+b") as f:
+                f.truncate(start + usable)
+        return start + usable
+
+    # ---------- read-only attach ----------
+
+    def _manifest_stat(self):
+        st = os.stat(self.path / MANIFEST)
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _attach(self, retries: int = 20):
+        """(Re)load segments and logs from the writer's current manifest."""
+        for attempt in range(retries):
+            try:
+                ident = self._manifest_stat()
+                data = self._read_manifest()
+                loaded = {s.name: s for s in self._segments}
+                segments = [loaded.get(name) or self._load_segment(name) for name in data["segments"]]
+                self._log = {}
+                pos = {name: self._replay_log_strict(name) for name in data["logs"]}
+            except FileNotFoundError:
+                # the writer merged / compacted between our reads: start over
+                if attempt == retries - 1:
+                    raise
+                time.sleep(0.005)
+                continue
+            self._segments = segments
+            self._log_pos = pos
+            self._logs = list(data["logs"])
+            self._next = int(data["next"])
+            self.store_id = data.get("id") or str(self.path.resolve())
+            self._manifest_id = ident
+            return
+
+    def _replay_log_strict(self, name: str) -> int:
+        if not (self.path / f"{name}.bin").exists():
+            raise FileNotFoundError(self.path / f"{name}.bin")
+        return self._replay_log(name)
+
+    def refresh(self):
+        """
+        Read-only stores: pick up the writer's changes. Cheap when nothing
+        changed (one stat of the manifest and of the current log).
+        """
+        if not self.readonly:
+            return
+        with self._lock:
+            try:
+                if self._manifest_stat() != self._manifest_id:
+                    self._attach()
+                    return
+                for name in self._logs:
+                    pos = self._log_pos.get(name, 0)
+                    if os.stat(self.path / f"{name}.bin").st_size - pos >= _RECORD:
+                        self._log_pos[name] = self._replay_log(name, pos)
+            except FileNotFoundError:
+                self._attach()
+
+    def _cleanup(self):
+        """Delete files not referenced by the manifest (interrupted merges)."""
+        keep = {MANIFEST}
+        keep.update(f"{name}.bin" for name in self._logs)
+        for s in self._segments:
+            keep.update((f"{s.name}.add", f"{s.name}.del"))
+        for p in self.path.iterdir():
+            if p.name not in keep and p.name.startswith(("seg-", "log-", MANIFEST)):
+                p.unlink()
+
+    # ---------- queries ----------
+
+    def _lookup(self, digest: bytes) -> bool:
+        hit = self._log.get(digest)
+        if hit is not None:
+            return hit
+        if self._frozen is not None:
+            hit = self._frozen.get(digest)
+            if hit is not None:
+                return hit
+        for seg in reversed(self._segments):
+            hit = seg.lookup(digest)
+            if hit is not None:
+                return hit
+        return False
+
+    def __contains__(self, key: Key) -> bool:
+        try:
+            digest = to_digest(key)
+        except (ValueError, TypeError):
+            return False
+        with self._lock:
+            if self.readonly:
+                self.refresh()
+            return self._lookup(digest)
+
+    # ---------- updates ----------
+
+    def _append(self, op: bytes, digests: List[bytes]):
+        """Log op for digests with one write and one flush (fsync)."""
+        if self.readonly:
+            raise ValueError("write to read-only HashStore")
+        if self._fh is None:
+            raise ValueError("write to closed HashStore")
+        self._fh.write(b"".join(op + d for d in digests))
+        self._fh.flush()
+        if self.fsync:
+            os.fsync(self._fh.fileno())
+        present = op == _ADD
+        for d in digests:
+            self._log[d] = present
+        if len(self._log) >= self.merge_threshold and self._merge_thread is None:
+            self._start_merge()
+
+    def add(self, key: Key) -> bool:
+        """Add a digest; returns False if it was already present."""
+        digest = to_digest(key)
+        with self._lock:
+            if self._lookup(digest):
+                return False
+            self._append(_ADD, [digest])
+            return True
+
+    def update(self, keys: Iterable[Key]) -> int:
+        """
+        Add many digests; returns how many were new. The new ones are logged
+        with a single write and flush, so a failed write adds none of them.
+        """
+        digests = [to_digest(k) for k in keys]
+        with self._lock:
+            new = [d for d in dict.fromkeys(digests) if not self._lookup(d)]
+            if new:
+                self._append(_ADD, new)
+            return len(new)
+
+    def discard(self, key: Key) -> bool:
+        """Remove a digest if present; returns whether it was present."""
+        digest = to_digest(key)
+        with self._lock:
+            if not self._lookup(digest):
+                return False
+            self._append(_DEL, [digest])
+            return True
+
+    def remove(self, key: Key):
+        if not self.discard(key):
+            raise KeyError(key)
+
+    # ---------- merging ----------
+
+    def _start_merge(self):
+        """Freeze the log and merge it into a new segment in the background."""
+        self._frozen, self._frozen_logs = self._log, self._logs
+        self._log = {}
+        self._logs = [self._new_name("log")]
+        self._fh.close()
+        self._fh = (self.path / f"{self._logs[-1]}.bin").open("ab")
+        # frozen logs stay in the manifest until their segment is written
+        self._write_manifest()
+        self._merge_thread = threading.Thread(target=self._merge, name="hash-store-merge", daemon=True)
+        self._merge_thread.start()
+
+    def _merge(self):
+        try:
+            frozen = self._frozen
+            adds = _sorted_unique(d for d, present in frozen.items() if present)
+            dels = _sorted_unique(d for d, present in frozen.items() if not present)
+            with self._lock:
+                name = self._new_name("seg")
+            seg = self._save_segment(name, adds, dels)
+            with self._lock:
+                done = self._frozen_logs
+                self._segments.append(seg)
+                self._frozen, self._frozen_logs = None, []
+                self._write_manifest()
+            for log_name in done:
+                (self.path / f"{log_name}.bin").unlink()
+            if len(self._segments) > self.max_segments:
+                self._compact()
+        except BaseException as e:
+            with self._lock:
+                # keep the frozen records visible; the next merge retries them
+                if self._frozen is not None:
+                    self._frozen.update(self._log)
+                    self._log, self._frozen = self._frozen, None
+                    self._logs, self._frozen_logs = self._frozen_logs + self._logs, []
+                self._merge_error = e
+        finally:
+            with self._lock:
+                self._merge_thread = None
+
+    def _compact(self):
+        with self._lock:
+            segments = list(self._segments)
+            name = self._new_name("seg")
+        # oldest -> newest; the oldest layer has nothing underneath, so the
+        # result needs no tombstones
+        live = segments[0].adds
+        if len(segments[0].dels):
+            live = np.setdiff1d(live, segments[0].dels)
+        for seg in segments[1:]:
+            if len(seg.dels):
+                live = np.setdiff1d(live, seg.dels)
+            if len(seg.adds):
+                live = np.union1d(live, seg.adds)
+        merged = self._save_segment(name, live, _EMPTY)
+        with self._lock:
+            # segments appended meanwhile stay on top
+            self._segments = [merged] + self._segments[len(segments):]
+            self._write_manifest()
+        for seg in segments:
+            for suffix in (".add", ".del"):
+                (self.path / f"{seg.name}{suffix}").unlink()
+
+    def merge(self):
+        """Merge the current log now and wait for it (including compaction)."""
+        if self.readonly:
+            raise ValueError("merge of read-only HashStore")
+        self.wait()
+        with self._lock:
+            if self._log:
+                self._start_merge()
+        self.wait()
+
+    def wait(self):
+        """Block until a running background merge has finished."""
+        thread = self._merge_thread
+        if thread is not None:
+            thread.join()
+        if self._merge_error is not None:
+            err, self._merge_error = self._merge_error, None
+            raise RuntimeError("HashStore merge failed") from err
+
+    def digest_arrays(self) -> Iterable[np.ndarray]:
+        """
+        Arrays (dtype S32) covering every digest added to the store, e.g. for
+        rebuilding a Bloom filter. May include removed digests.
+        """
+        with self._lock:
+            self.refresh()
+            segments = list(self._segments)
+            pending = [d for layer in (self._frozen, self._log) if layer for d, present in layer.items() if present]
+        for seg in segments:
+            yield seg.adds
+        if pending:
+            yield np.array(pending, dtype=f"S{DIGEST_SIZE}")
+
+    def stamp(self) -> str:
+        """
+        Opaque string that changes whenever the stored set may have changed
+        (store id + segment names + log sizes); merges change it too. The
+        store id keeps two stores with the same history (e.g. one per hash
+        version) from sharing a stamp.
+        """
+        with self._lock:
+            self.refresh()
+            if self._fh is not None:
+                self._fh.flush()
+            logs = []
+            for name in self._frozen_logs + self._logs:
+                p = self.path / f"{name}.bin"
+                logs.append(f"{name}:{p.stat().st_size if p.exists() else 0}")
+            return self.store_id + "|" + ",".join(s.name for s in self._segments) + "|" + ",".join(logs)
+
+    # ---------- lifecycle ----------
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "segments": len(self._segments),
+                "segment_digests": sum(len(s.adds) for s in self._segments),
+                "tombstones": sum(len(s.dels) for s in self._segments),
+                "log_records": len(self._log),
+            }
+
+    def close(self):
+        """Wait for background work and close the log; the store stays on disk."""
+        self.wait()
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            self._unlock_writer()
+            self._closed = True
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __enter__(self) -> "HashStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
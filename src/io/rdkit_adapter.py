@@ -1,16 +1,21 @@
 # src/io/rdkit_adapter.py
-from rdkit import Chem
-from rdkit.Chem import AllChem
+# RDKit 在首次调用转换函数时才导入，导入本模块本身不依赖 RDKit
+from typing import TYPE_CHECKING
 from ..atom import Atom
 from ..molecule import Molecule
 
+if TYPE_CHECKING:
+    from rdkit import Chem
 
-def molecule_from_rdkit(mol: Chem.Mol, embed_if_needed: bool = True) -> Molecule:
+
+def molecule_from_rdkit(mol: "Chem.Mol", embed_if_needed: bool = True) -> Molecule:
     """
     从 RDKit Mol 对象转换为我们的 Molecule。
     如果分子没有 3D 坐标，会尝试做一次 Embed。
     """
     if mol.GetNumConformers() == 0 and embed_if_needed:
+        from rdkit.Chem import AllChem
+
         AllChem.EmbedMolecule(mol, randomSeed=42)
         AllChem.UFFOptimizeMolecule(mol)
 
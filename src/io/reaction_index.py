@@ -1,27 +1,382 @@
 from collections import defaultdict
+import hashlib
 import json
+import os
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
 from src.reaction import Reaction
+from src.dataset.reaction_dataset import iter_jsonl
+
 
 class ReactionIndex:
-    def __init__(self):
+    """
+    canonical_key -> reactions index.
+
+    With representatives_only=True only the first reaction of every canonical
+    group is kept (plus a per-key count), so memory grows with the number of
+    unique reactions instead of the number of lines.
+    """
+
+    def __init__(self, representatives_only: bool = False):
         self._index = defaultdict(list)
+        self._counts: Dict[str, int] = defaultdict(int)
+        self.representatives_only = representatives_only
 
-    def ingest_jsonl(self, path: Path):
-        with path.open("r", encoding="utf-8") as f:
-            for line in f:
-                if not line.strip():
-                    continue
-                d = json.loads(line)
-                r = Reaction.from_dict(d)
-                key = r.canonical_key()
-                self._index[key].append(r)
+    iter_jsonl = staticmethod(iter_jsonl)
+
+    def ingest(self, reactions: Iterable[Reaction]):
+        """
+        Add reactions from any iterable (list, generator, iter_jsonl stream).
+        """
+        self._ingest_keyed((r.canonical_key(), r) for r in reactions)
+
+    def _ingest_keyed(self, pairs: Iterable[Tuple[str, Reaction]]):
+        index = self._index
+        counts = self._counts
+        keep_all = not self.representatives_only
+        for key, r in pairs:
+            counts[key] += 1
+            if keep_all or counts[key] == 1:
+                index[key].append(r)
+
+    def ingest_jsonl(self, path: Path, batch_size: Optional[int] = None, workers: Optional[int] = None):
+        """
+        Ingest a jsonl file. workers > 1 keys byte-range shards in worker
+        processes (src.dataset.sharded_ingest); the parent then parses only
+        the lines it keeps (first occurrences with representatives_only).
+        Shards are sized by bytes, so batch_size cannot be combined with it.
+        """
+        if workers is not None and workers > 1:
+            if batch_size is not None:
+                raise ValueError("batch_size and workers > 1 are mutually exclusive")
+            from src.dataset.sharded_ingest import index_jsonl
+            view = index_jsonl(path, workers=workers)
+            counts = self._counts
+            kept = []
+            for i, key in enumerate(view.keys):
+                counts[key] += 1
+                if not self.representatives_only or counts[key] == 1:
+                    kept.append(i)
+            for i, r in zip(kept, view.reactions(kept)):
+                self._index[view.keys[i]].append(r)
+            return
+        if batch_size is None:
+            self.ingest(iter_jsonl(path))
+            return
+        for batch in iter_jsonl(path, batch_size=batch_size):
+            self.ingest(batch)
 
     def summary(self):
         return {
-            "total_reactions": sum(len(v) for v in self._index.values()),
+            "total_reactions": sum(self._counts.values()),
             "unique_reactions": len(self._index),
         }
 
     def counts(self):
-        return {k: len(v) for k, v in self._index.items()}
+        return dict(self._counts)
+
+    def representatives(self):
+        """
+        Return canonical_key -> first occurrence.
+        """
+        return {k: v[0] for k, v in self._index.items()}
+
+
+_RECORD = np.dtype([("key", "<u8"), ("offset", "<i8")])
+
+
+def _key_id(key: str) -> int:
+    """64-bit id of a canonical key / API hash (lookups re-check the parsed line)."""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class _OffsetTable:
+    """
+    key id -> byte offsets. Saved records live in an append-only file of
+    fixed-size (key id, offset) records, memory-mapped and argsorted on the
+    first lookup; records added since are kept in a dict until save().
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._base = np.empty(0, dtype=_RECORD)
+        self._keys: Optional[np.ndarray] = None
+        self._order: Optional[np.ndarray] = None
+        self._pending: Dict[int, List[int]] = {}
+        self._unsaved: List[Tuple[int, int]] = []
+        self._saved = 0
+
+    def __len__(self) -> int:
+        return len(self._base) + sum(len(v) for v in self._pending.values())
+
+    def load(self, n: int) -> bool:
+        """Map the first n saved records; False if the file is shorter."""
+        size = self.path.stat().st_size if self.path.exists() else 0
+        if size < n * _RECORD.itemsize:
+            return False
+        if n:
+            self._base = np.memmap(self.path, dtype=_RECORD, mode="r", shape=(n,))
+        self._saved = n
+        return True
+
+    def _sorted(self):
+        if self._keys is None:
+            # stable: equal ids keep file (= offset) order
+            self._order = np.argsort(self._base["key"], kind="stable")
+            self._keys = self._base["key"][self._order]
+        return self._keys, self._order
+
+    def offsets(self, key_id: int) -> List[int]:
+        out: List[int] = []
+        if len(self._base):
+            keys, order = self._sorted()
+            kid = np.uint64(key_id)
+            lo, hi = np.searchsorted(keys, kid, side="left"), np.searchsorted(keys, kid, side="right")
+            out = self._base["offset"][order[lo:hi]].tolist()
+        return out + self._pending.get(key_id, [])
+
+    def add(self, key_id: int, offset: int):
+        self._pending.setdefault(key_id, []).append(offset)
+        self._unsaved.append((key_id, offset))
+
+    def save(self) -> int:
+        """Append unsaved records after the mapped ones; returns the saved count."""
+        if not self._unsaved and self.path.exists():
+            return self._saved
+        end = self._saved * _RECORD.itemsize
+        with self.path.open("r+b" if self.path.exists() else "wb") as f:
+            # drop records a crashed writer appended after the last checkpoint
+            f.truncate(end)
+            f.seek(end)
+            f.write(np.array(self._unsaved, dtype=_RECORD).tobytes())
+        self._saved += len(self._unsaved)
+        self._unsaved = []
+        return self._saved
+
+    def reset(self):
+        self._base = np.empty(0, dtype=_RECORD)
+        self._keys = self._order = None
+        self._pending = {}
+        self._unsaved = []
+        self._saved = 0
+        if self.path.exists():
+            with self.path.open("r+b") as f:
+                f.truncate(0)
+
+
+class ReactionOffsetIndex:
+    """
+    Persistent index over a reactions jsonl file:
+    canonical_key / API hash (reaction_to_canonical_hash) -> byte offsets of lines.
+
+    - get(key) seeks to the recorded offsets and parses only those lines
+    - update() scans only the bytes appended since the last scan
+    - save() appends the new records and rewrites a small checkpoint;
+      open() maps the record files, so neither is O(corpus)
+
+    The index is a directory next to the jsonl file:
+
+        STATE.json      checkpoint: scanned bytes, head digest, record counts,
+                        hash version
+        canonical.bin   (key id, offset) records, append-only
+        hash.bin        same for API hashes
+        keys.jsonl      unique canonical keys, first-seen order
+
+    Records past the checkpoint (a crash between appending and
+    checkpointing) are ignored and overwritten. If the jsonl file was
+    truncated or rewritten (its head changed), or the index was built for
+    another HASH_VERSION, it is rebuilt from scratch.
+    """
+
+    VERSION = 2
+    _HEAD_BYTES = 4096
+    STATE = "STATE.json"
+    KEYS = "keys.jsonl"
+
+    def __init__(self, jsonl_path: Path, index_path: Optional[Path] = None, with_hashes: bool = True):
+        self.jsonl_path = Path(jsonl_path)
+        self.index_path = Path(index_path) if index_path else self.jsonl_path.with_name(self.jsonl_path.name + ".idx")
+        self.with_hashes = with_hashes
+        self.hash_version: Optional[int] = None
+        if with_hashes:
+            from src.io.api_adapter import HASH_VERSION
+
+            self.hash_version = HASH_VERSION
+        self._by_canonical = _OffsetTable(self.index_path / "canonical.bin")
+        self._by_hash = _OffsetTable(self.index_path / "hash.bin")
+        self._n_keys = 0
+        self._keys_bytes = 0
+        self._new_keys: List[str] = []
+        self._scanned = 0
+        self._head = ""
+
+    @classmethod
+    def open(cls, jsonl_path: Path, index_path: Optional[Path] = None, with_hashes: bool = True) -> "ReactionOffsetIndex":
+        """
+        Load a persisted index if present, then catch up with the jsonl file.
+        """
+        idx = cls(jsonl_path, index_path=index_path, with_hashes=with_hashes)
+        state_path = idx.index_path / cls.STATE
+        if state_path.exists():
+            with state_path.open("r", encoding="utf-8") as f:
+                state = json.load(f)
+            if (
+                state.get("version") == cls.VERSION
+                and state.get("with_hashes") == with_hashes
+                and state.get("hash_version") == idx.hash_version
+                and idx._by_canonical.load(state["canonical"])
+                and idx._by_hash.load(state["hash"])
+            ):
+                idx._n_keys = int(state["keys"])
+                idx._keys_bytes = int(state["keys_bytes"])
+                idx._scanned = int(state["scanned"])
+                idx._head = state["head"]
+            else:
+                idx._reset()
+        if idx.update() or not state_path.exists():
+            idx.save()
+        return idx
+
+    def _head_digest(self, f) -> str:
+        f.seek(0)
+        head = f.read(min(self._scanned, self._HEAD_BYTES))
+        return hashlib.sha1(head).hexdigest()
+
+    def _reset(self):
+        self._by_canonical.reset()
+        self._by_hash.reset()
+        self._n_keys = 0
+        self._keys_bytes = 0
+        self._new_keys = []
+        self._scanned = 0
+        self._head = ""
+
+    def update(self) -> int:
+        """
+        Index lines appended since the last scan. Returns the number of new records.
+        A trailing line without newline (still being written) is left for later.
+        """
+        if not self.jsonl_path.exists():
+            self._reset()
+            return 0
+
+        if self.with_hashes:
+            from src.io.api_adapter import reaction_to_canonical_hash
+
+        size = self.jsonl_path.stat().st_size
+        added = 0
+        with self.jsonl_path.open("rb") as f:
+            if size < self._scanned or (self._scanned and self._head_digest(f) != self._head):
+                self._reset()
+            f.seek(self._scanned)
+            pos = self._scanned
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                offset = pos
+                pos += len(line)
+                if not line.strip():
+                    continue
+                r = Reaction.from_dict(json.loads(line))
+                key = r.canonical_key()
+                kid = _key_id(key)
+                if not self._by_canonical.offsets(kid):
+                    self._new_keys.append(key)
+                self._by_canonical.add(kid, offset)
+                if self.with_hashes:
+                    self._by_hash.add(_key_id(reaction_to_canonical_hash(r, version=self.hash_version)), offset)
+                added += 1
+            grew_head = self._scanned < self._HEAD_BYTES and pos > self._scanned
+            self._scanned = pos
+            if grew_head or not self._head:
+                self._head = self._head_digest(f)
+        return added
+
+    def save(self):
+        """Append new records / keys, then atomically replace the checkpoint."""
+        self.index_path.mkdir(parents=True, exist_ok=True)
+        keys_path = self.index_path / self.KEYS
+        with keys_path.open("r+b" if keys_path.exists() else "wb") as f:
+            f.truncate(self._keys_bytes)
+            f.seek(self._keys_bytes)
+            f.write("".join(json.dumps(k, ensure_ascii=False) + "\n" for k in self._new_keys).encode("utf-8"))
+            self._keys_bytes = f.tell()
+        self._n_keys += len(self._new_keys)
+        self._new_keys = []
+        state = {
+            "version": self.VERSION,
+            "jsonl": self.jsonl_path.name,
+            "with_hashes": self.with_hashes,
+            "hash_version": self.hash_version,
+            "scanned": self._scanned,
+            "head": self._head,
+            "canonical": self._by_canonical.save(),
+            "hash": self._by_hash.save(),
+            "keys": self._n_keys,
+            "keys_bytes": self._keys_bytes,
+        }
+        tmp = self.index_path / (self.STATE + ".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.index_path / self.STATE)
+
+    # ---------- lookup ----------
+
+    def offsets(self, key: str) -> List[int]:
+        """
+        Candidate byte offsets for a canonical key or an API hash (get() drops
+        the lines whose key id merely collides).
+        """
+        kid = _key_id(key)
+        hit = self._by_canonical.offsets(kid)
+        if not hit:
+            hit = self._by_hash.offsets(kid)
+        return hit
+
+    def __contains__(self, key: str) -> bool:
+        return bool(self.get(key))
+
+    def __len__(self) -> int:
+        return self._n_keys + len(self._new_keys)
+
+    def keys(self):
+        keys = []
+        if self._keys_bytes:
+            with (self.index_path / self.KEYS).open("rb") as f:
+                keys = [json.loads(ln) for ln in f.read(self._keys_bytes).splitlines()]
+        return keys + self._new_keys
+
+    def get(self, key: str) -> List[Reaction]:
+        return self.get_many([key]).get(key, [])
+
+    def _matches(self, r: Reaction, key: str) -> bool:
+        if r.canonical_key() == key:
+            return True
+        if not self.with_hashes:
+            return False
+        from src.io.api_adapter import reaction_to_canonical_hash
+
+        return reaction_to_canonical_hash(r, version=self.hash_version) == key
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, List[Reaction]]:
+        """
+        Fetch reactions for several keys with one file handle, reading lines
+        in offset order.
+        """
+        wanted = {k: self.offsets(k) for k in keys}
+        lines: Dict[int, Reaction] = {}
+        todo = sorted({off for offs in wanted.values() for off in offs})
+        if todo:
+            with self.jsonl_path.open("rb") as f:
+                for off in todo:
+                    f.seek(off)
+                    lines[off] = Reaction.from_dict(json.loads(f.readline()))
+        out = {}
+        for k, offs in wanted.items():
+            hits = [lines[o] for o in offs if self._matches(lines[o], k)]
+            if hits:
+                out[k] = hits
+        return out
@@ -0,0 +1,221 @@
+# src/io/reaction_log_writer.py
+"""
+Buffered group-commit appender for jsonl / line-oriented logs.
+
+Instead of open -> write one line -> close per record, records are kept in a
+bounded in-memory buffer and appended in one write() on flush. Flushes happen
+when the buffer reaches max_records or max_bytes, when flush_interval seconds
+have passed since the oldest buffered record, on flush()/close(), and on
+leaving a `with` block.
+
+A failed flush keeps the records buffered for the next attempt. While the
+file stays broken the buffer may only grow up to max_pending records /
+max_pending_bytes; past that, write() retries the flush itself and raises
+LogBufferFull if it fails again, instead of buffering without bound.
+"""
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+FSYNC_POLICIES = ("never", "flush", "close")
+
+
+class LogBufferFull(RuntimeError):
+    """The buffer hit its hard limit and the file still cannot be written."""
+
+
+class ReactionLogWriter:
+    """
+    - path: file to append to (parent directory is created on first flush)
+    - max_records / max_bytes: size-based flush thresholds
+    - flush_interval: seconds a record may wait in the buffer (None disables
+      time-based flushing)
+    - fsync: "never" (leave it to the OS), "flush" (fsync after every flush),
+      "close" (fsync once when closing)
+    - max_pending / max_pending_bytes: hard buffer limit after failed
+      flushes (default 10x max_records / max_bytes), see LogBufferFull
+
+    Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_records: int = 1000,
+        max_bytes: int = 1 << 20,
+        flush_interval: Optional[float] = 1.0,
+        fsync: str = "never",
+        max_pending: Optional[int] = None,
+        max_pending_bytes: Optional[int] = None,
+    ):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}")
+        if max_records < 1 or max_bytes < 1:
+            raise ValueError("max_records and max_bytes must be positive")
+        self.path = Path(path)
+        self.max_records = int(max_records)
+        self.max_bytes = int(max_bytes)
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.max_pending = 10 * self.max_records if max_pending is None else int(max_pending)
+        self.max_pending_bytes = 10 * self.max_bytes if max_pending_bytes is None else int(max_pending_bytes)
+
+        self._lock = threading.RLock()
+        self._buffer: List[str] = []
+        self._buffered_bytes = 0
+        self._oldest: Optional[float] = None
+        self._timer: Optional[threading.Timer] = None
+        self._fh = None
+        self._closed = False
+        self._written = 0
+        # set by a failed flush, cleared by the next successful one
+        self._failing = False
+
+    # ---------- writing ----------
+
+    def write(self, record: Dict[str, Any]):
+        """
+        Buffer one record as a JSON line.
+        """
+        self.write_line(json.dumps(record, ensure_ascii=False))
+
+    def write_line(self, line: str):
+        """
+        Buffer one raw line (newline is appended).
+        """
+        with self._lock:
+            if self._closed:
+                raise ValueError("write to closed ReactionLogWriter")
+            if self._failing and (
+                len(self._buffer) >= self.max_pending or self._buffered_bytes >= self.max_pending_bytes
+            ):
+                try:
+                    self._flush_locked()
+                except Exception as e:
+                    raise LogBufferFull(
+                        f"{len(self._buffer)} records buffered and {self.path} is not writable"
+                    ) from e
+            data = line + "\n"
+            self._buffer.append(data)
+            self._buffered_bytes += len(data)
+            now = time.monotonic()
+            if self._oldest is None:
+                self._oldest = now
+                self._schedule_timer()
+
+            if (
+                len(self._buffer) >= self.max_records
+                or self._buffered_bytes >= self.max_bytes
+                or (self.flush_interval is not None and now - self._oldest >= self.flush_interval)
+            ):
+                self._flush_locked()
+
+    def _schedule_timer(self):
+        if self.flush_interval is None or self._timer is not None:
+            return
+        self._timer = threading.Timer(self.flush_interval, self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+            if not self._closed:
+                self._flush_locked()
+
+    # ---------- flushing ----------
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buffer:
+            return
+        start = None
+        try:
+            if self._fh is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._fh = self.path.open("a", encoding="utf-8")
+            start = os.fstat(self._fh.fileno()).st_size
+            self._fh.write("".join(self._buffer))
+            self._fh.flush()
+            if self.fsync == "flush":
+                os.fsync(self._fh.fileno())
+        except BaseException:
+            self._failing = True
+            self._rollback(start)
+            raise
+        self._failing = False
+        self._written += len(self._buffer)
+        self._buffer = []
+        self._buffered_bytes = 0
+        self._oldest = None
+
+    def _rollback(self, start: Optional[int]):
+        """Cut a partially written group off the file; the buffer is kept."""
+        fh, self._fh = self._fh, None
+        if fh is not None:
+            try:
+                fh.close()
+            except OSError:
+                pass
+        if start is not None:
+            try:
+                os.truncate(self.path, start)
+            except OSError:
+                pass
+
+    def discard(self) -> int:
+        """
+        Drop the buffered records without writing them (e.g. after a failed
+        flush whose records the caller reports as failed). Returns their number.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            dropped = len(self._buffer)
+            self._buffer = []
+            self._buffered_bytes = 0
+            self._oldest = None
+            return dropped
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._flush_locked()
+            if self._fh is not None:
+                if self.fsync == "close":
+                    os.fsync(self._fh.fileno())
+                self._fh.close()
+                self._fh = None
+            self._closed = True
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered, not yet written records."""
+        return len(self._buffer)
+
+    @property
+    def written(self) -> int:
+        """Number of records written to the file by this writer."""
+        return self._written
+
+    def __enter__(self) -> "ReactionLogWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
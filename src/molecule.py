@@ -1,8 +1,23 @@
 # src/molecule.py
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Sequence
 from .atom import Atom
 import numpy as np
 from collections import Counter
+from itertools import count
+
+# 全局递增的修订号：每次创建 / 修改分子都会拿到新值，供上层缓存判断是否失效
+_REVISIONS = count()
+
+
+def _format_formula(items: Iterable) -> str:
+    """
+    Join (element, count) pairs (already sorted) into a compact formula string.
+    """
+    parts = []
+    for el, n in items:
+        n = int(n)
+        parts.append(f"{el}" + (str(n) if n > 1 else ""))
+    return "".join(parts)
 
 
 class Molecule:
@@ -10,27 +25,201 @@ class Molecule:
     Molecule: 一组 Atom 对象以及元数据。
     提供常用的帮助函数（positions、center_of_mass、to_dict、from_dict）。
     新增：formula 属性（例如 "H2O"），根据 atom.symbol 自动生成。
+
+    存储模式：
+    - list（默认）：`Molecule(atoms=[...])`，保存 Atom 对象列表；
+    - columnar：`Molecule.from_arrays(...)` 或 `to_columnar()`，原子序数、符号、
+      坐标（N×3 float64）与质量存为连续的 NumPy 数组，`atoms` 只在访问时
+      按需构建 Atom 视图（视图的 position 与 positions 数组共享内存）。
+    两种模式对外 API 一致；columnar 模式下结构修改请通过 add_atom 进行。
+
+    formula 会被缓存；add_atom / 重新赋值 atoms 时失效（revision 随之递增，
+    Reaction 依赖它判断自身缓存的 signature / identity 是否过期）。
     """
 
     def __init__(self, atoms: List[Atom], metadata: Optional[Dict[str, Any]] = None):
+        self._set_atoms(atoms)
+        self.metadata = metadata or {}
+
+    def _set_atoms(self, atoms: List[Atom]):
         if not isinstance(atoms, list):
             raise ValueError("atoms must be a list of Atom instances")
         for a in atoms:
             if not isinstance(a, Atom):
                 raise ValueError("all elements of atoms must be Atom instances")
-        self.atoms = atoms
-        self.metadata = metadata or {}
+        self._atoms = atoms
+        self._columnar = False
+        self._numbers = None
+        self._symbols = None
+        self._positions = None
+        self._masses = None
+        self._radii = None
+        self._properties = None
+        self._touch()
+
+    def _touch(self):
+        self._revision = next(_REVISIONS)
+        self._formula = None
+
+    def _token(self):
+        """
+        Cache token for this molecule's composition; changes whenever atoms change.
+        """
+        return (self._revision, len(self))
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # revisions are process-local: take a fresh one after unpickling
+        self._revision = next(_REVISIONS)
+
+    # ---------- columnar construction ----------
+
+    @classmethod
+    def from_arrays(
+        cls,
+        atomic_numbers: Sequence[int],
+        symbols: Sequence[str],
+        positions,
+        masses=None,
+        covalent_radii=None,
+        properties: Optional[List[Dict[str, Any]]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> "Molecule":
+        """
+        Build a columnar Molecule from per-atom arrays.
+
+        - positions: (N, 3) array-like, stored as float64 without copying when possible
+          (e.g. a slice of a memory-mapped array stays a view).
+        - masses / covalent_radii: optional length-N arrays; NaN means "not set".
+        - properties: optional list of per-atom dicts.
+        """
+        numbers = np.asarray(atomic_numbers, dtype=np.int64).reshape(-1)
+        syms = np.asarray(symbols, dtype=str).reshape(-1)
+        pos = np.asarray(positions, dtype=np.float64)
+        n = numbers.shape[0]
+        if pos.size == 0 and n == 0:
+            pos = pos.reshape(0, 3)
+        if syms.shape[0] != n or pos.shape != (n, 3):
+            raise ValueError("atomic_numbers, symbols and positions must describe the same N atoms (positions N×3)")
+
+        if masses is None:
+            m = np.full(n, np.nan)
+        else:
+            m = np.asarray(masses, dtype=np.float64).reshape(-1)
+        radii = None if covalent_radii is None else np.asarray(covalent_radii, dtype=np.float64).reshape(-1)
+        if m.shape[0] != n or (radii is not None and radii.shape[0] != n):
+            raise ValueError("masses / covalent_radii must have one entry per atom")
+        if properties is not None and len(properties) != n:
+            raise ValueError("properties must have one entry per atom")
+
+        mol = cls.__new__(cls)
+        mol._atoms = None
+        mol._columnar = True
+        mol._numbers = numbers
+        mol._symbols = syms
+        mol._positions = pos
+        mol._masses = m
+        mol._radii = radii
+        mol._properties = list(properties) if properties is not None else None
+        mol._touch()
+        mol.metadata = metadata or {}
+        return mol
+
+    def to_columnar(self) -> "Molecule":
+        """
+        Return a columnar copy of this molecule (self if already columnar).
+        """
+        if self._columnar:
+            return self
+        cols = self.as_arrays()
+        props = [a.properties for a in self._atoms]
+        radii = cols["covalent_radii"]
+        return Molecule.from_arrays(
+            cols["atomic_numbers"],
+            cols["symbols"],
+            cols["positions"],
+            masses=cols["masses"],
+            covalent_radii=None if np.isnan(radii).all() else radii,
+            properties=props if any(props) else None,
+            metadata=self.metadata,
+        )
+
+    @property
+    def is_columnar(self) -> bool:
+        return self._columnar
+
+    def as_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Per-atom columns: atomic_numbers (int64), symbols (str), positions (N×3 float64),
+        masses and covalent_radii (float64, NaN where unset).
+        Columnar molecules return their storage directly.
+        """
+        if self._columnar:
+            return {
+                "atomic_numbers": self._numbers,
+                "symbols": self._symbols,
+                "positions": self._positions,
+                "masses": self._masses,
+                "covalent_radii": self._radii if self._radii is not None else np.full(len(self._numbers), np.nan),
+            }
+        atoms = self._atoms
+        return {
+            "atomic_numbers": np.array([a.atomic_number for a in atoms], dtype=np.int64),
+            "symbols": np.array([a.symbol for a in atoms], dtype=str),
+            "positions": self.positions if atoms else np.empty((0, 3)),
+            "masses": np.array([np.nan if a.mass is None else a.mass for a in atoms], dtype=np.float64),
+            "covalent_radii": np.array(
+                [np.nan if a.covalent_radius is None else a.covalent_radius for a in atoms], dtype=np.float64
+            ),
+        }
+
+    # ---------- atoms ----------
+
+    @property
+    def atoms(self) -> List[Atom]:
+        if self._atoms is None:
+            self._atoms = self._atom_views()
+        return self._atoms
+
+    @atoms.setter
+    def atoms(self, atoms: List[Atom]):
+        self._set_atoms(atoms)
+
+    def _atom_views(self) -> List[Atom]:
+        radii = self._radii
+        props = self._properties
+        views = []
+        for i in range(len(self._numbers)):
+            m = self._masses[i]
+            r = None if radii is None else radii[i]
+            views.append(Atom(
+                atomic_number=int(self._numbers[i]),
+                symbol=str(self._symbols[i]),
+                # row view: Atom keeps it as-is, so coordinates stay shared
+                position=self._positions[i],
+                mass=None if np.isnan(m) else float(m),
+                covalent_radius=None if r is None or np.isnan(r) else float(r),
+                properties=props[i] if props is not None else {},
+            ))
+        return views
 
     @property
     def positions(self) -> np.ndarray:
-        return np.vstack([a.position for a in self.atoms])
+        if self._columnar:
+            return self._positions
+        return np.vstack([a.position for a in self._atoms])
 
     @property
     def atomic_numbers(self) -> List[int]:
-        return [a.atomic_number for a in self.atoms]
+        if self._columnar:
+            return self._numbers.tolist()
+        return [a.atomic_number for a in self._atoms]
 
     def center_of_mass(self) -> np.ndarray:
-        masses = np.array([a.mass if a.mass is not None else 1.0 for a in self.atoms], dtype=float)
+        if self._columnar:
+            masses = np.where(np.isnan(self._masses), 1.0, self._masses)
+            return masses @ self._positions / masses.sum()
+        masses = np.array([a.mass if a.mass is not None else 1.0 for a in self._atoms], dtype=float)
         pos = self.positions
         return (masses[:, None] * pos).sum(axis=0) / masses.sum()
 
@@ -42,38 +231,105 @@ class Molecule:
         - Return a compact formula like C6H6O or H2O (sorted by Hill system not implemented;
           we use alphabetical ordering for reproducibility here).
         """
-        symbols = [a.symbol for a in self.atoms]
-        counts = Counter(symbols)
+        cached = self._formula
+        if cached is not None and cached[0] == len(self):
+            return cached[1]
+        formula = self._compute_formula()
+        self._formula = (len(self), formula)
+        return formula
+
+    def _compute_formula(self) -> str:
+        return _format_formula(self.element_counts().items())
+
+    def element_counts(self) -> Dict[str, int]:
+        """
+        元素符号 -> 原子数，按符号字母序排列（与 formula 一致）。
+        """
+        if self._columnar:
+            # np.unique sorts by code point, same as sorted() on str
+            els, counts = np.unique(self._symbols, return_counts=True)
+            return dict(zip(els.tolist(), counts.tolist()))
+        counts = Counter(a.symbol for a in self._atoms)
         # Sort keys for reproducible output: alphabetical
-        parts = []
-        for el in sorted(counts.keys()):
-            n = counts[el]
-            parts.append(f"{el}" + (str(n) if n > 1 else ""))
-        return "".join(parts)
+        return {el: counts[el] for el in sorted(counts.keys())}
 
     def to_dict(self) -> Dict:
         """
         Include atoms, metadata, and computed formula to aid downstream ML pipelines.
         """
+        if self._columnar and self._atoms is None:
+            atoms = self._atom_dicts()
+        else:
+            atoms = [a.to_dict() for a in self.atoms]
         return {
-            "atoms": [a.to_dict() for a in self.atoms],
+            "atoms": atoms,
             "metadata": self.metadata,
             "formula": self.formula,
-            "n_atoms": len(self.atoms),
+            "n_atoms": len(self),
         }
 
+    def _atom_dicts(self) -> List[Dict[str, Any]]:
+        # same layout as Atom.to_dict(), without building Atom objects
+        masses = self._masses.tolist()
+        radii = self._radii.tolist() if self._radii is not None else None
+        props = self._properties
+        out = []
+        for i, (z, s, pos) in enumerate(zip(self._numbers.tolist(), self._symbols.tolist(), self._positions.tolist())):
+            m = masses[i]
+            r = None if radii is None else radii[i]
+            out.append({
+                "atomic_number": z,
+                "symbol": s,
+                "position": pos,
+                "mass": None if m != m else m,
+                "covalent_radius": None if r is None or r != r else r,
+                "properties": dict(props[i]) if props is not None else {},
+            })
+        return out
+
     @classmethod
-    def from_dict(cls, data: Dict) -> "Molecule":
+    def from_dict(cls, data: Dict, columnar: bool = False) -> "Molecule":
+        if columnar:
+            ads = data["atoms"]
+            props = [ad.get("properties", {}) for ad in ads]
+            radii = [ad.get("covalent_radius") for ad in ads]
+            return cls.from_arrays(
+                [ad["atomic_number"] for ad in ads],
+                [ad["symbol"] for ad in ads],
+                np.array([ad["position"] for ad in ads], dtype=np.float64).reshape(-1, 3),
+                masses=[np.nan if ad.get("mass") is None else ad["mass"] for ad in ads],
+                covalent_radii=None if all(r is None for r in radii) else [np.nan if r is None else r for r in radii],
+                properties=props if any(props) else None,
+                metadata=data.get("metadata", {}),
+            )
         atoms = [Atom.from_dict(ad) for ad in data["atoms"]]
         return cls(atoms=atoms, metadata=data.get("metadata", {}))
 
     def add_atom(self, atom: Atom):
         if not isinstance(atom, Atom):
             raise ValueError("atom must be an Atom instance")
-        self.atoms.append(atom)
+        self._touch()
+        if not self._columnar:
+            self._atoms.append(atom)
+            return
+        n = len(self._numbers)
+        self._numbers = np.append(self._numbers, atom.atomic_number)
+        self._symbols = np.append(self._symbols, atom.symbol)
+        self._positions = np.vstack([self._positions, atom.position])
+        self._masses = np.append(self._masses, np.nan if atom.mass is None else atom.mass)
+        if self._radii is not None or atom.covalent_radius is not None:
+            radii = self._radii if self._radii is not None else np.full(n, np.nan)
+            self._radii = np.append(radii, np.nan if atom.covalent_radius is None else atom.covalent_radius)
+        if self._properties is not None or atom.properties:
+            props = self._properties if self._properties is not None else [{} for _ in range(n)]
+            self._properties = props + [atom.properties]
+        # previously built views point at the old arrays
+        self._atoms = None
 
     def __len__(self):
-        return len(self.atoms)
+        if self._columnar:
+            return len(self._numbers)
+        return len(self._atoms)
 
     def __repr__(self):
-        return f"Molecule(num_atoms={len(self.atoms)}, formula={self.formula}, metadata={self.metadata})"
+        return f"Molecule(num_atoms={len(self)}, formula={self.formula}, metadata={self.metadata})"
@@ -0,0 +1,43 @@
+# src/path/costs.py
+"""
+Edge cost functions for ReactionPathFinder.shortest_path / k_shortest_paths.
+
+A cost function takes a Reaction (or a reaction key when the graph has no
+Reaction object for it) and returns a non-negative float; None means the
+reaction cannot be used.
+"""
+from typing import Any, Callable, Optional
+
+
+def unit_cost(reaction: Any) -> float:
+    """Every step costs 1 (fewest reactions)."""
+    return 1.0
+
+
+def _field_cost(attr: str, key: str, default: Optional[float], scale: float) -> Callable[[Any], Optional[float]]:
+    def cost(reaction: Any) -> Optional[float]:
+        values = getattr(reaction, attr, None)
+        value = values.get(key) if isinstance(values, dict) else None
+        if value is None:
+            return default
+        try:
+            return float(value) * scale
+        except (TypeError, ValueError):
+            return default
+
+    return cost
+
+
+def condition_cost(key: str, default: Optional[float] = None, scale: float = 1.0) -> Callable[[Any], Optional[float]]:
+    """
+    Cost taken from reaction.conditions[key] (e.g. "temperature_K"), times scale.
+    Reactions without a numeric value get `default` (None = not traversable).
+    """
+    return _field_cost("conditions", key, default, scale)
+
+
+def metadata_cost(key: str, default: Optional[float] = None, scale: float = 1.0) -> Callable[[Any], Optional[float]]:
+    """
+    Cost taken from reaction.metadata[key], times scale.
+    """
+    return _field_cost("metadata", key, default, scale)
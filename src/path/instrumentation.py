@@ -0,0 +1,227 @@
+# src/path/instrumentation.py
+"""
+Opt-in instrumentation for ReactionPathFinder.
+
+ReactionPathFinder(..., instrument=True) and/or trace=callback makes the
+finder compile its RulePipeline with timed wrappers around every rule method
+and record, per query, a QueryProfile:
+
+- per rule and stage: calls, cumulative wall time, rejections
+  (a falsy check or a truthy should_prune; exceptions count as errors)
+- frontier size per depth level (nodes enqueued at each depth; for the
+  bidirectional mode also the backward layers), peak queue length
+- total query latency and the finder's regular stats() counters
+
+trace(event, data) receives "query_start", "reject" (one per rule rejection),
+"path" (one per result) and "query_end" (data = QueryProfile.as_dict()).
+
+When neither is enabled the finder runs the plain, unwrapped pipeline: no
+timer calls, no per-edge checks.
+"""
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+TraceCallback = Callable[[str, Dict[str, Any]], None]
+
+# RulePipeline stages
+APPLICABLE = "reaction.is_applicable"
+REACTION_ALLOW = "reaction.allow"
+REACTION_PRUNE = "reaction.should_prune"
+PATH_PRUNE = "path.should_prune"
+PATH_ALLOW = "path.allow"
+
+
+def rule_name(rule: Any) -> str:
+    name = getattr(rule, "name", None)
+    return name if isinstance(name, str) and name else type(rule).__name__
+
+
+class RuleStats:
+    """Counters of one rule method (rule, stage)."""
+
+    __slots__ = ("name", "stage", "calls", "seconds", "rejected", "errors")
+
+    def __init__(self, name: str, stage: str):
+        self.name = name
+        self.stage = stage
+        self.calls = 0
+        self.seconds = 0.0
+        self.rejected = 0
+        self.errors = 0
+
+    @property
+    def passed(self) -> int:
+        return self.calls - self.rejected
+
+    @property
+    def reject_ratio(self) -> float:
+        return self.rejected / self.calls if self.calls else 0.0
+
+    def add(self, other: "RuleStats"):
+        self.calls += other.calls
+        self.seconds += other.seconds
+        self.rejected += other.rejected
+        self.errors += other.errors
+
+    def reset(self):
+        self.calls = self.rejected = self.errors = 0
+        self.seconds = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "rule": self.name,
+            "stage": self.stage,
+            "calls": self.calls,
+            "seconds": self.seconds,
+            "passed": self.passed,
+            "rejected": self.rejected,
+            "reject_ratio": self.reject_ratio,
+            "errors": self.errors,
+        }
+
+
+class QueryProfile:
+    """Measurements of one finder query (see module docstring)."""
+
+    def __init__(self, query: str, start: Any, target: Any, mode: Optional[str] = None, max_depth: Optional[int] = None):
+        self.query = query
+        self.start = start
+        self.target = target
+        self.mode = mode
+        self.max_depth = max_depth
+        self.seconds = 0.0
+        self.frontier: List[int] = []
+        self.backward_frontier: List[int] = []
+        self.peak_queue = 0
+        self.results = 0
+        self.counters: Dict[str, int] = {}
+        self.rules: List[RuleStats] = []
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "query": self.query,
+            "start": self.start,
+            "target": self.target,
+            "mode": self.mode,
+            "max_depth": self.max_depth,
+            "seconds": self.seconds,
+            "frontier": list(self.frontier),
+            "backward_frontier": list(self.backward_frontier),
+            "peak_queue": self.peak_queue,
+            "results": self.results,
+            "counters": dict(self.counters),
+            "rules": [s.as_dict() for s in self.rules],
+        }
+
+    def slowest_rules(self, n: int = 5) -> List[RuleStats]:
+        return sorted(self.rules, key=lambda s: s.seconds, reverse=True)[:n]
+
+
+class Instrumentation:
+    """
+    Collector owned by a finder. wrap() is used by RulePipeline at compile
+    time; begin() / end() bracket each query. Rule counters are kept per
+    query (QueryProfile.rules) and accumulated in totals().
+    """
+
+    def __init__(self, trace: Optional[TraceCallback] = None):
+        self.trace = trace
+        self.current: Optional[QueryProfile] = None
+        self.last: Optional[QueryProfile] = None
+        self.queries = 0
+        self.seconds = 0.0
+        self._rules: List[RuleStats] = []
+        self._totals: Dict[tuple, RuleStats] = {}
+        self._t0 = 0.0
+
+    # ---------- rule wrappers ----------
+
+    def clear_rules(self):
+        """Forget the wrappers of a previous pipeline (totals are kept)."""
+        self._rules = []
+
+    def wrap(self, rule: Any, stage: str, fn: Callable[..., Any], reaction_arg: int) -> Callable[..., Any]:
+        """
+        Timed version of a compiled rule method. reaction_arg is the position
+        of the reaction in fn's arguments (for "reject" trace events).
+        """
+        stats = RuleStats(rule_name(rule), stage)
+        self._rules.append(stats)
+        prune = stage in (REACTION_PRUNE, PATH_PRUNE)
+        clock = time.perf_counter
+
+        def timed(*args):
+            stats.calls += 1
+            t0 = clock()
+            try:
+                verdict = fn(*args)
+            except Exception:
+                stats.seconds += clock() - t0
+                stats.errors += 1
+                # RulePipeline: a failing check rejects, a failing prune does not prune
+                if not prune:
+                    self._reject(stats, args[reaction_arg], error=True)
+                raise
+            stats.seconds += clock() - t0
+            if (not verdict) is not prune:
+                self._reject(stats, args[reaction_arg])
+            return verdict
+
+        return timed
+
+    def _reject(self, stats: RuleStats, reaction: Any, error: bool = False):
+        stats.rejected += 1
+        if self.trace is not None:
+            self.trace("reject", {"rule": stats.name, "stage": stats.stage, "reaction": reaction, "error": error})
+
+    # ---------- queries ----------
+
+    def begin(self, query: str, start: Any, target: Any, mode: Optional[str] = None, max_depth: Optional[int] = None):
+        for s in self._rules:
+            s.reset()
+        self.current = QueryProfile(query, start, target, mode, max_depth)
+        if self.trace is not None:
+            self.trace("query_start", {"query": query, "start": start, "target": target, "mode": mode, "max_depth": max_depth})
+        self._t0 = time.perf_counter()
+
+    def track_queue(self, push: Callable[[Any], None], queue) -> Callable[[Any], None]:
+        """push() wrapper recording the peak length of `queue`."""
+        profile = self.current
+
+        def tracked(item):
+            push(item)
+            if len(queue) > profile.peak_queue:
+                profile.peak_queue = len(queue)
+
+        return tracked
+
+    def end(self, results: List[Any], counters: Dict[str, int]) -> QueryProfile:
+        elapsed = time.perf_counter() - self._t0
+        profile = self.current
+        profile.seconds = elapsed
+        profile.results = len(results)
+        profile.counters = dict(counters)
+        profile.rules = []
+        for s in self._rules:
+            snapshot = RuleStats(s.name, s.stage)
+            snapshot.add(s)
+            profile.rules.append(snapshot)
+            key = (s.name, s.stage)
+            total = self._totals.get(key)
+            if total is None:
+                total = self._totals[key] = RuleStats(s.name, s.stage)
+            total.add(s)
+        self.queries += 1
+        self.seconds += elapsed
+        self.current = None
+        self.last = profile
+
+        if self.trace is not None:
+            for path in results:
+                self.trace("path", {"path": path})
+            self.trace("query_end", profile.as_dict())
+        return profile
+
+    def totals(self) -> List[RuleStats]:
+        """Rule counters accumulated over all finished queries, by (name, stage)."""
+        return list(self._totals.values())
@@ -0,0 +1,200 @@
+# src/path/parallel_paths.py
+"""
+Many independent path queries against one SpeciesGraph on a process pool.
+
+The graph is frozen and its CSR arrays (plus edge multiplicities, species
+names and reaction keys as StringTable arrays) are copied once into a
+single multiprocessing.shared_memory block. Each worker process attaches to
+the block in its pool initializer, wraps the arrays in a SpeciesGraph
+(SpeciesGraph.from_csr: no copy of the arrays, no per-edge or per-name
+Python objects built up front) and keeps one
+ReactionPathFinder for all of its queries. Tasks only carry (start, target)
+pairs; the graph is never pickled per task.
+
+- SharedSpeciesGraph.publish(graph): owner side, close() unlinks the block
+- attach_species_graph(name, layout): worker side
+- find_paths_many(graph, queries, workers=N, ...): [(paths, stats)] in
+  input order; also available as ReactionPathFinder.find_paths_many
+
+Rules are pickled once per worker (initializer arguments), so they must be
+picklable (module-level classes, no lambdas).
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.graph.species_csr import SpeciesCSR, StringTable
+from src.graph.species_graph import SpeciesGraph
+
+# (field, dtype str, length, byte offset)
+Layout = List[Tuple[str, str, int, int]]
+QueryResult = Tuple[List[List[str]], Dict[str, int]]
+
+_CSR_FIELDS = ("out_offsets", "out_targets", "out_reactions", "in_offsets", "in_sources", "in_reactions")
+_ALIGN = 8
+
+
+def _views(buf, layout: Layout) -> Dict[str, np.ndarray]:
+    return {
+        field: np.ndarray((length,), dtype=np.dtype(dtype), buffer=buf, offset=offset)
+        for field, dtype, length, offset in layout
+    }
+
+
+class SharedSpeciesGraph:
+    """
+    Owner of a shared-memory copy of a SpeciesGraph's CSR view.
+    (name, layout) is all another process needs to attach_species_graph().
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, layout: Layout):
+        self._shm = shm
+        self.layout = layout
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def nbytes(self) -> int:
+        return self._shm.size
+
+    @classmethod
+    def publish(cls, graph: SpeciesGraph) -> "SharedSpeciesGraph":
+        """Freeze `graph` and copy its CSR view into a new shared memory block."""
+        csr = graph.csr()
+        arrays = {field: getattr(csr, field) for field in _CSR_FIELDS}
+        arrays["out_counts"] = graph.out_edge_counts()
+        for prefix, strings in (("species", csr.species_names), ("reaction", csr.reaction_keys)):
+            table = strings if isinstance(strings, StringTable) else StringTable.encode(strings)
+            for part, arr in table.arrays().items():
+                arrays[f"{prefix}_{part}"] = arr
+
+        layout: Layout = []
+        offset = 0
+        for field, arr in arrays.items():
+            layout.append((field, arr.dtype.str, len(arr), offset))
+            offset += -(-arr.nbytes // _ALIGN) * _ALIGN
+
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        try:
+            views = _views(shm.buf, layout)
+            for field, arr in arrays.items():
+                views[field][:] = arr
+            del views
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+        return cls(shm, layout)
+
+    def close(self):
+        """Release and unlink the block. Idempotent."""
+        if self._shm is None:
+            return
+        shm, self._shm = self._shm, None
+        shm.close()
+        shm.unlink()
+
+    def __enter__(self) -> "SharedSpeciesGraph":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def attach_species_graph(name: str, layout: Layout) -> Tuple[SpeciesGraph, shared_memory.SharedMemory]:
+    """
+    Frozen SpeciesGraph whose CSR arrays live in the shared block `name`.
+    The returned SharedMemory handle must be kept alive as long as the graph
+    is used; the block is unlinked by its owner only.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    v = _views(shm.buf, layout)
+    csr = SpeciesCSR(
+        StringTable(v["species_blob"], v["species_offsets"], v["species_order"]),
+        StringTable(v["reaction_blob"], v["reaction_offsets"], v["reaction_order"]),
+        *(v[field] for field in _CSR_FIELDS),
+    )
+    return SpeciesGraph.from_csr(csr, v["out_counts"]), shm
+
+
+# ---------- worker side ----------
+
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(name: str, layout: Layout, finder_kwargs: Dict[str, Any], query_kwargs: Dict[str, Any]):
+    from src.path.reaction_path_finder import ReactionPathFinder
+
+    graph, shm = attach_species_graph(name, layout)
+    _worker["shm"] = shm
+    _worker["finder"] = ReactionPathFinder(graph, **finder_kwargs)
+    _worker["query_kwargs"] = query_kwargs
+
+
+def _run_query(finder, query: Sequence[str], query_kwargs: Dict[str, Any]) -> QueryResult:
+    start, target = query
+    paths = finder.find_paths(start, target, **query_kwargs)
+    return paths, finder.stats()
+
+
+def _run_chunk(queries: List[Tuple[str, str]]) -> List[QueryResult]:
+    finder, query_kwargs = _worker["finder"], _worker["query_kwargs"]
+    return [_run_query(finder, q, query_kwargs) for q in queries]
+
+
+def find_paths_many(
+    graph: SpeciesGraph,
+    queries: Iterable[Sequence[str]],
+    workers: Optional[int] = None,
+    max_depth: int = 5,
+    mode: str = "bfs",
+    prune_unreachable: bool = True,
+    reaction_rules: Optional[Iterable[Any]] = None,
+    path_rules: Optional[Iterable[Any]] = None,
+    max_paths: int = 1000,
+    chunksize: Optional[int] = None,
+) -> List[QueryResult]:
+    """
+    Run ReactionPathFinder.find_paths for every (start, target) in queries.
+    Returns [(paths, stats)] in input order, stats as finder.stats().
+
+    workers=None uses os.cpu_count(); workers=1 (or a single query) runs
+    in-process without shared memory. Queries are sent in chunks of
+    `chunksize` (default: about 4 chunks per worker).
+    """
+    from src.path.reaction_path_finder import ReactionPathFinder
+
+    queries = [tuple(q) for q in queries]
+    if mode not in ("bfs", "astar", "bidirectional"):
+        raise ValueError(f"unknown search mode: {mode!r}")
+    finder_kwargs = {
+        "reaction_rules": list(reaction_rules) if reaction_rules else None,
+        "path_rules": list(path_rules) if path_rules else None,
+        "max_paths": max_paths,
+    }
+    query_kwargs = {"max_depth": max_depth, "mode": mode, "prune_unreachable": prune_unreachable}
+
+    workers = min(workers or os.cpu_count() or 1, len(queries))
+    if workers <= 1:
+        finder = ReactionPathFinder(graph, **finder_kwargs)
+        return [_run_query(finder, q, query_kwargs) for q in queries]
+
+    chunksize = chunksize or max(1, -(-len(queries) // (workers * 4)))
+    chunks = [queries[i:i + chunksize] for i in range(0, len(queries), chunksize)]
+    results: List[QueryResult] = []
+    with SharedSpeciesGraph.publish(graph) as shared:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(shared.name, shared.layout, finder_kwargs, query_kwargs),
+        ) as pool:
+            # map() returns chunk results in submission (= input) order
+            for chunk in pool.map(_run_chunk, chunks):
+                results.extend(chunk)
+    return results
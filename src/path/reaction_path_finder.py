@@ -1,13 +1,62 @@
 # src/path/reaction_path_finder.py
-from collections import deque
-from typing import List, Optional, Iterable, Any, Dict
+import heapq
+import math
+from collections import OrderedDict, deque
+from itertools import count
+from typing import List, Optional, Iterable, Any, Dict, Callable, Tuple
 
 from src.graph.species_graph import SpeciesGraph
+from src.path.instrumentation import Instrumentation, QueryProfile, RuleStats, TraceCallback
+from src.path.rule_pipeline import RulePipeline
+from src.path.weighted_paths import yen_k_shortest
+
+
+class _PathTree:
+    """
+    Shared parent-pointer storage for partial paths.
+
+    Node i is (species[i], parent[i], reaction[i]): reaction[i] links species[i]
+    to species[parent[i]]. Extending a path appends one node instead of copying
+    the whole list; path() materializes the [species, reaction, ..., species] form.
+    """
+
+    __slots__ = ("species", "parent", "reaction", "depth")
+
+    def __init__(self):
+        self.species: List[Any] = []
+        self.parent: List[int] = []
+        self.reaction: List[Any] = []
+        self.depth: List[int] = []
+
+    def add(self, species: Any, parent: int = -1, reaction: Any = None) -> int:
+        self.species.append(species)
+        self.parent.append(parent)
+        self.reaction.append(reaction)
+        self.depth.append(0 if parent < 0 else self.depth[parent] + 1)
+        return len(self.species) - 1
+
+    def path(self, node: int, toward_root: bool = False) -> List[Any]:
+        """
+        Root -> node path (forward trees), or node -> root when toward_root=True
+        (backward trees, whose root is the target).
+        """
+        out = [self.species[node]]
+        parent = self.parent
+        while parent[node] >= 0:
+            out.append(self.reaction[node])
+            node = parent[node]
+            out.append(self.species[node])
+        if not toward_root:
+            out.reverse()
+        return out
 
 
 class ReactionPathFinder:
     """
     ReactionPathFinder: BFS-based species-level path finder with rule injection.
+    find_paths(mode="bidirectional") runs a meet-in-the-middle variant that
+    also expands backward over SpeciesGraph.in_edges; shortest_path /
+    k_shortest_paths rank routes by a pluggable per-reaction cost.
 
     - species_graph: SpeciesGraph
     - reaction_rules: iterable of objects that implement either:
@@ -19,24 +68,41 @@ class ReactionPathFinder:
         - or allow(path, reaction, graph) -> bool
         - optionally should_prune(path, reaction, graph) -> bool
 
+    Rules are compiled once into a RulePipeline (src/path/rule_pipeline.py);
+    is_applicable verdicts are memoized per reaction id for a query, or for the
+    finder's lifetime when the rule sets `pure = True`.
+
+    - instrument: record a QueryProfile per query (per-rule calls / time /
+      rejections, frontier per depth, peak queue, latency), see last_profile()
+      and rule_stats()
+    - trace: optional callback trace(event, data), see src/path/instrumentation.py
+    Both are off by default and then cost nothing.
+
     The finder will:
     1) For each candidate reaction edge, check reaction_rules to decide whether to consider it.
-    2) Build a candidate new_path (list form).
+    2) Build a candidate new_path (list form) when a rule needs to see it.
     3) Ask path_rules (and reaction_rules with should_prune) whether to prune early.
     4) If allowed, enqueue for BFS.
     """
 
+    # distance maps kept per finder, see distance_map
+    DISTANCE_CACHE_SIZE = 64
+
     def __init__(
         self,
         species_graph: SpeciesGraph,
         reaction_rules: Optional[Iterable[Any]] = None,
         path_rules: Optional[Iterable[Any]] = None,
         max_paths: int = 1000,
+        instrument: bool = False,
+        trace: Optional[TraceCallback] = None,
     ):
         self.graph = species_graph
         self.reaction_rules = list(reaction_rules) if reaction_rules else []
         self.path_rules = list(path_rules) if path_rules else []
         self.max_paths = int(max_paths)
+        self.instrument = bool(instrument)
+        self.trace = trace
 
         # statistics counters
         self._stats: Dict[str, int] = {
@@ -44,168 +110,513 @@ class ReactionPathFinder:
             "pruned_by_reaction_rule": 0,
             "pruned_by_path_rule": 0,
             "accepted": 0,
+            "joined": 0,
+            "pruned_by_distance": 0,
         }
+        # (target, limit) -> (graph version, hop distances), LRU, see distance_map
+        self._distance_cache: "OrderedDict[Tuple[str, Optional[int]], Tuple[Any, Dict[str, int]]]" = OrderedDict()
+        # compiled lazily on the first query (see _pipeline)
+        self._rules: Optional[RulePipeline] = None
+        # set while instrument / trace is enabled (see _instrumentation)
+        self._instr: Optional[Instrumentation] = None
 
-    # ---- small adapters to support different rule interfaces ----
-    def _reaction_allowed(self, path: List[str], reaction: Any) -> bool:
-        """
-        Return True if all reaction rules allow this reaction (conservative: all must allow).
-        Accept different interfaces:
-         - rule.is_applicable(reaction) -> bool
-         - rule.allow(path, reaction, graph) -> bool
-        """
-        for r in self.reaction_rules:
-            # prefer is_applicable if present
-            if hasattr(r, "is_applicable"):
-                try:
-                    ok = bool(r.is_applicable(reaction))
-                except Exception:
-                    ok = False
-            elif hasattr(r, "allow"):
-                try:
-                    ok = bool(r.allow(path, reaction, self.graph))
-                except Exception:
-                    ok = False
-            else:
-                # unknown rule interface -> conservatively allow
-                ok = True
+    # ---- compiled rule pipeline ----
+    def _pipeline(self) -> RulePipeline:
+        """
+        Return the compiled rule pipeline, recompiling only if the rule lists
+        were replaced or modified since the last query.
+        """
+        instr = self._instrumentation()
+        p = self._rules
+        if (
+            p is None
+            or p.graph is not self.graph
+            or p.instrumentation is not instr
+            or not p.matches(self.reaction_rules, self.path_rules)
+        ):
+            p = self._rules = RulePipeline(self.reaction_rules, self.path_rules, self.graph, instr)
+        return p
 
-            if not ok:
-                return False
-        return True
+    def _instrumentation(self) -> Optional[Instrumentation]:
+        """
+        The collector while instrument or trace is enabled, else None. Kept
+        across queries so rule_stats() accumulates.
+        """
+        if not self.instrument and self.trace is None:
+            return None
+        if self._instr is None:
+            self._instr = Instrumentation(self.trace)
+        self._instr.trace = self.trace
+        return self._instr
 
-    def _should_prune_by_reaction(self, path: List[str], reaction: Any) -> bool:
+    def _start_query(self, query: str, start: Any, target: Any, mode: Optional[str] = None,
+                     max_depth: Optional[int] = None) -> RulePipeline:
+        self._stats = dict.fromkeys(self._stats.keys(), 0)
+        p = self._pipeline()
+        p.reset_query()
+        if p.instrumentation is not None:
+            p.instrumentation.begin(query, start, target, mode, max_depth)
+        return p
+
+    def _end_query(self, results: List[Any]) -> List[Any]:
+        instr = self._rules.instrumentation
+        if instr is not None:
+            instr.end(results, self._stats)
+        return results
+
+    def _reaction_prefilter(self, reaction: Any) -> bool:
         """
-        Return True if any reaction_rule requests pruning via should_prune.
-        If none implement should_prune, return False.
+        Path-independent part of the reaction rules: only rules exposing
+        is_applicable(reaction) are evaluated. Used where no prefix path exists
+        yet (backward expansion, weighted search).
         """
-        pruned = False
-        for r in self.reaction_rules:
-            if hasattr(r, "should_prune"):
-                try:
-                    if bool(r.should_prune(path, reaction, self.graph)):
-                        pruned = True
-                        break
-                except Exception:
-                    # on exception be conservative and do not prune
-                    continue
-        return pruned
-
-    def _path_allowed(self, new_path: List[str], reaction: Any) -> bool:
-        """
-        Return True if all path_rules allow the path.
-        Path rule interfaces supported:
-         - rule.is_path_allowed(path) -> bool
-         - rule.allow(path, reaction, graph) -> bool
-        """
-        for r in self.path_rules:
-            if hasattr(r, "is_path_allowed"):
-                try:
-                    ok = bool(r.is_path_allowed(new_path))
-                except Exception:
-                    ok = False
-            elif hasattr(r, "allow"):
-                try:
-                    ok = bool(r.allow(new_path, reaction, self.graph))
-                except Exception:
-                    ok = False
-            else:
-                ok = True
+        return self._rules.applicable(reaction)
+
+    @staticmethod
+    def _edge_parts(edge: Any):
+        """
+        Return (reactant, reaction, product) for a SpeciesEdge or a legacy dict edge.
+        """
+        if isinstance(edge, dict):
+            return (
+                edge.get("from") or edge.get("reactant"),
+                edge.get("reaction") or edge.get("reaction_id"),
+                edge.get("to") or edge.get("product"),
+            )
+        return (
+            getattr(edge, "reactant", None),
+            getattr(edge, "reaction", None),
+            getattr(edge, "product", None),
+        )
+
+    def _try_extend(self, path: Optional[List[str]], reaction: Any, next_species: str) -> bool:
+        """
+        Run reaction rules and path rules for extending `path` by one edge.
+        Return False (and count the prune) if any rule rejects it.
+
+        `path` may be None when no rule needs it (RulePipeline.needs_path).
+        """
+        rules = self._rules
+
+        # reaction level pre-filter (is_applicable / allow), then should_prune
+        if not rules.reaction_allowed(path, reaction) or rules.reaction_pruned(path, reaction):
+            self._stats["pruned_by_reaction_rule"] += 1
+            return False
+
+        if not rules.has_path_stage:
+            return True
+
+        new_path = path + [reaction, next_species]
+
+        # path-level should_prune (early), then allow / is_path_allowed
+        if rules.path_pruned(new_path, reaction) or not rules.path_allowed(new_path, reaction):
+            self._stats["pruned_by_path_rule"] += 1
+            return False
 
-            if not ok:
-                return False
         return True
 
-    def _should_prune_by_path(self, new_path: List[str], reaction: Any) -> bool:
+    def _replay(self, path: List[str], from_step: int = 0) -> bool:
         """
-        Ask path_rules for should_prune. If none implement should_prune, returns False.
+        Re-run the rule checks for steps from_step+1 .. end of a complete path,
+        each with its own prefix, exactly as a forward search would.
         """
-        for r in self.path_rules:
-            if hasattr(r, "should_prune"):
-                try:
-                    if bool(r.should_prune(new_path, reaction, self.graph)):
-                        return True
-                except Exception:
-                    # conservative: do not prune on exceptions
-                    continue
-        return False
+        current = path[: 2 * from_step + 1]
+        for i in range(2 * from_step + 1, len(path), 2):
+            if not self._try_extend(current, path[i], path[i + 1]):
+                return False
+            current = current + [path[i], path[i + 1]]
+        return True
 
     # ---- public API ----
-    def find_paths(self, start: str, target: str, max_depth: int = 5) -> List[List[str]]:
+    def find_paths(
+        self,
+        start: str,
+        target: str,
+        max_depth: int = 5,
+        mode: str = "bfs",
+        prune_unreachable: bool = True,
+    ) -> List[List[str]]:
         """
-        BFS find paths between species names.
+        Find paths between species names.
 
         Path format: [species, reaction, species, reaction, ..., species]
         Steps = number of reactions = (len(path)-1)//2
+
+        mode:
+        - "bfs": forward breadth-first enumeration from start
+        - "astar": forward search ordered by steps + exact hop distance to target
+        - "bidirectional": meet-in-the-middle; forward half-paths over out_edges
+          and backward half-paths over in_edges are joined on a shared species.
+          Returns the same set of paths as "bfs" (ordered by length).
+
+        prune_unreachable: drop any partial path whose steps + hop distance to
+        target (see distance_map) exceeds max_depth; such paths can never yield a
+        result, so the result set is unchanged.
+
+        Partial paths live in a shared parent-pointer tree (_PathTree); list
+        paths are only built for results and for rules that inspect the path.
         """
-        self._stats = dict.fromkeys(self._stats.keys(), 0)
+        if mode not in ("bfs", "astar", "bidirectional"):
+            raise ValueError(f"unknown search mode: {mode!r}")
+        self._start_query("find_paths", start, target, mode, max_depth)
+        dist = self.distance_map(target, max_depth) if prune_unreachable or mode == "astar" else None
+        bound = dist if prune_unreachable else None
+
+        if mode == "bidirectional":
+            results = self._find_paths_bidirectional(start, target, max_depth, bound)
+        else:
+            results = self._find_paths_forward(start, target, max_depth, bound, dist if mode == "astar" else None)
+        return self._end_query(results)
+
+    def find_paths_many(
+        self,
+        queries: Iterable[Tuple[str, str]],
+        workers: Optional[int] = None,
+        max_depth: int = 5,
+        mode: str = "bfs",
+        prune_unreachable: bool = True,
+        chunksize: Optional[int] = None,
+    ) -> List[Tuple[List[List[str]], Dict[str, int]]]:
+        """
+        find_paths for many (start, target) pairs on a process pool sharing
+        the frozen graph through shared memory (src/path/parallel_paths.py).
+        Returns [(paths, stats)] in input order. Rules must be picklable.
+        """
+        from src.path.parallel_paths import find_paths_many
+
+        return find_paths_many(
+            self.graph, queries, workers=workers, max_depth=max_depth, mode=mode,
+            prune_unreachable=prune_unreachable, reaction_rules=self.reaction_rules,
+            path_rules=self.path_rules, max_paths=self.max_paths, chunksize=chunksize,
+        )
 
+    def distance_map(self, target: str, limit: Optional[int] = None) -> Dict[str, int]:
+        """
+        Exact hop distance to `target` from every species that can reach it
+        in at most `limit` steps (reverse BFS over in_edges, rules ignored;
+        limit=None: no bound). Species absent from the map are farther away
+        or cannot reach it. find_paths passes max_depth as the limit, so a
+        query only walks the ancestors it could use.
+
+        Cached per (target, limit) until the graph changes; the cache keeps
+        the DISTANCE_CACHE_SIZE most recently used maps.
+        """
+        version = getattr(self.graph, "version", None)
+        cache_key = (target, limit)
+        cached = self._distance_cache.get(cache_key)
+        if cached is not None and cached[0] == version:
+            self._distance_cache.move_to_end(cache_key)
+            return cached[1]
+
+        dist = {target: 0}
+        frontier = [target]
+        depth = 0
+        while frontier and (limit is None or depth < limit):
+            depth += 1
+            nxt = []
+            for species in frontier:
+                d = dist[species] + 1
+                for edge in self.graph.in_edges(species):
+                    prev_species = self._edge_parts(edge)[0]
+                    if prev_species is not None and prev_species not in dist:
+                        dist[prev_species] = d
+                        nxt.append(prev_species)
+            frontier = nxt
+
+        self._distance_cache[cache_key] = (version, dist)
+        self._distance_cache.move_to_end(cache_key)
+        while len(self._distance_cache) > self.DISTANCE_CACHE_SIZE:
+            self._distance_cache.popitem(last=False)
+        return dist
+
+    def _find_paths_forward(
+        self,
+        start: str,
+        target: str,
+        max_depth: int,
+        bound: Optional[Dict[str, int]],
+        heuristic: Optional[Dict[str, int]],
+    ) -> List[List[str]]:
+        """
+        Forward enumeration. With heuristic=None this is plain BFS (FIFO);
+        otherwise nodes are expanded in order of steps + heuristic[species]
+        (A*, ties broken by insertion order).
+        """
+        needs_path = self._rules.needs_path
+        tree = _PathTree()
         results: List[List[str]] = []
-        queue = deque()
-        queue.append((start, [start]))
+        if heuristic is None:
+            queue = deque()
+            push, pop = queue.append, queue.popleft
+        else:
+            queue = []
+            order = count()
 
-        while queue:
-            current, path = queue.popleft()
+            def push(node):
+                f = tree.depth[node] + heuristic.get(tree.species[node], max_depth + 1)
+                heapq.heappush(queue, (f, next(order), node))
 
-            # pruning by depth
-            steps = (len(path) - 1) // 2
-            if steps > max_depth:
-                continue
+            def pop():
+                return heapq.heappop(queue)[2]
+
+        instr = self._rules.instrumentation
+        if instr is not None:
+            push = instr.track_queue(push, queue)
+
+        push(tree.add(start))
+
+        while queue:
+            node = pop()
+            current = tree.species[node]
+            steps = tree.depth[node]
 
             # matched target (non-trivial path)
             if current == target and steps > 0:
-                results.append(path)
+                results.append(tree.path(node))
                 # optionally stop early if enough found
                 if len(results) >= self.max_paths:
                     break
                 # do not expand this target node further
                 continue
 
+            path = tree.path(node) if needs_path else None
+
             # expand outgoing edges
             for edge in self.graph.out_edges(current):
                 self._stats["expanded"] += 1
 
-                # edge may be SpeciesEdge or dict-like
-                reaction = getattr(edge, "reaction", None) or edge.get("reaction") if isinstance(edge, dict) else None
-                next_species = getattr(edge, "product", None) or edge.get("to") if isinstance(edge, dict) else None
-
+                _, reaction, next_species = self._edge_parts(edge)
                 if next_species is None:
                     continue
 
-                # reaction level pre-filter (is_applicable / allow)
-                if not self._reaction_allowed(path, reaction):
-                    self._stats["pruned_by_reaction_rule"] += 1
+                if bound is not None and steps + 1 + bound.get(next_species, max_depth + 1) > max_depth:
+                    self._stats["pruned_by_distance"] += 1
                     continue
 
-                # optional reaction-level should_prune (early)
-                if self._should_prune_by_reaction(path, reaction):
-                    self._stats["pruned_by_reaction_rule"] += 1
+                if not self._try_extend(path, reaction, next_species):
                     continue
 
-                new_path = path + [reaction, next_species]
+                # passed all checks -> accept; children beyond max_depth are never expanded
+                self._stats["accepted"] += 1
+                if steps < max_depth:
+                    push(tree.add(next_species, node, reaction))
+
+        if instr is not None:
+            # every tree node was enqueued once: frontier[d] = nodes at depth d
+            frontier = [0] * (max(tree.depth) + 1)
+            for d in tree.depth:
+                frontier[d] += 1
+            instr.current.frontier = frontier
+        return results
 
-                # path-level should_prune (early)
-                if self._should_prune_by_path(new_path, reaction):
-                    self._stats["pruned_by_path_rule"] += 1
+    def _find_paths_bidirectional(
+        self,
+        start: str,
+        target: str,
+        max_depth: int,
+        bound: Optional[Dict[str, int]] = None,
+    ) -> List[List[str]]:
+        """
+        A path of L steps is produced exactly once, as the join of a forward
+        prefix with ceil(L/2) steps and a backward suffix with floor(L/2) steps.
+        Forward prefixes are checked against all rules while they grow; the
+        suffix steps of each joined path are replayed through the same checks
+        (with the full prefix), so rule semantics match the BFS mode.
+        """
+        if max_depth < 1:
+            return []
+        fwd_depth = (max_depth + 1) // 2
+        bwd_depth = max_depth // 2
+        needs_path = self._rules.needs_path
+
+        # forward[k]: tree nodes of accepted prefixes with k steps starting at `start`
+        fwd = _PathTree()
+        forward: List[List[int]] = [[fwd.add(start)]]
+        for k in range(1, fwd_depth + 1):
+            layer = []
+            for node in forward[k - 1]:
+                current = fwd.species[node]
+                # like BFS, a prefix that already reached the target stops there
+                if k > 1 and current == target:
                     continue
+                path = fwd.path(node) if needs_path else None
+                for edge in self.graph.out_edges(current):
+                    self._stats["expanded"] += 1
+                    _, reaction, next_species = self._edge_parts(edge)
+                    if next_species is None:
+                        continue
+                    if bound is not None and k + bound.get(next_species, max_depth + 1) > max_depth:
+                        self._stats["pruned_by_distance"] += 1
+                        continue
+                    if not self._try_extend(path, reaction, next_species):
+                        continue
+                    self._stats["accepted"] += 1
+                    layer.append(fwd.add(next_species, node, reaction))
+            forward.append(layer)
+
+        # backward[k]: species -> tree nodes of suffixes [species, reaction, ..., target]
+        # with k steps. Interior species of a path are never the target, so neither is
+        # a suffix head.
+        bwd = _PathTree()
+        backward: List[Dict[str, List[int]]] = [{target: [bwd.add(target)]}]
+        for k in range(1, bwd_depth + 1):
+            layer: Dict[str, List[int]] = {}
+            for nodes in backward[k - 1].values():
+                for node in nodes:
+                    for edge in self.graph.in_edges(bwd.species[node]):
+                        self._stats["expanded"] += 1
+                        prev_species, reaction, _ = self._edge_parts(edge)
+                        if prev_species is None or prev_species == target:
+                            continue
+                        if not self._reaction_prefilter(reaction):
+                            self._stats["pruned_by_reaction_rule"] += 1
+                            continue
+                        self._stats["accepted"] += 1
+                        layer.setdefault(prev_species, []).append(bwd.add(prev_species, node, reaction))
+            backward.append(layer)
+
+        instr = self._rules.instrumentation
+        if instr is not None:
+            profile = instr.current
+            profile.frontier = [len(layer) for layer in forward]
+            profile.backward_frontier = [sum(map(len, layer.values())) for layer in backward]
+            profile.peak_queue = max(profile.frontier + profile.backward_frontier)
 
-                # path-level allow / is_path_allowed
-                if not self._path_allowed(new_path, reaction):
-                    self._stats["pruned_by_path_rule"] += 1
+        results: List[List[str]] = []
+        for length in range(1, max_depth + 1):
+            f = (length + 1) // 2
+            b = length - f
+            for node in forward[f]:
+                meet = fwd.species[node]
+                if b == 0:
+                    if meet == target:
+                        results.append(fwd.path(node))
+                        if len(results) >= self.max_paths:
+                            return results
+                    continue
+                suffix_nodes = backward[b].get(meet)
+                if not suffix_nodes:
                     continue
+                prefix = fwd.path(node)
+                for suffix_node in suffix_nodes:
+                    self._stats["joined"] += 1
+                    path = prefix + bwd.path(suffix_node, toward_root=True)[1:]
+                    if not self._replay(path, from_step=f):
+                        continue
+                    results.append(path)
+                    if len(results) >= self.max_paths:
+                        return results
+        return results
 
-                # passed all checks -> accept
-                self._stats["accepted"] += 1
-                queue.append((next_species, new_path))
+    # ---- weighted search ----
+    def _weighted_neighbors(self, cost: Callable[[Any], float]):
+        """
+        neighbors(species) -> [(reaction, next_species, cost)] for the weighted
+        search. Reactions failing path-independent rules are dropped; costs are
+        computed once per reaction and neighbour lists once per species.
+        """
+        get_reaction = getattr(self.graph, "get_reaction", None)
+        reaction_cost: Dict[Any, float] = {}
+        adjacency: Dict[Any, List[Tuple[Any, Any, float]]] = {}
 
-                # safety cap
-                if len(results) >= self.max_paths:
+        def cost_of(reaction):
+            c = reaction_cost.get(reaction)
+            if c is not None:
+                return c
+            if not self._reaction_prefilter(reaction):
+                self._stats["pruned_by_reaction_rule"] += 1
+                c = math.inf
+            else:
+                obj = get_reaction(reaction) if get_reaction is not None else None
+                value = cost(obj if obj is not None else reaction)
+                c = math.inf if value is None else float(value)
+                if c < 0 or math.isnan(c):
+                    raise ValueError(f"edge cost must be non-negative, got {value!r} for {reaction!r}")
+            reaction_cost[reaction] = c
+            return c
+
+        def neighbors(species):
+            out = adjacency.get(species)
+            if out is None:
+                out = []
+                for edge in self.graph.out_edges(species):
+                    _, reaction, next_species = self._edge_parts(edge)
+                    if next_species is None:
+                        continue
+                    c = cost_of(reaction)
+                    if c != math.inf:
+                        out.append((reaction, next_species, c))
+                adjacency[species] = out
+            return out
+
+        return neighbors
+
+    def _count_expanded(self):
+        self._stats["expanded"] += 1
+
+    def k_shortest_paths(
+        self,
+        start: str,
+        target: str,
+        k: int,
+        cost: Optional[Callable[[Any], float]] = None,
+    ) -> List[Tuple[float, List[str]]]:
+        """
+        The k cheapest loopless paths from start to target as (cost, path),
+        cheapest first (Dijkstra + Yen's algorithm).
+
+        cost(reaction) -> float gives the non-negative weight of every edge
+        projected from a reaction; it receives the Reaction object when the
+        graph knows it (SpeciesGraph.get_reaction) and the reaction key
+        otherwise. None / inf means "not traversable". Default: 1 per step.
+
+        Reaction rules with is_applicable filter edges up front; every
+        candidate path is then replayed through all reaction and path rules
+        and skipped if rejected. At most max_paths candidates are examined.
+        """
+        from src.path.costs import unit_cost
+
+        self._start_query("k_shortest_paths", start, target)
+        if k < 1:
+            return self._end_query([])
+        neighbors = self._weighted_neighbors(cost or unit_cost)
+
+        results: List[Tuple[float, List[str]]] = []
+        examined = 0
+        for total, path in yen_k_shortest(neighbors, start, target, on_relax=self._count_expanded):
+            examined += 1
+            if self._replay(path):
+                self._stats["accepted"] += 1
+                results.append((total, path))
+                if len(results) >= k:
                     break
+            if examined >= self.max_paths:
+                break
+        return self._end_query(results)
 
-        return results
+    def shortest_path(
+        self,
+        start: str,
+        target: str,
+        cost: Optional[Callable[[Any], float]] = None,
+    ) -> Optional[Tuple[float, List[str]]]:
+        """
+        Cheapest path from start to target as (cost, path), or None.
+        See k_shortest_paths for the cost function and rule handling.
+        """
+        found = self.k_shortest_paths(start, target, 1, cost=cost)
+        return found[0] if found else None
 
     def stats(self) -> Dict[str, int]:
         """
         Return counters to inspect pruning effectiveness.
         """
         return dict(self._stats)
+
+    def last_profile(self) -> Optional[QueryProfile]:
+        """QueryProfile of the most recent query run with instrument / trace enabled."""
+        return self._instr.last if self._instr is not None else None
+
+    def rule_stats(self) -> List[RuleStats]:
+        """Per-rule counters accumulated over all instrumented queries."""
+        return self._instr.totals() if self._instr is not None else []
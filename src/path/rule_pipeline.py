@@ -0,0 +1,171 @@
+# src/path/rule_pipeline.py
+"""
+Compiled rule pipeline for ReactionPathFinder.
+
+The finder accepts rules with several duck-typed interfaces (is_applicable,
+allow, should_prune, is_path_allowed). Instead of probing every rule with
+hasattr() on every edge, RulePipeline resolves the interfaces once into flat
+lists of bound methods, and memoizes path-independent verdicts
+(is_applicable) per reaction id:
+
+- rules declaring `pure = True` are cached for the lifetime of the pipeline
+  (i.e. across queries of the same finder)
+- other is_applicable rules are cached for one query (reset_query())
+
+Exceptions inside a rule keep the historical semantics: a failing check
+rejects, a failing should_prune does not prune.
+
+With an Instrumentation (src/path/instrumentation.py) every compiled method
+is replaced by a timed wrapper at compile time; without one the lists hold
+the plain bound methods.
+"""
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from src.path.instrumentation import APPLICABLE, PATH_ALLOW, PATH_PRUNE, REACTION_ALLOW, REACTION_PRUNE
+
+
+def _applicable_all(checks: Sequence[Callable[[Any], Any]], reaction: Any) -> bool:
+    for check in checks:
+        try:
+            if not check(reaction):
+                return False
+        except Exception:
+            return False
+    return True
+
+
+class RulePipeline:
+    def __init__(
+        self,
+        reaction_rules: Sequence[Any],
+        path_rules: Sequence[Any],
+        graph: Any,
+        instrumentation: Optional[Any] = None,
+    ):
+        self.graph = graph
+        self.source = (tuple(reaction_rules), tuple(path_rules))
+        self.instrumentation = instrumentation
+        if instrumentation is not None:
+            instrumentation.clear_rules()
+            hook = instrumentation.wrap
+        else:
+            def hook(rule, stage, fn, reaction_arg):
+                return fn
+
+        # reaction stage
+        self.pure_applicable: List[Callable[[Any], Any]] = []
+        self.query_applicable: List[Callable[[Any], Any]] = []
+        self.reaction_allow: List[Callable[[Any, Any, Any], Any]] = []
+        self.reaction_prune: List[Callable[[Any, Any, Any], Any]] = []
+        for r in reaction_rules:
+            # prefer is_applicable if present (same precedence as before)
+            if hasattr(r, "is_applicable"):
+                fn = hook(r, APPLICABLE, r.is_applicable, 0)
+                if getattr(r, "pure", False):
+                    self.pure_applicable.append(fn)
+                else:
+                    self.query_applicable.append(fn)
+            elif hasattr(r, "allow"):
+                self.reaction_allow.append(hook(r, REACTION_ALLOW, r.allow, 1))
+            # unknown rule interface -> conservatively allow
+            if hasattr(r, "should_prune"):
+                self.reaction_prune.append(hook(r, REACTION_PRUNE, r.should_prune, 1))
+
+        # path stage: ("path", is_path_allowed) or ("allow", allow)
+        self.path_prune: List[Callable[[Any, Any, Any], Any]] = []
+        self.path_checks: List[Callable[[Any, Any], Any]] = []
+        for r in path_rules:
+            if hasattr(r, "should_prune"):
+                self.path_prune.append(hook(r, PATH_PRUNE, r.should_prune, 1))
+            if hasattr(r, "is_path_allowed"):
+                fn = r.is_path_allowed
+                check = lambda path, reaction, fn=fn: fn(path)
+            elif hasattr(r, "allow"):
+                fn = r.allow
+                check = lambda path, reaction, fn=fn, g=graph: fn(path, reaction, g)
+            else:
+                continue
+            self.path_checks.append(hook(r, PATH_ALLOW, check, 1))
+
+        self.has_path_stage = bool(path_rules)
+        self.needs_path = bool(path_rules or self.reaction_allow or self.reaction_prune)
+
+        self._pure_cache: Dict[Any, bool] = {}
+        self._query_cache: Dict[Any, bool] = {}
+
+    def matches(self, reaction_rules: Sequence[Any], path_rules: Sequence[Any]) -> bool:
+        """True if this pipeline was compiled from exactly these rule objects."""
+        src_r, src_p = self.source
+        return (
+            len(src_r) == len(reaction_rules)
+            and len(src_p) == len(path_rules)
+            and all(a is b for a, b in zip(src_r, reaction_rules))
+            and all(a is b for a, b in zip(src_p, path_rules))
+        )
+
+    def reset_query(self):
+        self._query_cache.clear()
+
+    # ---------- reaction stage ----------
+
+    def applicable(self, reaction: Any) -> bool:
+        """
+        Memoized AND of all is_applicable rules for one reaction id.
+        """
+        if self.pure_applicable:
+            ok = self._pure_cache.get(reaction)
+            if ok is None:
+                ok = self._pure_cache[reaction] = _applicable_all(self.pure_applicable, reaction)
+            if not ok:
+                return False
+        if self.query_applicable:
+            ok = self._query_cache.get(reaction)
+            if ok is None:
+                ok = self._query_cache[reaction] = _applicable_all(self.query_applicable, reaction)
+            if not ok:
+                return False
+        return True
+
+    def reaction_allowed(self, path: Optional[List[Any]], reaction: Any) -> bool:
+        if not self.applicable(reaction):
+            return False
+        graph = self.graph
+        for allow in self.reaction_allow:
+            try:
+                if not allow(path, reaction, graph):
+                    return False
+            except Exception:
+                return False
+        return True
+
+    def reaction_pruned(self, path: Optional[List[Any]], reaction: Any) -> bool:
+        graph = self.graph
+        for prune in self.reaction_prune:
+            try:
+                if prune(path, reaction, graph):
+                    return True
+            except Exception:
+                # on exception be conservative and do not prune
+                continue
+        return False
+
+    # ---------- path stage ----------
+
+    def path_pruned(self, new_path: List[Any], reaction: Any) -> bool:
+        graph = self.graph
+        for prune in self.path_prune:
+            try:
+                if prune(new_path, reaction, graph):
+                    return True
+            except Exception:
+                continue
+        return False
+
+    def path_allowed(self, new_path: List[Any], reaction: Any) -> bool:
+        for check in self.path_checks:
+            try:
+                if not check(new_path, reaction):
+                    return False
+            except Exception:
+                return False
+        return True
@@ -0,0 +1,128 @@
+# src/path/weighted_paths.py
+"""
+Weighted shortest paths on a species-level multigraph.
+
+Edges are (species, reaction, species) triples with a non-negative cost.
+dijkstra() finds one cheapest path; yen_k_shortest() yields loopless paths
+in order of increasing cost (Yen's algorithm, one Dijkstra per spur node).
+Paths use the finder format [species, reaction, species, ..., species].
+"""
+import heapq
+import itertools
+import math
+from typing import Any, Callable, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+
+# neighbors(species) -> iterable of (reaction, next_species, cost)
+Neighbors = Callable[[Any], Iterable[Tuple[Any, Any, float]]]
+
+
+def dijkstra(
+    neighbors: Neighbors,
+    source: Any,
+    target: Any,
+    banned_edges: FrozenSet[Tuple[Any, Any, Any]] = frozenset(),
+    banned_nodes: FrozenSet[Any] = frozenset(),
+    on_relax: Optional[Callable[[], None]] = None,
+) -> Optional[Tuple[float, List[Any]]]:
+    """
+    Cheapest source -> target path avoiding banned (u, reaction, v) edges and
+    banned species. Returns (cost, path) or None if target is unreachable.
+    """
+    dist = {source: 0.0}
+    pred = {}
+    counter = itertools.count()
+    heap = [(0.0, next(counter), source)]
+    done: Set[Any] = set()
+
+    while heap:
+        d, _, u = heapq.heappop(heap)
+        if u in done:
+            continue
+        if u == target:
+            path = [u]
+            while u in pred:
+                u, reaction = pred[u]
+                path.append(reaction)
+                path.append(u)
+            path.reverse()
+            return d, path
+        done.add(u)
+        for reaction, v, cost in neighbors(u):
+            if on_relax is not None:
+                on_relax()
+            if v in banned_nodes or v in done or (u, reaction, v) in banned_edges:
+                continue
+            nd = d + cost
+            if nd < dist.get(v, math.inf):
+                dist[v] = nd
+                pred[v] = (u, reaction)
+                heapq.heappush(heap, (nd, next(counter), v))
+    return None
+
+
+def _edges_of(path: List[Any]):
+    return [(path[i], path[i + 1], path[i + 2]) for i in range(0, len(path) - 2, 2)]
+
+
+def yen_k_shortest(
+    neighbors: Neighbors,
+    source: Any,
+    target: Any,
+    on_relax: Optional[Callable[[], None]] = None,
+) -> Iterator[Tuple[float, List[Any]]]:
+    """
+    Lazily yield loopless source -> target paths by increasing cost.
+    The caller decides how many to take.
+    """
+    if source == target:
+        return
+    first = dijkstra(neighbors, source, target, on_relax=on_relax)
+    if first is None:
+        return
+
+    edge_cost = {}
+
+    def path_cost(path, upto):
+        total = 0.0
+        for u, r, v in _edges_of(path[:upto]):
+            total += edge_cost[(u, r, v)]
+        return total
+
+    def remember(path):
+        for u, r, v in _edges_of(path):
+            if (u, r, v) not in edge_cost:
+                for rr, vv, c in neighbors(u):
+                    if rr == r and vv == v:
+                        edge_cost[(u, r, v)] = c
+                        break
+
+    accepted: List[List[Any]] = []
+    seen = {tuple(first[1])}
+    counter = itertools.count()
+    candidates = [(first[0], next(counter), first[1])]
+
+    while candidates:
+        cost, _, path = heapq.heappop(candidates)
+        accepted.append(path)
+        remember(path)
+        yield cost, path
+
+        # spur from every species of the last accepted path except the target
+        for i in range(0, len(path) - 1, 2):
+            spur = path[i]
+            root = path[: i + 1]
+            banned_edges = set()
+            for p in accepted:
+                if len(p) > i + 2 and p[: i + 1] == root:
+                    banned_edges.add((p[i], p[i + 1], p[i + 2]))
+            banned_nodes = frozenset(root[:-1:2])
+            found = dijkstra(neighbors, spur, target, frozenset(banned_edges), banned_nodes, on_relax=on_relax)
+            if found is None:
+                continue
+            spur_cost, spur_path = found
+            total = root[:-1] + spur_path
+            key = tuple(total)
+            if key in seen:
+                continue
+            seen.add(key)
+            heapq.heappush(candidates, (path_cost(path, i + 1) + spur_cost, next(counter), total))
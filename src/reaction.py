@@ -7,13 +7,19 @@ import hashlib
 from collections import Counter
 from .molecule import Molecule
 from collections import defaultdict
-from typing import List, Dict
-from src.signature.reaction_signature import ReactionSignature
+from typing import TYPE_CHECKING, List, Dict
+
+if TYPE_CHECKING:
+    from src.signature.reaction_signature import ReactionSignature
 
 class Reaction:
     """
     语义级别的 Reaction 抽象（非物理求解器）。
     只负责表示反应（反应物 / 产物 / 条件 / 元数据）及提供数据落盘钩子。
+
+    signature() / identity() / canonical_key() 的结果会被缓存，缓存以各分子的
+    revision 为准：替换 reactants / products 或通过 Molecule.add_atom 修改原子后
+    自动重新计算。
     """
 
     def __init__(
@@ -35,8 +41,31 @@ class Reaction:
         self.metadata = metadata or {}
         # 自动记录创建时间（UTC ISO 格式）
         self.created_at = datetime.utcnow().isoformat() + "Z"
+        # (molecule tokens, ReactionSignature, ReactionIdentity)
+        self._identity_cache = None
+
+    def _molecule_tokens(self):
+        return (
+            tuple(m._token() for m in self.reactants),
+            tuple(m._token() for m in self.products),
+        )
 
-    def signature(self) -> ReactionSignature:
+    def _cached_identity(self):
+        tokens = self._molecule_tokens()
+        cache = self._identity_cache
+        if cache is None or cache[0] != tokens:
+            sig = self._build_signature()
+            cache = (tokens, sig, sig.identity())
+            self._identity_cache = cache
+        return cache
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # molecules were re-stamped on unpickling; keep the computed identity valid
+        if self.__dict__.get("_identity_cache") is not None:
+            self._identity_cache = (self._molecule_tokens(),) + self._identity_cache[1:]
+
+    def signature(self) -> "ReactionSignature":
         """
         Return the canonical ReactionSignature for this reaction.
 
@@ -44,6 +73,12 @@ class Reaction:
         - Each molecule is represented by its empirical formula string
         - Reactants and products are order-invariant
         """
+        return self._cached_identity()[1]
+
+    def _build_signature(self) -> "ReactionSignature":
+        # 延迟导入：只用 Molecule / Reaction 数据结构的进程不加载 signature / identity 链
+        from src.signature.reaction_signature import ReactionSignature
+
         reactant_forms = tuple(
             m.formula for m in self.reactants
         )
@@ -56,6 +91,29 @@ class Reaction:
             products=product_forms,
         )
 
+    def reactant_formulae(self) -> List[Dict[str, int]]:
+        """
+        每个反应物的元素计数（Molecule.element_counts）。
+        """
+        return [m.element_counts() for m in self.reactants]
+
+    def product_formulae(self) -> List[Dict[str, int]]:
+        return [m.element_counts() for m in self.products]
+
+    def element_difference(self) -> Dict[str, int]:
+        """
+        产物减反应物的元素差值，只保留非零项；空字典表示元素守恒。
+        """
+        diff: Counter = Counter()
+        for counts in self.product_formulae():
+            diff.update(counts)
+        for counts in self.reactant_formulae():
+            diff.subtract(counts)
+        return {el: n for el, n in sorted(diff.items()) if n != 0}
+
+    def is_balanced(self) -> bool:
+        return not self.element_difference()
+
     def canonical_key(self) -> str:
         """
         Backward-compatible canonical key accessor.
@@ -122,14 +180,21 @@ class Reaction:
             "created_at": self.created_at,
         }
 
-    def log(self, sink: Optional[str] = None) -> str:
+    def log(self, sink: Optional[str] = None, writer=None) -> str:
         """
         将该 Reaction 的 as_dict() 以一行 JSON（JSONL）追加写入 sink（文件路径）。
         默认 sink： ./data/reactions.jsonl （项目相对路径）
         返回写入的文件路径。
 
+        批量写入时传入 writer（src.io.reaction_log_writer.ReactionLogWriter），
+        记录进入其缓冲区并按批落盘，避免每条记录一次 open/close；此时忽略 sink。
+
         注意：data/ 目录默认在 .gitignore 中被忽略，用于存放原始数据。
         """
+        if writer is not None:
+            writer.write(self.as_dict())
+            return str(writer.path)
+
         if sink is None:
             sink = os.path.join(os.getcwd(), "data", "reactions.jsonl")
 
@@ -164,7 +229,7 @@ class Reaction:
         """
         Return the ReactionIdentity for this reaction.
         """
-        return self.signature().identity()
+        return self._cached_identity()[2]
 
     def __eq__(self, other):
         if not isinstance(other, Reaction):
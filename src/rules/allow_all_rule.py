@@ -2,5 +2,7 @@ from src.rules.reaction_rule import ReactionRule
 
 
 class AllowAllRule(ReactionRule):
+    pure = True
+
     def is_applicable(self, reaction) -> bool:
         return True
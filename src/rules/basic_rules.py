@@ -6,5 +6,7 @@ class NonEmptyReactionRule(ReactionRule):
     Reject reactions with empty reactants or products.
     """
 
+    pure = True
+
     def is_applicable(self, reaction):
         return bool(reaction.reactants) and bool(reaction.products)
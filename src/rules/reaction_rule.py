@@ -2,6 +2,10 @@ from abc import ABC, abstractmethod
 
 
 class ReactionRule(ABC):
+    # True if is_applicable depends only on the reaction (no external state);
+    # ReactionPathFinder then caches its verdicts across queries.
+    pure = False
+
     @abstractmethod
     def is_applicable(self, reaction) -> bool:
         """
@@ -54,6 +54,11 @@ class CompositeRule(PathRule):
         self.rules = list(rules)
         self.mode = mode
 
+    @property
+    def pure(self) -> bool:
+        """Reaction-level verdicts are cacheable only if every child's are."""
+        return all(getattr(r, "pure", False) for r in self.rules)
+
     # ---------- Path-level API ----------
     def is_path_allowed(self, path) -> bool:
         """Return True if path is allowed by composite of child rules."""
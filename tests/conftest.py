@@ -7,3 +7,102 @@ ROOT = Path(__file__).resolve().parent.parent
 ROOT_STR = str(ROOT)
 if ROOT_STR not in sys.path:
     sys.path.insert(0, ROOT_STR)
+
+import pytest
+
+
+def _mol(*atoms, name=None):
+    from src.atom import Atom
+    from src.molecule import Molecule
+
+    return Molecule(
+        atoms=[Atom(atomic_number=z, symbol=s, position=p) for z, s, p in atoms],
+        metadata={"name": name} if name else {},
+    )
+
+
+def make_h2():
+    return _mol((1, "H", (0.0, 0.0, 0.0)), (1, "H", (0.74, 0.0, 0.0)), name="H2")
+
+
+def make_o2():
+    return _mol((8, "O", (0.0, 0.0, 0.0)), (8, "O", (1.21, 0.0, 0.0)), name="O2")
+
+
+def make_h2o():
+    return _mol(
+        (8, "O", (0.0, 0.0, 0.0)),
+        (1, "H", (0.96, 0.0, 0.0)),
+        (1, "H", (-0.24, 0.93, 0.0)),
+        name="H2O",
+    )
+
+
+@pytest.fixture
+def sample_reactions():
+    """
+    Small mixed set: a duplicated H2 -> H2 reaction plus water formation / splitting.
+    """
+    from src.reaction import Reaction
+
+    return [
+        Reaction(reactants=[make_h2()], products=[make_h2()], metadata={"source": "a"}),
+        Reaction(reactants=[make_h2(), make_o2()], products=[make_h2o()], conditions={"temperature_K": 350.0, "solvent": "water"}),
+        Reaction(reactants=[make_h2()], products=[make_h2()], metadata={"source": "b"}),
+        Reaction(reactants=[make_h2o()], products=[make_h2(), make_o2()], conditions={"temperature_K": 500.0}),
+    ]
+
+
+@pytest.fixture
+def reactions_jsonl(tmp_path, sample_reactions):
+    path = tmp_path / "reactions.jsonl"
+    for r in sample_reactions:
+        r.log(sink=str(path))
+    return path
+
+
+@pytest.fixture
+def random_reactions():
+    """
+    Builder for a small random network: random_reactions(n_species, n_reactions,
+    elements=..., seed=...) -> (species, reactions). Every reaction has a
+    temperature_K condition; about a tenth repeat an earlier reaction.
+    """
+    import random
+
+    from src.atom import Atom
+    from src.molecule import Molecule
+    from src.reaction import Reaction
+
+    numbers = {"H": 1, "C": 6, "N": 7, "O": 8, "S": 16}
+
+    def build(n_species, n_reactions, elements=("C", "H", "O", "N"), seed=0):
+        rng = random.Random(seed)
+        species, seen = [], set()
+        while len(species) < n_species:
+            symbols = [rng.choice(elements) for _ in range(rng.randint(2, 8))]
+            m = Molecule(atoms=[
+                Atom(atomic_number=numbers[s], symbol=s, position=(float(i), 0.0, 0.0))
+                for i, s in enumerate(symbols)
+            ])
+            if m.formula not in seen:
+                seen.add(m.formula)
+                species.append(m)
+
+        reactions = []
+        for i in range(n_reactions):
+            if reactions and rng.random() < 0.1:
+                src = rng.choice(reactions)
+                reactants, products = list(src.reactants), list(src.products)
+            else:
+                reactants = rng.sample(species, rng.randint(1, 2))
+                products = rng.sample(species, rng.randint(1, 2))
+            reactions.append(Reaction(
+                reactants=reactants,
+                products=products,
+                conditions={"temperature_K": round(rng.uniform(250, 900), 1)},
+                metadata={"index": i},
+            ))
+        return species, reactions
+
+    return build
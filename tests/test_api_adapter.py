@@ -31,3 +31,65 @@ def test_duplicate_index(tmp_path, monkeypatch):
     assert not is_duplicate(h)
     register_hash(h)
     assert is_duplicate(h)
+
+
+def test_canonical_hash_v2_is_invariant_and_versioned():
+    from src.atom import Atom
+    from src.molecule import Molecule
+
+    def water(order=(0, 1, 2), zero=0.0):
+        atoms = [Atom(8, "O", (zero, 0.0, 0.0)), Atom(1, "H", (0.96, 0.0, 0.0)), Atom(1, "H", (-0.24, 0.93, 0.0))]
+        return Molecule([atoms[i] for i in order], metadata={"name": "H2O"})
+
+    def hydrogen():
+        return Molecule([Atom(1, "H", (0.0, 0.0, 0.0)), Atom(1, "H", (0.74, 0.0, 0.0))])
+
+    r = Reaction([water(), hydrogen()], [water()], conditions={"temperature_K": 298, "solvent": "water"})
+    h2 = reaction_to_canonical_hash(r, version=2)
+    assert len(h2) == 64 and h2 != reaction_to_canonical_hash(r, version=1)
+
+    # atom order, molecule order, storage mode, -0.0 and dict key order do not matter
+    same = Reaction(
+        [hydrogen().to_columnar(), water(order=(2, 0, 1), zero=-0.0)],
+        [water(order=(1, 2, 0))],
+        conditions={"solvent": "water", "temperature_K": 298},
+    )
+    assert reaction_to_canonical_hash(same, version=2) == h2
+
+    # conditions and molecule metadata are part of the hash
+    assert reaction_to_canonical_hash(Reaction([water(), hydrogen()], [water()]), version=2) != h2
+    tagged = water()
+    tagged.metadata["name"] = "water"
+    assert reaction_to_canonical_hash(Reaction([tagged, hydrogen()], [water()], conditions=r.conditions), version=2) != h2
+
+    # the binary layout is frozen: this value must never change for v2
+    assert h2 == "d47cc8b87f80b707b690d72c516c58d4452e9312ee24c4bb562c02f097c2f247"
+
+
+def test_each_hash_version_has_its_own_bloom_filter(tmp_path, monkeypatch):
+    import hashlib
+    from src.io import api_adapter
+    from src.io.hash_store import HashStore
+
+    monkeypatch.setattr(api_adapter, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(api_adapter, "HASH_STORE_DIR", tmp_path / "reactions_index.hashset")
+    monkeypatch.setattr(api_adapter, "BLOOM_FILE", tmp_path / "reactions_index.bloom")
+    monkeypatch.setattr(api_adapter, "INDEX_FILE", tmp_path / "reactions_index.txt")
+    monkeypatch.setattr(api_adapter, "_store", None)
+    v1 = [hashlib.sha256(b"v1-%d" % i).hexdigest() for i in range(50)]
+    v2 = [hashlib.sha256(b"v2-%d" % i).hexdigest() for i in range(50)]
+
+    api_adapter.open_store()
+    for h in v1:
+        register_hash(h)
+    api_adapter.close_store()
+    # same number of records as the v1 store, as after rebuild_index(2)
+    with HashStore(api_adapter.hash_store_dir(2)) as store:
+        store.update(v2)
+
+    monkeypatch.setattr(api_adapter, "HASH_VERSION", 2)
+    assert api_adapter.bloom_file_for(2) != api_adapter.bloom_file_for(1)
+    assert all(is_duplicate(h) for h in v2)
+    assert not is_duplicate(v1[0])
+    api_adapter.close_store()
+    assert api_adapter.bloom_file_for(2).exists() and api_adapter.bloom_file_for(1).exists()
@@ -0,0 +1,115 @@
+# tests/test_batch_ingest.py
+import json
+
+import pytest
+
+from src.io import api_adapter
+from src.io.batch_ingest import BackgroundReactionWriter, ingest_batch, parse_batch, summarize, validate_payload
+
+
+def _payload(temperature):
+    h2 = {"atoms": [{"element": "H", "x": 0, "y": 0, "z": 0}, {"element": "H", "x": 0.74, "y": 0, "z": 0}]}
+    return {"reactants": [h2], "products": [h2], "conditions": {"temperature_K": temperature}}
+
+
+@pytest.fixture
+def fresh_hashes(monkeypatch):
+    hashes = set()
+    monkeypatch.setattr(api_adapter, "_store", hashes)
+    return hashes
+
+
+def test_parse_batch_array_and_ndjson():
+    body = json.dumps([_payload(1), _payload(2)])
+    assert [p for p, err in parse_batch(body)] == [_payload(1), _payload(2)]
+
+    ndjson = json.dumps(_payload(1)) + "\n\n{broken\n" + json.dumps(_payload(2)) + "\n"
+    items = parse_batch(ndjson.encode(), "application/x-ndjson; charset=utf-8")
+    assert [err is None for _, err in items] == [True, False, True]
+
+    with pytest.raises(ValueError):
+        parse_batch("{broken")
+
+
+def test_ingest_batch_statuses_and_group_commit(tmp_path, fresh_hashes):
+    log = tmp_path / "reactions.jsonl"
+    unbalanced = _payload(3)
+    unbalanced["products"] = [{"atoms": [{"element": "H", "x": 0, "y": 0, "z": 0}]}]
+    items = parse_batch(json.dumps([_payload(1), _payload(2), _payload(1), {"reactants": 1}, unbalanced]))
+
+    with BackgroundReactionWriter(log) as writer:
+        results = ingest_batch(items, writer)
+        assert [r["status"] for r in results] == ["created", "created", "duplicate", "invalid", "unbalanced"]
+        assert results[2]["duplicate_of"] == 0
+        assert results[4]["detail"]["difference"] == {"H": -1}
+        # written before ingest_batch returns
+        assert len(log.read_text(encoding="utf-8").splitlines()) == 2
+        assert fresh_hashes == {results[0]["hash"], results[1]["hash"]}
+
+        again = ingest_batch(items[:2], writer)
+        assert summarize(again) == {"duplicate": 2}
+
+        # the writer thread re-checks, so racing submissions of one reaction write it once
+        reaction, h = validate_payload(_payload(7))
+        futures = [writer.submit(reaction, h) for _ in range(3)]
+        assert sorted(f.result() for f in futures) == ["created", "duplicate", "duplicate"]
+
+    assert writer.closed
+    assert len(log.read_text(encoding="utf-8").splitlines()) == 3
+    assert h in fresh_hashes
+
+
+def test_failed_flush_is_not_written_later(tmp_path, fresh_hashes):
+    log = tmp_path / "reactions.jsonl"
+    items = parse_batch(json.dumps([_payload(1), _payload(2)]))
+
+    with BackgroundReactionWriter(log) as writer:
+        inner = writer._reaction_writer
+        real_flush = inner.flush
+
+        def failing_flush():
+            inner.flush = real_flush
+            raise OSError("disk full")
+
+        inner.flush = failing_flush
+        failed = ingest_batch(items, writer)
+        assert [r["status"] for r in failed] == ["error", "error"]
+        assert "disk full" in failed[0]["detail"]
+        assert not fresh_hashes and inner.pending == 0
+
+        # the retry is neither reported duplicate nor written twice
+        retried = ingest_batch(items, writer)
+        assert summarize(retried) == {"created": 2}
+
+    assert len(log.read_text(encoding="utf-8").splitlines()) == 2
+    assert fresh_hashes == {r["hash"] for r in retried}
+
+
+def test_flushed_but_unregistered_records_are_not_written_again(tmp_path, fresh_hashes, monkeypatch):
+    log = tmp_path / "reactions.jsonl"
+    items = parse_batch(json.dumps([_payload(1), _payload(2)]))
+    real_register = api_adapter.register_hashes
+
+    def failing_register(hashes, writer=None):
+        monkeypatch.setattr(api_adapter, "register_hashes", real_register)
+        raise OSError("index unavailable")
+
+    with BackgroundReactionWriter(log) as writer:
+        monkeypatch.setattr(api_adapter, "register_hashes", failing_register)
+        failed = ingest_batch(items, writer)
+        assert summarize(failed) == {"error": 2} and not fresh_hashes
+        # on disk but unregistered: a retry is a duplicate and the next batch registers them
+        assert summarize(ingest_batch(items, writer)) == {"duplicate": 2}
+        assert summarize(ingest_batch(parse_batch(json.dumps([_payload(3)])), writer)) == {"created": 1}
+        assert fresh_hashes == {r["hash"] for r in failed} | {validate_payload(_payload(3))[1]}
+    assert len(log.read_text(encoding="utf-8").splitlines()) == 3
+
+    # a process that died between flush and registration: the next writer reconciles the log tail
+    fresh_hashes.clear()
+    fresh_hashes.add(failed[0]["hash"])
+    with log.open("a", encoding="utf-8") as f:
+        f.write('{"truncat')
+    with BackgroundReactionWriter(log) as writer:
+        assert len(fresh_hashes) == 3
+        assert summarize(ingest_batch(items, writer)) == {"duplicate": 2}
+    assert api_adapter.reconcile_log(log) == 0
@@ -0,0 +1,58 @@
+# tests/test_benchmarks.py
+import copy
+import json
+
+import pytest
+
+from benchmarks.run import compare, main, run_suite
+from benchmarks.scenarios import SCENARIOS
+from benchmarks.synthetic import NetworkConfig, generate_network
+
+
+def test_synthetic_network_is_seeded_and_has_distinct_species():
+    cfg = NetworkConfig(n_species=30, n_reactions=80, seed=7)
+    a, b = generate_network(cfg), generate_network(cfg)
+    assert len(set(a.formulas())) == 30
+    assert a.formulas() == b.formulas()
+    assert [r.canonical_key() for r in a.reactions] == [r.canonical_key() for r in b.reactions]
+    assert a.formulas() != generate_network(NetworkConfig(n_species=30, n_reactions=80, seed=8)).formulas()
+    with pytest.raises(ValueError):
+        generate_network(NetworkConfig(degree="zipf"))
+
+
+def test_species_count_is_not_limited_by_small_compositions():
+    # only 7 formulas have 2-3 atoms of C / H; the rest grow past 3 atoms
+    net = generate_network(NetworkConfig(n_species=50, n_reactions=10, atoms_per_molecule=(2, 3), elements=("C", "H")))
+    assert len(set(net.formulas())) == 50
+    assert sum(len(m) <= 3 for m in net.species) == 7
+
+
+def test_run_suite_and_compare(tmp_path):
+    cfg = NetworkConfig(n_species=15, n_reactions=40, seed=1)
+    names = ["load_jsonl", "deduplicate", "species_graph_from_reaction_graph", "find_paths_depth2", "api_hash_v2"]
+    report = run_suite(cfg, names, repeat=1, path_queries=3, workdir=tmp_path)
+    assert list(report["scenarios"]) == names
+    for r in report["scenarios"].values():
+        assert r["seconds_min"] > 0 and r["peak_bytes"] >= 0
+    assert set(names) <= set(SCENARIOS)
+
+    assert compare(report, report) == []
+    slower = copy.deepcopy(report)
+    slower["scenarios"]["load_jsonl"]["seconds_min"] *= 2
+    regs = compare(slower, report, threshold=0.5)
+    assert [(g["scenario"], g["metric"]) for g in regs] == [("load_jsonl", "seconds_min")]
+
+    other = copy.deepcopy(report)
+    other["config"]["seed"] = 2
+    with pytest.raises(ValueError):
+        compare(other, report)
+
+
+def test_cli_network_options(tmp_path):
+    out = tmp_path / "report.json"
+    argv = ["--species", "12", "--reactions", "20", "--atoms-per-molecule", "1", "2",
+            "--elements", "C", "O", "S", "--only", "load_jsonl", "--repeat", "1", "--out", str(out)]
+    assert main(argv) == 0
+    config = json.loads(out.read_text(encoding="utf-8"))["config"]
+    assert config["atoms_per_molecule"] == [1, 2] and config["elements"] == ["C", "O", "S"]
+    assert config["max_paths"] == 100
@@ -0,0 +1,66 @@
+# tests/test_bloom_filter.py
+import hashlib
+
+import numpy as np
+
+from src.io.bloom_filter import BloomFilter, BloomFilteredSet, open_bloom
+from src.io.hash_store import HashStore, to_digest
+
+
+def _h(i):
+    return hashlib.sha256(str(i).encode()).hexdigest()
+
+
+def test_bloom_filter_has_no_false_negatives_and_bounded_false_positives():
+    bf = BloomFilter(2000, error_rate=0.01)
+    keys = [f"key-{i}" for i in range(2000)]
+    bf.update(keys)
+    assert all(k in bf for k in keys)
+    false_positives = sum(f"other-{i}" in bf for i in range(20000))
+    assert false_positives < 20000 * 0.03
+
+    # vectorized digest insertion sets the same bits as add()
+    digests = [to_digest(_h(i)) for i in range(500)]
+    a, b = BloomFilter(500), BloomFilter(500)
+    a.update(digests)
+    b.add_digests(np.array(digests, dtype="S32"))
+    assert np.array_equal(a._bits, b._bits)
+
+
+def test_bloom_filtered_hash_store_persists_and_rebuilds(tmp_path):
+    store = HashStore(tmp_path / "index.hashset")
+    store.update(_h(i) for i in range(300))
+    path = tmp_path / "index.bloom"
+
+    hashes = BloomFilteredSet(store, open_bloom(store, path), key_bytes=to_digest, path=path)
+    assert all(_h(i) in hashes for i in range(300))
+    assert not any(_h(i) in hashes for i in range(1000, 2000))
+    assert hashes.stats()["filtered"] > 900
+    hashes.add(_h(5000))
+    hashes.close()
+
+    store = HashStore(tmp_path / "index.hashset")
+    reloaded = open_bloom(store, path)
+    assert reloaded.stamp == store.stamp() and to_digest(_h(5000)) in reloaded
+
+    # a change behind the filter's back makes it stale -> rebuilt from the store
+    store.add(_h(6000))
+    rebuilt = open_bloom(store, path)
+    assert rebuilt.stamp == store.stamp() and to_digest(_h(6000)) in rebuilt
+    store.close()
+
+
+def test_stamp_identifies_the_store(tmp_path):
+    # same history, different stores: a filter built for one must not match the other
+    a, b = HashStore(tmp_path / "a.hashset"), HashStore(tmp_path / "b.hashset")
+    for store in (a, b):
+        store.update(_h(i) for i in range(50))
+    assert a.stamp() != b.stamp()
+    bloom_a = open_bloom(a, tmp_path / "shared.bloom")
+    assert open_bloom(b, tmp_path / "shared.bloom").stamp != bloom_a.stamp
+
+    stamp = a.stamp()
+    a.close()
+    with HashStore(tmp_path / "a.hashset") as reopened:
+        assert reopened.stamp() == stamp
+    b.close()
@@ -0,0 +1,60 @@
+# tests/test_columnar_format.py
+import json
+
+import numpy as np
+
+from src.dataset.columnar_format import ColumnarReactions, columnar_to_jsonl, jsonl_to_columnar
+from src.dataset.reaction_dataset import ReactionDataset
+
+
+def test_jsonl_columnar_roundtrip(tmp_path, reactions_jsonl):
+    out = jsonl_to_columnar(reactions_jsonl, tmp_path / "reactions.rxcol")
+    back = columnar_to_jsonl(out, tmp_path / "back.jsonl")
+
+    original = [json.loads(ln) for ln in reactions_jsonl.read_text(encoding="utf-8").splitlines()]
+    restored = [json.loads(ln) for ln in back.read_text(encoding="utf-8").splitlines()]
+    assert restored == original
+
+
+def test_columnar_dataset_is_memory_mapped(tmp_path, reactions_jsonl):
+    ds = ReactionDataset()
+    ds.load_jsonl(reactions_jsonl)
+    ds.save_columnar(tmp_path / "ds.rxcol")
+
+    cr = ColumnarReactions(tmp_path / "ds.rxcol")
+    assert isinstance(cr.arrays["positions"], np.memmap)
+    mol = cr.reaction(1).reactants[0]
+    assert mol.is_columnar
+    assert np.shares_memory(mol.positions, cr.arrays["positions"])
+
+    loaded = ReactionDataset()
+    loaded.load_columnar(tmp_path / "ds.rxcol")
+    # lazy: nothing is materialised until reactions are asked for
+    assert loaded._reactions == [] and not loaded._by_canonical
+    assert loaded.stats() == ds.stats()
+    assert list(loaded.canonical_reactions()) == list(ds.canonical_reactions())
+    assert [r.canonical_key() for r in loaded.reactions()] == [r.canonical_key() for r in ds.reactions()]
+    reps = loaded.canonical_reactions()
+    assert [r.metadata for r in reps.values()] == [r.metadata for r in ds.canonical_reactions().values()]
+    assert loaded.element_counts().hill_formulas() == ds.element_counts().hill_formulas()
+
+    # reloading from jsonl drops the columnar backing
+    loaded.load_jsonl(reactions_jsonl)
+    assert loaded._view is None and loaded.stats() == ds.stats()
+
+
+def test_rows_are_read_per_reaction(tmp_path, sample_reactions):
+    from src.dataset.columnar_format import write_columnar
+
+    sample_reactions[1].reactants[0].atoms[1].properties["charge"] = -1
+    cr = ColumnarReactions(write_columnar(sample_reactions, tmp_path / "ds.rxcol"))
+    # the JSON header holds no per-row data
+    assert set(cr.table) == {"format", "version", "symbols"}
+    assert cr.canonical_keys() == [r.canonical_key() for r in sample_reactions]
+    assert cr.canonical_key(3) == sample_reactions[3].canonical_key()
+
+    r = cr.reaction(1)
+    assert [a.properties for a in r.reactants[0].atoms] == [{}, {"charge": -1}]
+    assert [a.properties for a in r.reactants[1].atoms] == [{}, {}]
+    assert r.conditions == sample_reactions[1].conditions
+    assert cr.reaction(2).metadata == {"source": "b"}
@@ -0,0 +1,41 @@
+# tests/test_element_counts.py
+import numpy as np
+
+from src.dataset.columnar_format import ColumnarReactions, write_columnar
+from src.dataset.element_counts import ElementCounts, hill_order
+from src.dataset.reaction_dataset import ReactionDataset
+
+
+def test_element_counts_match_per_molecule_results(tmp_path, reactions_jsonl):
+    ds = ReactionDataset()
+    ds.load_jsonl(reactions_jsonl)
+    ec = ds.element_counts()
+    reactions = ds.reactions()
+    molecules = [m for r in reactions for m in list(r.reactants) + list(r.products)]
+
+    assert ec.elements == hill_order(["O", "H"]) == ["H", "O"]
+    assert ec.n_molecules == len(molecules) and ec.n_reactions == len(reactions)
+    assert [ec.counts(j) for j in range(ec.n_molecules)] == [m.element_counts() for m in molecules]
+    assert ec.hill_formulas() == [m.formula for m in molecules]
+    assert [ec.difference(i) for i in range(ec.n_reactions)] == [r.element_difference() for r in reactions]
+    assert ec.balanced().tolist() == [r.is_balanced() for r in reactions]
+    assert ec.molecules.toarray().sum() == sum(len(m) for m in molecules)
+
+
+def test_hill_order_and_columnar_source(tmp_path, random_reactions):
+    _, reactions = random_reactions(n_species=25, n_reactions=60, elements=("C", "H", "O", "N", "S"), seed=4)
+    ec = ElementCounts.from_reactions(reactions)
+    assert ec.elements == ["C", "H", "N", "O", "S"]
+
+    molecules = [m for r in reactions for m in list(r.reactants) + list(r.products)]
+    for formula, m in zip(ec.hill_formulas(), molecules):
+        counts = m.element_counts()
+        order = (["C", "H"] + sorted(set(counts) - {"C", "H"})) if "C" in counts else sorted(counts)
+        assert formula == "".join(el + (str(counts[el]) if counts[el] > 1 else "") for el in order if el in counts)
+    assert ec.balanced().tolist() == [r.is_balanced() for r in reactions]
+
+    cr = ColumnarReactions(write_columnar(reactions, tmp_path / "net.rxcol"))
+    from_disk = ElementCounts.from_columnar(cr)
+    assert from_disk.elements == ec.elements
+    assert np.array_equal(from_disk.molecules.toarray(), ec.molecules.toarray())
+    assert np.array_equal(from_disk.element_difference().toarray(), ec.element_difference().toarray())
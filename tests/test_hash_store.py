@@ -0,0 +1,114 @@
+# tests/test_hash_store.py
+import hashlib
+import random
+
+import pytest
+
+from src.io.hash_store import HashStore
+
+
+def _h(i):
+    return hashlib.sha256(str(i).encode()).hexdigest()
+
+
+def test_hash_store_matches_a_set_across_merges_and_reopen(tmp_path):
+    legacy = tmp_path / "reactions_index.txt"
+    legacy.write_text("".join(_h(i) + "\n" for i in range(50)), encoding="utf-8")
+    path = tmp_path / "index.hashset"
+
+    store = HashStore(path, merge_threshold=40, max_segments=3, legacy_index=legacy)
+    ref = {_h(i) for i in range(50)}
+    rng = random.Random(0)
+    for step in range(1500):
+        h = _h(rng.randrange(300))
+        if rng.random() < 0.2:
+            assert store.discard(h) == (h in ref)
+            ref.discard(h)
+        else:
+            assert store.add(h) == (h not in ref)
+            ref.add(h)
+        if step % 500 == 499:
+            store.close()
+            store = HashStore(path, merge_threshold=40, max_segments=3)
+    store.merge()
+    assert store.stats()["log_records"] == 0
+    assert store.stats()["segments"] <= 3
+    assert all((_h(i) in store) == (_h(i) in ref) for i in range(400))
+
+    # digests are compared as raw bytes (S32 scalars would drop a trailing NUL)
+    trailing_nul = _h(403)
+    assert trailing_nul.endswith("00")
+    assert (trailing_nul in store) == (trailing_nul in ref)
+
+    with pytest.raises(KeyError):
+        store.remove(_h(10 ** 6))
+    assert "not-a-hash" not in store
+    store.close()
+    with HashStore(path) as reopened:
+        assert all((_h(i) in reopened) == (_h(i) in ref) for i in range(400))
+
+
+def test_single_writer_lock_and_readonly_readers(tmp_path):
+    from src.io.hash_store import HashStoreLocked
+
+    path = tmp_path / "index.hashset"
+    with pytest.raises(FileNotFoundError):
+        HashStore(path, readonly=True)
+
+    writer = HashStore(path, merge_threshold=20, max_segments=2)
+    with pytest.raises(HashStoreLocked):
+        HashStore(path)
+
+    reader = HashStore(path, readonly=True)
+    with pytest.raises(ValueError):
+        reader.add(_h(0))
+
+    # the reader follows the writer's log, merges and compactions
+    for i in range(100):
+        writer.add(_h(i))
+        assert _h(i) in reader
+        if i % 30 == 29:
+            writer.wait()
+    writer.discard(_h(3))
+    writer.merge()
+    assert _h(3) not in reader
+    assert all(_h(i) in reader for i in range(4, 100))
+    assert _h(1000) not in reader
+    files = sorted(p.name for p in path.iterdir())
+
+    reader.close()
+    assert sorted(p.name for p in path.iterdir()) == files
+    writer.close()
+    # the lock is released on close
+    HashStore(path).close()
+
+
+def test_update_logs_a_batch_with_one_write(tmp_path):
+    from src.io.bloom_filter import BloomFilter, BloomFilteredSet
+
+    store = HashStore(tmp_path / "index.hashset")
+    store.add(_h(0))
+    writes = []
+    fh = store._fh
+
+    class Spy:
+        def write(self, data):
+            writes.append(data)
+            return fh.write(data)
+
+        def __getattr__(self, name):
+            return getattr(fh, name)
+
+    store._fh = Spy()
+    assert store.update([_h(i) for i in (0, 1, 2, 1, 3)]) == 3
+    assert len(writes) == 1 and len(writes[0]) == 3 * 33
+    assert store.update([_h(1)]) == 0 and len(writes) == 1
+    store._fh = fh
+
+    # the Bloom wrapper learns every key of a batch
+    wrapped = BloomFilteredSet(store, BloomFilter(100))
+    assert wrapped.update([_h(4), _h(5)]) == 2
+    assert _h(4) in wrapped and _h(5) in wrapped
+    store.close()
+    with HashStore(tmp_path / "index.hashset") as reopened:
+        assert all(_h(i) in reopened for i in range(6))
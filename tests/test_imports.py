@@ -0,0 +1,43 @@
+# tests/test_imports.py
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# wall-clock budget for the package imports on top of an already imported
+# numpy (src.atom needs it; numpy alone is ~0.1 s of a cold import)
+IMPORT_DELTA_BUDGET_S = 0.05
+
+_PROBE = """
+import json, sys, time
+import numpy
+t0 = time.perf_counter()
+import src.molecule, src.reaction, src.io.api_adapter, src.io.ase_adapter, src.io.rdkit_adapter
+elapsed = time.perf_counter() - t0
+import src.io.api_adapter as api
+print(json.dumps({
+    "elapsed": elapsed,
+    "modules": sorted(m for m in ("ase", "rdkit", "pydantic", "fastapi", "sqlite3", "src.signature.reaction_signature",
+                                  "src.io.hash_store", "src.io.bloom_filter", "src.dataset.reaction_store")
+                      if m in sys.modules),
+    "store_open": api._store is not None,
+}))
+"""
+
+
+def _probe():
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE], cwd=str(ROOT), capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout)
+
+
+def test_core_imports_are_lazy_and_fast():
+    probe = _probe()
+    assert probe["modules"] == []
+    assert not probe["store_open"]
+    # best of three cold interpreters, to keep scheduler noise out
+    elapsed = min([probe["elapsed"]] + [_probe()["elapsed"] for _ in range(2)])
+    assert elapsed < IMPORT_DELTA_BUDGET_S
@@ -3,6 +3,7 @@ from ase import Atoms as ASEAtoms
 from src.io.ase_adapter import molecule_from_ase, molecule_to_ase
 from src.molecule import Molecule
 from src.atom import Atom
+import numpy as np
 
 
 def test_ase_roundtrip():
@@ -17,3 +18,27 @@ def test_ase_roundtrip():
     assert len(ase2) == 3
     # 检查第一个原子符号
     assert ase2.get_chemical_symbols()[0] == "O"
+
+
+def test_columnar_matches_list_mode():
+    atoms = [
+        Atom(atomic_number=8, symbol="O", position=(0.0, 0.0, 0.0), mass=15.999),
+        Atom(atomic_number=1, symbol="H", position=(0.96, 0.0, 0.0), mass=1.008),
+        Atom(atomic_number=1, symbol="H", position=(-0.24, 0.93, 0.0)),
+    ]
+    mol = Molecule(atoms=atoms, metadata={"name": "H2O"})
+    col = mol.to_columnar()
+    assert col.is_columnar and not mol.is_columnar
+    assert col.formula == mol.formula == "H2O"
+    assert col.atomic_numbers == mol.atomic_numbers
+    assert np.allclose(col.center_of_mass(), mol.center_of_mass())
+    assert col.to_dict() == mol.to_dict()
+
+    # Atom views share coordinates with the positions array
+    col.atoms[1].position[0] = 1.0
+    assert col.positions[1, 0] == 1.0
+
+    col.add_atom(Atom(atomic_number=6, symbol="C", position=(0.0, 0.0, 1.0)))
+    assert len(col) == 4
+    assert col.formula == "CH2O"
+    assert Molecule.from_dict(col.to_dict(), columnar=True).to_dict() == col.to_dict()
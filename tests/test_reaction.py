@@ -48,3 +48,32 @@ def test_reaction_as_dict_and_log(tmp_path):
         line = f.readline().strip()
         rec = json.loads(line)
         assert rec["metadata"]["src"] == "test"
+
+
+def test_identity_is_cached_and_invalidated(monkeypatch):
+    calls = []
+    original = Molecule._compute_formula
+
+    def counting(self):
+        calls.append(self)
+        return original(self)
+
+    monkeypatch.setattr(Molecule, "_compute_formula", counting)
+
+    H2, O2 = build_H2(), build_O2()
+    rxn = Reaction(reactants=[H2], products=[O2])
+    key = rxn.canonical_key()
+    for _ in range(3):
+        assert rxn.canonical_key() == key
+        hash(rxn)
+        assert rxn == rxn
+    assert len(calls) == 2
+
+    # structural change through add_atom invalidates the cached identity
+    O2.add_atom(Atom(atomic_number=8, symbol="O", position=(2.4, 0.0, 0.0)))
+    assert rxn.canonical_key() != key
+    assert "O3" in rxn.canonical_key()
+
+    # replacing a molecule list is picked up as well
+    rxn.products = [build_H2()]
+    assert rxn.canonical_key() == repr((("H2",), ("H2",)))
@@ -0,0 +1,105 @@
+# tests/test_reaction_graph.py
+import random
+
+import pytest
+
+from src.dataset.reaction_dataset import ReactionDataset
+from src.graph.reaction_graph import ReactionGraph, _condition_matches
+from src.reaction import Reaction
+
+
+def _scan(reactions, species=None, conditions=None):
+    out = []
+    for r in reactions:
+        formulas = {m.formula for m in list(r.reactants) + list(r.products)}
+        if species and species not in formulas:
+            continue
+        if all(_condition_matches(r.conditions.get(k), spec) for k, spec in (conditions or {}).items()):
+            out.append(r)
+    return out
+
+
+def test_condition_indexes_answer_like_a_scan(reactions_jsonl):
+    ds = ReactionDataset()
+    ds.load_jsonl(reactions_jsonl)
+    g = ReactionGraph.from_dataset(ds, condition_indexes=["temperature_K", "solvent"])
+    assert g.condition_indexes() == {"temperature_K": "numeric", "solvent": "categorical"}
+
+    water = g.query(species="H2O", conditions={"temperature_K": (300, 400), "solvent": "water"})
+    assert [r.conditions for r in water] == [{"temperature_K": 350.0, "solvent": "water"}]
+    assert len(g.query(conditions={"temperature_K": (None, 600)})) == 2
+    assert g.query(species="H2", conditions={"temperature_K": (501, None)}) == []
+    with pytest.raises(ValueError):
+        g.query(conditions={"solvent": ("a", "b")})
+
+
+def test_condition_indexes_follow_add_and_remove(random_reactions):
+    all_species, reactions = random_reactions(n_species=20, n_reactions=200, seed=2)
+    rng = random.Random(0)
+    for r in reactions:
+        r.conditions["solvent"] = rng.choice(["water", "thf", "dmso"])
+        if rng.random() < 0.1:
+            del r.conditions["temperature_K"]
+
+    g = ReactionGraph()
+    g.add_reactions(reactions[:100])
+    assert g._variants is None
+    # duplicates added before the first index are backfilled from the source
+    g.add_condition_index("temperature_K", reactions=reactions[:100])
+    g.add_condition_index("solvent")
+    g.add_reactions(reactions[100:])
+    removed = reactions[::7]
+    for r in removed:
+        g.remove_reaction(r)
+    # every added instance whose node is still in the graph
+    kept = [r for r in reactions if r not in removed]
+
+    species = all_species[0].formula
+    cases = [
+        (None, {"temperature_K": (300, 600)}),
+        (species, {"temperature_K": (400, None), "solvent": "water"}),
+        (species, {"solvent": ["thf", "dmso"]}),
+    ]
+    for sp, conditions in cases:
+        found = g.query(species=sp, conditions=conditions)
+        assert sorted(map(id, found)) == sorted(map(id, _scan(kept, sp, conditions)))
+        # in insertion order (backfilled duplicates count as inserted when backfilled)
+        seqs = [g._instances[id(r)][0] for r in found]
+        assert seqs == sorted(seqs)
+    # unindexed keys are filtered on the candidates
+    assert g.query(conditions={"temperature_K": (None, 500), "pressure": 1.0}) == []
+    g.drop_condition_index("solvent")
+    found = g.query(conditions={"solvent": "water"})
+    assert sorted(map(id, found)) == sorted(map(id, _scan(kept, None, {"solvent": "water"})))
+
+    # without condition indexes only the nodes are kept and queried
+    g.drop_condition_index("temperature_K")
+    assert g._variants is None and g._instances is None
+    nodes = g.reactions()
+    assert g.query(species=species) == _scan(nodes, species)
+    g.add_reactions(kept)
+    assert g.reactions() == nodes and g._variants is None
+
+
+def test_equal_reactions_keep_their_own_conditions(sample_reactions):
+    h2 = sample_reactions[0].reactants[0]
+    cold = Reaction(reactants=[h2], products=[h2], conditions={"temperature_K": 300.0})
+    hot = Reaction(reactants=[h2], products=[h2], conditions={"temperature_K": 500.0, "solvent": "thf"})
+    assert cold == hot
+
+    g = ReactionGraph()
+    g.add_reaction(cold)
+    g.add_condition_index("temperature_K")
+    g.add_reaction(hot)
+    g.add_reaction(hot)
+    g.add_condition_index("solvent")
+    assert g.reactions() == [cold]
+
+    assert [r is hot for r in g.query(conditions={"temperature_K": (400, 600)})] == [True]
+    assert [r is cold for r in g.query(species="H2", conditions={"temperature_K": 300})] == [True]
+    assert [r is hot for r in g.query(conditions={"solvent": "thf"})] == [True]
+    assert len(g.query(species="H2")) == 2
+
+    assert g.remove_reaction(hot)
+    assert g.query(conditions={"temperature_K": (None, None)}) == []
+    assert g.query(species="H2") == []
@@ -0,0 +1,126 @@
+# tests/test_reaction_index.py
+import json
+
+import pytest
+
+from src.dataset.reaction_dataset import ReactionDataset, iter_jsonl
+from src.io.reaction_index import ReactionIndex
+from src.reaction import Reaction
+
+
+def test_iter_jsonl_streams_reactions_and_batches(reactions_jsonl):
+    stream = iter_jsonl(reactions_jsonl)
+    first = next(stream)
+    assert isinstance(first, Reaction)
+    assert 1 + sum(1 for _ in stream) == 4
+
+    batches = list(ReactionDataset.iter_jsonl(reactions_jsonl, batch_size=3))
+    assert [len(b) for b in batches] == [3, 1]
+
+
+def test_representatives_only_index_matches_full_index(reactions_jsonl):
+    full = ReactionIndex()
+    full.ingest_jsonl(reactions_jsonl)
+
+    grouped = ReactionIndex(representatives_only=True)
+    grouped.ingest_jsonl(reactions_jsonl, batch_size=2)
+
+    assert grouped.summary() == full.summary() == {"total_reactions": 4, "unique_reactions": 3}
+    assert grouped.counts() == full.counts()
+    reps = grouped.representatives()
+    assert all(len(v) == 1 for v in grouped._index.values())
+    h2_key = repr((("H2",), ("H2",)))
+    assert reps[h2_key].metadata["source"] == "a"
+
+
+def test_sharded_ingest_matches_serial(tmp_path, sample_reactions):
+    from src.dataset.sharded_ingest import shard_ranges
+
+    path = tmp_path / "many.jsonl"
+    for i in range(10):
+        for r in sample_reactions:
+            r.metadata["i"] = i
+            r.log(sink=str(path))
+
+    ranges = shard_ranges(path, 7)
+    data = path.read_bytes()
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    assert all(data[s - 1:s] == b"\n" for s, _ in ranges[1:])
+
+    serial = ReactionIndex()
+    serial.ingest_jsonl(path)
+    parallel = ReactionIndex()
+    parallel.ingest_jsonl(path, workers=2)
+    assert parallel.counts() == serial.counts()
+    assert list(parallel.counts()) == list(serial.counts())
+    h2_key = repr((("H2",), ("H2",)))
+    assert [r.metadata["i"] for r in parallel._index[h2_key]] == [r.metadata["i"] for r in serial._index[h2_key]]
+    reps = ReactionIndex(representatives_only=True)
+    reps.ingest_jsonl(path, workers=2)
+    assert reps.counts() == serial.counts()
+    assert {k: r.metadata for k, r in reps.representatives().items()} == \
+        {k: r.metadata for k, r in serial.representatives().items()}
+
+    with pytest.raises(ValueError):
+        ReactionIndex().ingest_jsonl(path, batch_size=10, workers=2)
+
+    ds = ReactionDataset()
+    ds.load_jsonl(path, workers=2)
+    assert ds.stats() == {"total_reactions": 40, "unique_reactions": 3}
+    # workers only send back line offsets and keys; reactions are parsed on demand
+    assert ds._reactions == [] and len(ds._view.offsets) == 40
+    plain = ReactionDataset()
+    plain.load_jsonl(path)
+    assert [(r.canonical_key(), r.metadata) for r in ds.iter_reactions()] == \
+        [(r.canonical_key(), r.metadata) for r in plain.iter_reactions()]
+    assert list(ds.canonical_reactions()) == list(plain.canonical_reactions())
+    assert ds.canonical_reactions()[h2_key].metadata == plain.canonical_reactions()[h2_key].metadata
+
+
+def test_offset_index_lookup_and_incremental_update(tmp_path, sample_reactions):
+    from src.io.api_adapter import reaction_to_canonical_hash
+    from src.io.reaction_index import ReactionOffsetIndex
+
+    path = tmp_path / "log.jsonl"
+    for r in sample_reactions[:2]:
+        r.log(sink=str(path))
+
+    idx = ReactionOffsetIndex.open(path)
+    assert idx.index_path.exists()
+    h2_key = repr((("H2",), ("H2",)))
+    assert [r.metadata["source"] for r in idx.get(h2_key)] == ["a"]
+
+    # grow the log: only the new tail is scanned, persisted state is reused
+    for r in sample_reactions[2:]:
+        r.log(sink=str(path))
+    reopened = ReactionOffsetIndex.open(path)
+    assert [r.metadata["source"] for r in reopened.get(h2_key)] == ["a", "b"]
+    assert len(reopened) == 3
+
+    water = sample_reactions[1]
+    by_hash = reopened.get(reaction_to_canonical_hash(water))
+    assert len(by_hash) == 1 and by_hash[0].canonical_key() == water.canonical_key()
+    assert "missing" not in reopened and reopened.get("missing") == []
+
+    # saving appends fixed-size records instead of rewriting the index
+    records = reopened.index_path / "canonical.bin"
+    assert records.stat().st_size == 4 * 16
+    sample_reactions[0].log(sink=str(path))
+    assert reopened.update() == 1
+    reopened.save()
+    assert records.stat().st_size == 5 * 16
+    assert len(ReactionOffsetIndex.open(path).get(h2_key)) == 3
+
+    # an index built for another hash version is rebuilt, not trusted
+    state_path = reopened.index_path / "STATE.json"
+    state = json.loads(state_path.read_text(encoding="utf-8"))
+    state["hash_version"] = 99
+    state_path.write_text(json.dumps(state), encoding="utf-8")
+    rebuilt = ReactionOffsetIndex.open(path)
+    assert json.loads(state_path.read_text(encoding="utf-8"))["hash_version"] == rebuilt.hash_version
+    assert len(rebuilt.get(reaction_to_canonical_hash(water))) == 1
+
+    # a rewritten log is detected and re-indexed
+    path.write_text("", encoding="utf-8")
+    sample_reactions[1].log(sink=str(path))
+    assert ReactionOffsetIndex.open(path).keys() == [water.canonical_key()]
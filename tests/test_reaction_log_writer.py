@@ -0,0 +1,99 @@
+# tests/test_reaction_log_writer.py
+import json
+import time
+
+import pytest
+
+from src.io.reaction_log_writer import LogBufferFull, ReactionLogWriter
+
+
+def _lines(path):
+    if not path.exists():
+        return []
+    return path.read_text(encoding="utf-8").splitlines()
+
+
+def test_size_based_group_commit(tmp_path, sample_reactions):
+    out = tmp_path / "nested" / "log.jsonl"
+    with ReactionLogWriter(out, max_records=3, flush_interval=None) as w:
+        for r in sample_reactions:
+            assert r.log(writer=w) == str(out)
+        # first three records went out in one flush, the fourth is buffered
+        assert len(_lines(out)) == 3
+        assert w.pending == 1
+    assert w.closed
+    recs = [json.loads(ln) for ln in _lines(out)]
+    assert [r["metadata"] for r in recs] == [r.metadata for r in sample_reactions]
+
+
+def test_time_based_flush(tmp_path):
+    out = tmp_path / "index.txt"
+    w = ReactionLogWriter(out, flush_interval=0.05, fsync="flush")
+    w.write_line("a" * 64)
+    deadline = time.monotonic() + 2.0
+    while not _lines(out) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert _lines(out) == ["a" * 64]
+    w.close()
+
+
+class _TornFile:
+    """File wrapper whose write() stores half of the data, then fails."""
+
+    def __init__(self, fh):
+        self._fh = fh
+
+    def write(self, data):
+        self._fh.write(data[: len(data) // 2])
+        self._fh.flush()
+        raise OSError("disk full")
+
+    def __getattr__(self, name):
+        return getattr(self._fh, name)
+
+
+def test_failed_flush_rolls_back_and_discard(tmp_path):
+    out = tmp_path / "log.jsonl"
+    w = ReactionLogWriter(out, flush_interval=None)
+    w.write_line("first")
+    w.flush()
+    w.write_line("second")
+    w._fh = _TornFile(w._fh)
+    with pytest.raises(OSError):
+        w.flush()
+    # the torn group is cut off the file, the records stay buffered
+    assert _lines(out) == ["first"]
+    assert w.pending == 1 and w.written == 1
+
+    assert w.discard() == 1
+    w.write_line("third")
+    w.close()
+    assert _lines(out) == ["first", "third"]
+    assert w.written == 2
+
+
+def test_buffer_is_bounded_while_flushes_fail(tmp_path):
+    out = tmp_path / "log.jsonl"
+    w = ReactionLogWriter(out, max_records=2, flush_interval=None, max_pending=5)
+    w.write_line("ok")
+    w.flush()
+    # the parent "directory" is a file: every flush fails until path is restored
+    (tmp_path / "blocked").write_text("")
+    w._fh.close()
+    w._fh, w.path = None, tmp_path / "blocked" / "log.jsonl"
+
+    w.write_line("r0")
+    for i in range(1, 5):
+        # size-triggered flushes fail; records stay buffered up to the hard limit
+        with pytest.raises(OSError):
+            w.write_line(f"r{i}")
+    assert w.pending == 5
+    with pytest.raises(LogBufferFull):
+        w.write_line("r5")
+    assert w.pending == 5
+
+    # once the file is writable again the backlog goes out and writes resume
+    w.path = out
+    w.write_line("r5")
+    w.close()
+    assert _lines(out) == ["ok"] + [f"r{i}" for i in range(6)]
@@ -0,0 +1,248 @@
+# tests/test_reaction_path_finder.py
+import random
+from types import SimpleNamespace
+
+from src.graph.species_graph import SpeciesGraph
+from src.path.reaction_path_finder import ReactionPathFinder
+from src.rules.depth_limit_rule import DepthLimitRule
+from src.rules.reaction_rule import ReactionRule
+
+
+def _rxn(key, reactants, products, metadata=None):
+    return SimpleNamespace(
+        reactants=[SimpleNamespace(formula=f) for f in reactants],
+        products=[SimpleNamespace(formula=f) for f in products],
+        canonical_key=lambda: key,
+        metadata=metadata or {},
+        conditions={},
+    )
+
+
+def random_species_graph(n_species=8, n_reactions=30, seed=0):
+    rng = random.Random(seed)
+    names = [f"S{i}" for i in range(n_species)]
+    g = SpeciesGraph()
+    for i in range(n_reactions):
+        g.add_reaction(_rxn(
+            f"r{i}",
+            rng.sample(names, rng.randint(1, 2)),
+            rng.sample(names, rng.randint(1, 2)),
+            metadata={"cost": rng.randint(1, 9)},
+        ))
+    return g
+
+
+class BanReaction(ReactionRule):
+    def __init__(self, banned):
+        self.banned = set(banned)
+
+    def is_applicable(self, reaction):
+        return reaction not in self.banned
+
+
+class NoRevisit:
+    """Path rule using the allow(path, reaction, graph) interface."""
+
+    def allow(self, path, reaction, graph):
+        species = path[::2]
+        return len(species) == len(set(species))
+
+
+def test_bfs_finds_paths_through_species_edges():
+    g = SpeciesGraph()
+    g.add_reaction(_rxn("r1", ["A"], ["B"]))
+    g.add_reaction(_rxn("r2", ["B"], ["C"]))
+    finder = ReactionPathFinder(g)
+    assert finder.find_paths("A", "C", max_depth=3) == [["A", "r1", "B", "r2", "C"]]
+    assert finder.stats()["accepted"] == 2
+
+
+def test_bidirectional_matches_bfs():
+    g = random_species_graph()
+    cases = [
+        ([], []),
+        ([BanReaction({"r3", "r7", "r11"})], []),
+        ([], [NoRevisit(), DepthLimitRule(4)]),
+    ]
+    for reaction_rules, path_rules in cases:
+        finder = ReactionPathFinder(g, reaction_rules=reaction_rules, path_rules=path_rules, max_paths=10 ** 6)
+        for start, target in [("S0", "S5"), ("S1", "S1"), ("S2", "S7")]:
+            for depth in (1, 2, 3, 4):
+                bfs = finder.find_paths(start, target, max_depth=depth)
+                bidi = finder.find_paths(start, target, max_depth=depth, mode="bidirectional")
+                assert sorted(map(tuple, bidi)) == sorted(map(tuple, bfs))
+                assert [len(p) for p in bidi] == sorted(len(p) for p in bidi)
+
+
+def test_path_tree_materializes_both_directions():
+    from src.path.reaction_path_finder import _PathTree
+
+    t = _PathTree()
+    root = t.add("A")
+    b = t.add("B", root, "r1")
+    c = t.add("C", b, "r2")
+    assert t.depth[c] == 2
+    assert t.path(c) == ["A", "r1", "B", "r2", "C"]
+    assert t.path(c, toward_root=True) == ["C", "r2", "B", "r1", "A"]
+
+
+def test_k_shortest_paths_match_exhaustive_ranking():
+    from src.path.costs import metadata_cost
+
+    g = random_species_graph(n_species=7, n_reactions=20, seed=3)
+    cost = metadata_cost("cost")
+    finder = ReactionPathFinder(g, path_rules=[NoRevisit()], max_paths=10 ** 6)
+    all_simple = finder.find_paths("S0", "S4", max_depth=7)
+    assert len(all_simple) > 5
+    ranked = sorted(sum(cost(g.get_reaction(r)) for r in p[1::2]) for p in all_simple)
+
+    finder = ReactionPathFinder(g)
+    best = finder.k_shortest_paths("S0", "S4", k=5, cost=cost)
+    assert [c for c, _ in best] == ranked[:5]
+    assert len({tuple(p) for _, p in best}) == 5
+    assert finder.shortest_path("S0", "S4", cost=cost)[0] == ranked[0]
+
+    # reaction rules are honoured: banning every reaction of the best path changes the answer
+    banned = set(best[0][1][1::2])
+    ruled = ReactionPathFinder(g, reaction_rules=[BanReaction(banned)])
+    for _, p in ruled.k_shortest_paths("S0", "S4", k=3, cost=cost):
+        assert not banned & set(p[1::2])
+
+
+class CountingRule(ReactionRule):
+    def __init__(self, pure):
+        self.pure = pure
+        self.calls = 0
+
+    def is_applicable(self, reaction):
+        self.calls += 1
+        return reaction != "r5"
+
+
+def test_applicable_verdicts_are_memoized_per_reaction():
+    g = random_species_graph()
+    n_reactions = len(g._reaction_keys)
+
+    per_query = CountingRule(pure=False)
+    finder = ReactionPathFinder(g, reaction_rules=[per_query], max_paths=10 ** 6)
+    finder.find_paths("S0", "S5", max_depth=4)
+    assert finder.stats()["expanded"] > n_reactions
+    assert per_query.calls <= n_reactions
+    first = per_query.calls
+    finder.find_paths("S0", "S5", max_depth=4)
+    assert per_query.calls == 2 * first
+
+    pure = CountingRule(pure=True)
+    finder = ReactionPathFinder(g, reaction_rules=[pure], max_paths=10 ** 6)
+    paths = finder.find_paths("S0", "S5", max_depth=4)
+    calls = pure.calls
+    assert finder.find_paths("S0", "S5", max_depth=4) == paths
+    assert pure.calls == calls
+    assert all("r5" not in p for p in paths)
+
+    # replacing the rule list recompiles the pipeline
+    finder.reaction_rules = []
+    assert len(finder.find_paths("S0", "S5", max_depth=4)) >= len(paths)
+
+
+def test_distance_pruning_and_astar_keep_the_result_set():
+    g = random_species_graph(n_species=12, n_reactions=25, seed=3)
+    g.add_reaction(_rxn("dead", ["S0"], ["SINK"]))
+    finder = ReactionPathFinder(g, path_rules=[NoRevisit()], max_paths=10 ** 6)
+    for start, target in [("S0", "S5"), ("S2", "S9"), ("S0", "SINK")]:
+        for depth in (2, 3, 4):
+            plain = finder.find_paths(start, target, max_depth=depth, prune_unreachable=False)
+            plain_expanded = finder.stats()["expanded"]
+            for mode in ("bfs", "astar", "bidirectional"):
+                found = finder.find_paths(start, target, max_depth=depth, mode=mode)
+                assert sorted(map(tuple, found)) == sorted(map(tuple, plain))
+            finder.find_paths(start, target, max_depth=depth)
+            assert finder.stats()["expanded"] <= plain_expanded
+
+    dist = finder.distance_map("S5")
+    assert dist["S5"] == 0 and "SINK" not in dist
+    assert finder.distance_map("S5") is dist
+    g.add_reaction(_rxn("back", ["SINK"], ["S5"]))
+    assert finder.distance_map("S5")["SINK"] == 1
+
+    # a limited map is the full map cut at the limit, cached separately
+    full = finder.distance_map("S5")
+    near = finder.distance_map("S5", 1)
+    assert near == {s: d for s, d in full.items() if d <= 1}
+    assert finder.distance_map("S5", 1) is near and finder.distance_map("S5") is full
+    finder.DISTANCE_CACHE_SIZE = 2
+    finder.distance_map("S0", 2)
+    assert list(finder._distance_cache) == [("S5", None), ("S0", 2)]
+
+
+def test_instrumentation_profiles_rules_and_frontier():
+    g = random_species_graph()
+    plain = ReactionPathFinder(g, reaction_rules=[BanReaction({"r3"})], path_rules=[NoRevisit()], max_paths=10 ** 6)
+    expected = plain.find_paths("S0", "S5", max_depth=3)
+    assert plain.last_profile() is None and plain.rule_stats() == []
+    assert plain._rules.instrumentation is None
+
+    events = []
+    finder = ReactionPathFinder(
+        g, reaction_rules=[BanReaction({"r3"})], path_rules=[NoRevisit()], max_paths=10 ** 6,
+        instrument=True, trace=lambda event, data: events.append((event, data)),
+    )
+    assert finder.find_paths("S0", "S5", max_depth=3) == expected
+    profile = finder.last_profile()
+    assert profile.results == len(expected) and profile.seconds > 0
+    assert profile.frontier[0] == 1 and len(profile.frontier) <= 4
+    assert sum(profile.frontier) - 1 == profile.counters["accepted"]
+    assert profile.peak_queue >= max(profile.frontier[1:])
+
+    by_rule = {(s.name, s.stage): s for s in profile.rules}
+    ban = by_rule[("BanReaction", "reaction.is_applicable")]
+    # memoized: each reaction id is checked (and r3 rejected) at most once
+    assert ban.rejected == int(profile.counters["pruned_by_reaction_rule"] > 0)
+    assert ban.calls <= len(g._reaction_keys)
+    revisit = by_rule[("NoRevisit", "path.allow")]
+    assert revisit.rejected == profile.counters["pruned_by_path_rule"]
+    assert revisit.calls == revisit.passed + revisit.rejected
+
+    names = [e for e, _ in events]
+    assert names[0] == "query_start" and names[-1] == "query_end"
+    assert names.count("path") == len(expected)
+    assert names.count("reject") == ban.rejected + revisit.rejected
+
+    finder.find_paths("S0", "S5", max_depth=3, mode="bidirectional")
+    assert finder.last_profile().backward_frontier[0] == 1
+    totals = {(s.name, s.stage): s for s in finder.rule_stats()}
+    assert totals[("NoRevisit", "path.allow")].calls > revisit.calls
+
+
+def test_find_paths_many_on_shared_memory_workers():
+    from src.path.parallel_paths import SharedSpeciesGraph, attach_species_graph
+
+    g = random_species_graph(n_species=10, n_reactions=30, seed=5)
+    g.add_reaction(_rxn("r-dup", ["S1", "S1"], ["S2"]))
+    with SharedSpeciesGraph.publish(g) as shared:
+        view, shm = attach_species_graph(shared.name, shared.layout)
+        try:
+            assert view.species() == g.species()
+            assert view.edge_count("S1", "S2", "r-dup") == 2
+            assert [e.reaction for e in view.out_edges("S3")] == [e.reaction for e in g.out_edges("S3")]
+            # nothing is unpacked into per-edge Python objects up front
+            assert view._reaction_edges is None
+            assert view.out_edge_counts() is view._out_counts
+            assert view.n_reactions == g.n_reactions and "r-dup" in view
+            # modifying the view thaws it into a private mutable graph
+            assert view.remove_reaction("r-dup")
+            assert view.edge_count("S1", "S2", "r-dup") == 0
+            assert view.add_reaction(_rxn("r-new", ["S0"], ["S9"]))
+            assert view.edge_count("S0", "S9") == g.edge_count("S0", "S9") + 1
+            assert view.n_reactions == g.n_reactions
+        finally:
+            del view
+            shm.close()
+
+    queries = [("S0", "S5"), ("S2", "S7"), ("S1", "S1"), ("S9", "S3"), ("S4", "S0")]
+    finder = ReactionPathFinder(g, reaction_rules=[BanReaction({"r3"})], path_rules=[NoRevisit()])
+    expected = []
+    for start, target in queries:
+        expected.append((finder.find_paths(start, target, max_depth=4), finder.stats()))
+    assert finder.find_paths_many(queries, workers=2, max_depth=4, chunksize=2) == expected
+    assert finder.find_paths_many(queries, workers=1, max_depth=4) == expected
@@ -0,0 +1,79 @@
+# tests/test_reaction_store.py
+import json
+import sqlite3
+
+import pytest
+
+from src.dataset.reaction_dataset import ReactionDataset
+from src.dataset.reaction_store import PRODUCT, ReactionStore, StoreDataset
+from src.graph.reaction_graph import ReactionGraph
+from src.io.api_adapter import reaction_to_canonical_hash
+
+
+def test_store_dataset_matches_in_memory_dataset(tmp_path, reactions_jsonl):
+    ds = ReactionDataset()
+    ds.load_jsonl(reactions_jsonl)
+    graph = ReactionGraph.from_dataset(ds)
+
+    path = tmp_path / "reactions.sqlite"
+    with ReactionStore(path) as store:
+        assert store.import_jsonl(reactions_jsonl, batch_size=3) == 4
+
+    # reopening is instant: nothing to rebuild, readers share the file
+    view = StoreDataset.open(path, readonly=True)
+    assert view.stats() == ds.stats() == {"total_reactions": 4, "unique_reactions": 3}
+    assert [r.canonical_key() for r in view.reactions()] == [r.canonical_key() for r in ds.reactions()]
+    logged = [json.loads(line)["created_at"] for line in reactions_jsonl.read_text(encoding="utf-8").splitlines()]
+    assert [r.created_at for r in view.reactions()] == logged
+    assert list(view.canonical_reactions()) == list(ds.canonical_reactions())
+    assert view.canonical_reactions()[repr((("H2",), ("H2",)))].metadata["source"] == "a"
+    assert view.species() == graph.species()
+    for formula in graph.species():
+        assert sorted(r.canonical_key() for r in view.reactions_by_species(formula)) == \
+            sorted(r.canonical_key() for r in graph.reactions_by_species(formula))
+
+    store = view.store
+    water = ds.reactions()[1]
+    assert water.canonical_key() in store
+    assert [r.conditions for r in store.get_by_hash(reaction_to_canonical_hash(water))] == [water.conditions]
+    assert [r.canonical_key() for r in store.reactions_by_species("H2O", role=PRODUCT)] == [water.canonical_key()]
+    assert [r.conditions["temperature_K"] for r in store.reactions_by_condition("temperature_K", min_value=400)] == [500.0]
+    assert len(store.reactions_by_condition("solvent", "water")) == 1
+    assert len(store.get(repr((("H2",), ("H2",))))) == 2
+    with pytest.raises(sqlite3.OperationalError, match="readonly"):
+        store.add_reactions(ds.reactions())
+    store.close()
+
+
+def test_store_appends_in_batches_and_fixes_condition_fields(tmp_path, sample_reactions):
+    path = tmp_path / "r.sqlite"
+    with ReactionStore(path, condition_fields=["temperature_K"], with_hashes=False) as store:
+        assert store.add_reactions(sample_reactions, batch_size=2) == 4
+        assert store.add_reaction(sample_reactions[0]) == 1
+        assert store.counts()[repr((("H2",), ("H2",)))] == 3
+        assert store.hash_version is None
+        with pytest.raises(KeyError):
+            store.reactions_by_condition("solvent", "water")
+    with pytest.raises(ValueError):
+        ReactionStore(path, condition_fields=["solvent"])
+    with ReactionStore(path) as store:
+        assert len(store) == 5 and store.condition_fields == ["temperature_K"]
+
+
+def test_concurrent_creation_of_a_new_store(tmp_path, monkeypatch):
+    path = tmp_path / "new.sqlite"
+    others = []
+    transaction = ReactionStore._transaction
+
+    def racing_transaction(self):
+        # another process creates the same store just before our first write
+        if not others:
+            others.append(None)
+            others.append(ReactionStore(path, condition_fields=["temperature_K"]))
+        return transaction(self)
+
+    monkeypatch.setattr(ReactionStore, "_transaction", racing_transaction)
+    store = ReactionStore(path, condition_fields=["temperature_K"])
+    assert store.condition_fields == others[1].condition_fields == ["temperature_K"]
+    store.close()
+    others[1].close()
@@ -0,0 +1,85 @@
+# tests/test_species_graph.py
+import numpy as np
+
+from src.graph.reaction_graph import ReactionGraph
+from src.graph.species_graph import SpeciesGraph
+
+
+def _edges(edges):
+    return [(e.reactant, e.product, e.reaction_id) for e in edges]
+
+
+def test_freeze_keeps_string_api_and_exposes_csr(sample_reactions):
+    rg = ReactionGraph()
+    rg.add_reactions(sample_reactions)
+    sg = SpeciesGraph.from_reaction_graph(rg)
+
+    before_out = {s: _edges(sg.out_edges(s)) for s in sg.species()}
+    before_in = {s: _edges(sg.in_edges(s)) for s in sg.species()}
+
+    csr = sg.freeze()
+    assert sg.frozen
+    assert csr.n_species == len(sg.species()) == 3
+    assert {s: _edges(sg.out_edges(s)) for s in sg.species()} == before_out
+    assert {s: _edges(sg.in_edges(s)) for s in sg.species()} == before_in
+
+    h2 = sg.species_id("H2")
+    targets, rids = csr.out_neighbors(h2)
+    assert sorted(sg.species_name(t) for t in targets.tolist()) == sorted(e[1] for e in before_out["H2"])
+    assert all(sg.reaction_key(r) in {e[2] for e in before_out["H2"]} for r in rids.tolist())
+    assert int(np.sum(csr.out_degree())) == int(np.sum(csr.in_degree())) == csr.n_edges
+
+    # re-adding a known reaction is a no-op and keeps the graph frozen
+    assert not sg.add_reaction(sample_reactions[1])
+    assert sg.frozen
+
+    # removing after freeze switches back to the mutable form
+    assert sg.remove_reaction(sample_reactions[1])
+    assert not sg.frozen
+    assert sg.out_edges("O2") == []
+    assert sg.add_reaction(sample_reactions[1])
+    assert {s: sorted(_edges(sg.out_edges(s))) for s in sg.species()} == {
+        s: sorted(e) for s, e in before_out.items()
+    }
+    assert sg.out_edges("unknown") == []
+
+
+def test_live_species_graph_follows_reaction_graph(sample_reactions):
+    from src.reaction import Reaction
+
+    rg = ReactionGraph()
+    rg.add_reaction(sample_reactions[0])
+    sg = SpeciesGraph.from_reaction_graph(rg, live=True)
+    assert sg.n_reactions == 1
+
+    for r in sample_reactions:
+        rg.add_reaction(r)
+        sg.add_reaction(r)  # direct re-adds are idempotent as well
+    rebuilt = SpeciesGraph.from_reaction_graph(rg)
+    assert sg.n_reactions == rebuilt.n_reactions == len(rg.reactions())
+    for s in rebuilt.species():
+        assert sorted(_edges(sg.out_edges(s))) == sorted(_edges(rebuilt.out_edges(s)))
+
+    # 2 H2 + O2 -> 2 H2O: one H2 -> H2O edge with multiplicity 4
+    h2, o2 = sample_reactions[1].reactants
+    h2o = sample_reactions[1].products[0]
+    combustion = Reaction(reactants=[h2, h2, o2], products=[h2o, h2o])
+    rg.add_reaction(combustion)
+    key = combustion.canonical_key()
+    assert [e for e in _edges(sg.out_edges("H2")) if e[2] == key] == [("H2", "H2O", key)]
+    assert sg.edge_count("H2", "H2O", key) == 4
+    assert sg.edge_count("O2", "H2O") == 2 + 1
+
+    version = sg.version
+    rg.remove_reaction(combustion)
+    assert key not in sg and sg.version > version
+    assert sg.edge_count("H2", "H2O", key) == 0
+
+    rg.remove_reaction(sample_reactions[3])
+    assert "H2O" in sg.species()
+    rg.remove_reaction(sample_reactions[1])
+    assert sg.species() == rg.species() == {"H2"}
+
+    rg.unsubscribe(sg)
+    rg.add_reaction(sample_reactions[1])
+    assert sg.species() == {"H2"}